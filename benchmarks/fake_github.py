@@ -0,0 +1,390 @@
+import base64
+import hashlib
+import io
+import json
+import random
+import re
+import threading
+import time
+import zipfile
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Optional, Any, Callable, Dict, List, Tuple
+from urllib.parse import urlsplit, parse_qs, urlencode
+
+_REPO = r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)"
+
+
+def make_runs(count: int, workflows: int = 5) -> List[Dict[str, Any]]:
+    """
+    Build `count` workflow runs, newest first, spread over a few workflows and branches.
+    """
+    runs = []
+    for run_id in range(count, 0, -1):
+        day = 1 + run_id % 28
+        runs.append({
+            "id": run_id,
+            "name": f"workflow-{run_id % workflows}",
+            "workflow_id": run_id % workflows,
+            "head_branch": "main" if run_id % 3 else f"feature-{run_id % 7}",
+            "head_sha": hashlib.sha1(str(run_id).encode()).hexdigest(),
+            "event": "push",
+            "status": "completed",
+            "conclusion": "failure" if run_id % 10 == 0 else "success",
+            "run_attempt": 1,
+            "created_at": f"2024-01-{day:02d}T10:00:00Z",
+            "run_started_at": f"2024-01-{day:02d}T10:00:30Z",
+            "updated_at": f"2024-01-{day:02d}T10:05:00Z",
+        })
+    return runs
+
+
+def make_job_log(run_id: int, job: str, lines: int) -> bytes:
+    """
+    Build the plain-text log of one job. Every seventh run has a flaky network test.
+    """
+    rows = []
+    for line in range(lines):
+        stamp = f"2024-01-01T10:{line // 60 % 60:02d}:{line % 60:02d}.0000000Z"
+        if line == lines // 2 and run_id % 7 == 0 and job == "test":
+            rows.append(f"{stamp} ##[error]test_network timed out after 30s (run {run_id})")
+        else:
+            rows.append(f"{stamp} [{job}] step output line {line} for run {run_id}")
+    return ("\n".join(rows) + "\n").encode("utf-8")
+
+
+def make_run_logs(run_id: int, lines: int) -> bytes:
+    """
+    Build the log archive of a run: one text file per job and step, like GitHub's.
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for job in ("build", "test"):
+            archive.writestr(f"{job}/1_Set up job.txt", make_job_log(run_id, "setup", 20))
+            archive.writestr(f"{job}/2_Run {job}.txt", make_job_log(run_id, job, lines))
+            archive.writestr(f"0_{job}.txt", make_job_log(run_id, job, lines))
+    return buffer.getvalue()
+
+
+class FakeGitHub:
+    """
+    Local stand-in for the parts of the GitHub REST API used by CoreCommands and ActionsCommands.
+
+    Serves list endpoints with per_page/page pagination, Link headers and total_count, answers
+    If-None-Match with 304, reports X-RateLimit-* headers from a simulated quota, and can add
+    latency and inject server errors. It counts requests and TCP connections so benchmarks can
+    check connection reuse.
+
+    Args:
+    - runs (int): Number of workflow runs in the fake repository.
+    - latency (float): Seconds every response is delayed by.
+    - error_rate (float): Fraction of requests answered with a 502.
+    - rate_limit (int): Requests allowed per simulated rate-limit window.
+    - rate_window (float): Seconds until the simulated quota is restored.
+    - seed (int): Seed for error injection, so runs are reproducible.
+    - log_lines (int): Lines of every job log served by the log endpoints.
+
+    Usage:
+    with FakeGitHub(runs=10000, latency=0.005) as server:
+        client = ActionsCommands(owner="octo", repo="demo", token="test", api_url=server.url)
+    """
+
+    def __init__(self, runs: int = 1000, latency: float = 0.0, error_rate: float = 0.0,
+                 rate_limit: int = 1000000, seed: int = 0, log_lines: int = 500, rate_window: float = 3600):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.rate_remaining = rate_limit
+        self.rate_reset = int(time.time() + rate_window)
+        self.random = random.Random(seed)
+        self.log_lines = log_lines
+        self.lock = threading.Lock()
+
+        self.runs = make_runs(runs)
+        self.artifacts: List[Dict[str, Any]] = []
+        self.caches: List[Dict[str, Any]] = []
+        self.issues: List[Dict[str, Any]] = []
+        self.pulls: List[Dict[str, Any]] = []
+        self.releases: List[Dict[str, Any]] = []
+        self.secrets: List[Dict[str, Any]] = []
+        # Encrypted values written to the secrets, which the API never returns.
+        self.secret_values: Dict[str, str] = {}
+        self.public_key = {"key_id": "1", "key": base64.b64encode(hashlib.sha256(b"fake").digest()).decode("ascii")}
+
+        self.requests = 0
+        self.connections = 0
+        self.not_modified = 0
+        self.rate_limited = 0
+        self._scripted: List[Tuple[int, Any, Dict[str, str]]] = []
+        # Called with the collection and page number before a list page is served, e.g. to add items mid-listing.
+        self.on_page: Optional[Callable[[str, int], None]] = None
+
+        self._routes: List[Tuple[str, "re.Pattern", Callable]] = [
+            ("GET", re.compile(r"/user$"), self._user),
+            ("GET", re.compile(_REPO + r"/actions/runs$"), self._list("runs", "workflow_runs")),
+            ("DELETE", re.compile(_REPO + r"/actions/runs/(?P<id>\d+)$"), self._delete("runs")),
+            ("GET", re.compile(_REPO + r"/actions/runs/(?P<id>\d+)(/attempts/\d+)?/logs$"), self._redirect_logs("runs")),
+            ("GET", re.compile(_REPO + r"/actions/jobs/(?P<id>\d+)/logs$"), self._redirect_logs("jobs")),
+            ("GET", re.compile(r"/_logs/runs/(?P<id>\d+)$"), self._run_logs),
+            ("GET", re.compile(r"/_logs/jobs/(?P<id>\d+)$"), self._job_logs),
+            ("GET", re.compile(_REPO + r"/actions/artifacts$"), self._list("artifacts", "artifacts")),
+            ("GET", re.compile(_REPO + r"/actions/caches$"), self._list("caches", "actions_caches")),
+            ("DELETE", re.compile(_REPO + r"/actions/caches/(?P<id>\d+)$"), self._delete("caches")),
+            ("GET", re.compile(_REPO + r"/issues$"), self._list("issues")),
+            ("POST", re.compile(_REPO + r"/issues$"), self._create("issues")),
+            ("GET", re.compile(_REPO + r"/pulls$"), self._list("pulls")),
+            ("GET", re.compile(_REPO + r"/pulls/(?P<id>\d+)$"), self._get("pulls", "number")),
+            ("GET", re.compile(_REPO + r"/releases$"), self._list("releases")),
+            ("POST", re.compile(_REPO + r"/releases$"), self._create("releases")),
+            ("GET", re.compile(_REPO + r"/releases/tags/(?P<id>[^/]+)$"), self._get("releases", "tag_name")),
+            ("GET", re.compile(_REPO + r"/actions/secrets/public-key$"), self._public_key),
+            ("GET", re.compile(_REPO + r"/actions/secrets$"), self._list("secrets", "secrets")),
+            ("GET", re.compile(_REPO + r"/actions/secrets/(?P<id>[^/]+)$"), self._get("secrets", "name")),
+            ("PUT", re.compile(_REPO + r"/actions/secrets/(?P<id>[^/]+)$"), self._put_secret),
+            ("DELETE", re.compile(_REPO + r"/actions/secrets/(?P<id>[^/]+)$"), self._delete("secrets", "name")),
+        ]
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeGitHub":
+        fake = self
+
+        class Handler(_Handler):
+            server_state = fake
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakeGitHub":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any):
+        self.stop()
+
+    def reset_counters(self):
+        with self.lock:
+            self.requests = 0
+            self.connections = 0
+            self.not_modified = 0
+            self.rate_limited = 0
+
+    def fail_next(self, status: int, headers: Optional[Dict[str, str]] = None, times: int = 1,
+                  message: str = "Injected failure"):
+        """
+        Answer the next `times` requests with `status` and `headers`, e.g. 429 with Retry-After.
+        """
+        with self.lock:
+            self._scripted.extend([(status, {"message": message}, dict(headers or {}))] * times)
+
+    def route(self, method: str, path: str) -> Tuple[Optional[Callable], Dict[str, str]]:
+        for route_method, pattern, handler in self._routes:
+            match = pattern.match(path)
+            if match and route_method == method:
+                return handler, match.groupdict()
+        return None, {}
+
+    def rate_limit_headers(self) -> Dict[str, str]:
+        return {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(max(0, self.rate_remaining)),
+            "X-RateLimit-Reset": str(self.rate_reset),
+            "X-RateLimit-Resource": "core",
+        }
+
+    def _user(self, handler: "_Handler", query: Dict[str, List[str]], body: Any, **_: str):
+        return 200, {"login": "octocat", "id": 1}, {}
+
+    def _list(self, collection: str, item_key: Optional[str] = None) -> Callable:
+        def handle(handler: "_Handler", query: Dict[str, List[str]], body: Any, **_: str):
+            per_page = min(100, int(query.get("per_page", ["30"])[0]))
+            page = int(query.get("page", ["1"])[0])
+            if self.on_page is not None:
+                self.on_page(collection, page)
+            with self.lock:
+                items = getattr(self, collection)
+                total = len(items)
+                chunk = items[(page - 1) * per_page:page * per_page]
+
+            last = max(1, -(-total // per_page))
+            links = []
+            base = f"{self.url}{handler.path.split('?')[0]}"
+            params = {key: values[0] for key, values in query.items() if key != "page"}
+            if page < last:
+                links.append(f'<{base}?{urlencode(dict(params, page=page + 1))}>; rel="next"')
+                links.append(f'<{base}?{urlencode(dict(params, page=last))}>; rel="last"')
+            headers = {"Link": ", ".join(links)} if links else {}
+
+            payload = {"total_count": total, item_key: chunk} if item_key else chunk
+            return 200, payload, headers
+        return handle
+
+    def _get(self, collection: str, key: str) -> Callable:
+        def handle(handler: "_Handler", query: Dict[str, List[str]], body: Any, **groups: str):
+            with self.lock:
+                for item in getattr(self, collection):
+                    # Like GitHub, draft releases are not found by tag name.
+                    if str(item.get(key)) == groups["id"] and not (collection == "releases" and item.get("draft")):
+                        return 200, item, {}
+            return 404, {"message": "Not Found"}, {}
+        return handle
+
+    def _redirect_logs(self, kind: str) -> Callable:
+        def handle(handler: "_Handler", query: Dict[str, List[str]], body: Any, **groups: str):
+            with self.lock:
+                known = kind == "jobs" or any(str(run["id"]) == groups["id"] for run in self.runs)
+            if not known:
+                return 404, {"message": "Not Found"}, {}
+            return 302, None, {"Location": f"{self.url}/_logs/{kind}/{groups['id']}"}
+        return handle
+
+    def _run_logs(self, handler: "_Handler", query: Dict[str, List[str]], body: Any, **groups: str):
+        return 200, make_run_logs(int(groups["id"]), self.log_lines), {"Content-Type": "application/zip"}
+
+    def _job_logs(self, handler: "_Handler", query: Dict[str, List[str]], body: Any, **groups: str):
+        content = make_job_log(int(groups["id"]), "test", self.log_lines)
+        return 200, content, {"Content-Type": "text/plain"}
+
+    def _public_key(self, handler: "_Handler", query: Dict[str, List[str]], body: Any, **_: str):
+        return 200, self.public_key, {}
+
+    def _put_secret(self, handler: "_Handler", query: Dict[str, List[str]], body: Any, **groups: str):
+        if not body or body.get("key_id") != self.public_key["key_id"] or not body.get("encrypted_value"):
+            return 422, {"message": "Bad request"}, {}
+        now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        with self.lock:
+            self.secret_values[groups["id"]] = body["encrypted_value"]
+            for secret in self.secrets:
+                if secret["name"] == groups["id"]:
+                    secret["updated_at"] = now
+                    return 204, None, {}
+            self.secrets.append({"name": groups["id"], "created_at": now, "updated_at": now})
+        return 201, None, {}
+
+    def _delete(self, collection: str, key: str = "id") -> Callable:
+        def handle(handler: "_Handler", query: Dict[str, List[str]], body: Any, **groups: str):
+            with self.lock:
+                items = getattr(self, collection)
+                kept = [item for item in items if str(item[key]) != groups["id"]]
+                setattr(self, collection, kept)
+            if len(kept) == len(items):
+                return 404, {"message": "Not Found"}, {}
+            return 204, None, {}
+        return handle
+
+    def _create(self, collection: str) -> Callable:
+        def handle(handler: "_Handler", query: Dict[str, List[str]], body: Any, **_: str):
+            with self.lock:
+                items = getattr(self, collection)
+                now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+                item = dict(body or {}, id=len(items) + 1, number=len(items) + 1, created_at=now, updated_at=now)
+                items.insert(0, item)
+            return 201, item, {}
+        return handle
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Send headers and body in one segment; otherwise Nagle and delayed ACKs add ~40ms per response.
+    disable_nagle_algorithm = True
+    wbufsize = 64 * 1024
+    server_state: FakeGitHub
+
+    def setup(self):
+        super().setup()
+        with self.server_state.lock:
+            self.server_state.connections += 1
+
+    def log_message(self, format: str, *args: Any):
+        pass
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def _dispatch(self, method: str):
+        state = self.server_state
+        parts = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+
+        with state.lock:
+            state.requests += 1
+            fail = state.error_rate and state.random.random() < state.error_rate
+            scripted = state._scripted.pop(0) if state._scripted else None
+        if state.latency:
+            time.sleep(state.latency)
+
+        if scripted is not None:
+            self._reply(*scripted)
+            return
+        if fail:
+            self._reply(502, {"message": "Server Error"}, {})
+            return
+
+        with state.lock:
+            if time.time() >= state.rate_reset:
+                state.rate_remaining = state.rate_limit
+                state.rate_reset = int(time.time() + state.rate_window)
+            if state.rate_remaining <= 0:
+                state.rate_limited += 1
+                self._reply(403, {"message": "API rate limit exceeded"}, state.rate_limit_headers())
+                return
+
+        handler, groups = state.route(method, parts.path)
+        if handler is None:
+            self._reply(404, {"message": "Not Found"}, {})
+            return
+
+        status, payload, headers = handler(self, parse_qs(parts.query), body, **groups)
+        if isinstance(payload, bytes):
+            content = payload
+        else:
+            content = json.dumps(payload).encode("utf-8") if payload is not None else b""
+
+        if method == "GET" and status == 200:
+            etag = '"' + hashlib.sha1(content).hexdigest() + '"'
+            headers["ETag"] = etag
+            if self.headers.get("If-None-Match") == etag:
+                with state.lock:
+                    state.not_modified += 1
+                self._reply(304, None, dict(headers, **state.rate_limit_headers()))
+                return
+
+        with state.lock:
+            state.rate_remaining -= 1
+        self._reply(status, payload, dict(headers, **state.rate_limit_headers()), content)
+
+    def _reply(self, status: int, payload: Any, headers: Dict[str, str], content: Optional[bytes] = None):
+        if content is None:
+            content = json.dumps(payload).encode("utf-8") if payload is not None and status != 304 else b""
+        self.send_response(status)
+        if "Content-Type" not in headers:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        if content:
+            self.wfile.write(content)
@@ -0,0 +1,147 @@
+import argparse
+import json
+import statistics
+import threading
+import time
+import tracemalloc
+from typing import Optional, Any, Callable, Dict, List
+
+from benchmarks.fake_github import FakeGitHub
+from ghmate.actions_commands import ActionsCommands
+from ghmate.rate_limit import RateLimiter
+from ghmate.transport import Transport
+
+
+class TimingTransport(Transport):
+    """
+    Transport that records the latency of every request it sends.
+    """
+
+    def __init__(self, **options: Any):
+        super().__init__(**options)
+        self.latencies: List[float] = []
+        self._lock = threading.Lock()
+
+    def request(self, *args: Any, **kwargs: Any):
+        started = time.perf_counter()
+        try:
+            return super().request(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.latencies.append(elapsed)
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _run(server: FakeGitHub, workload: Callable[[ActionsCommands], Any], pool_size: int,
+         trace_memory: bool) -> Dict[str, Any]:
+    transport = TimingTransport(pool_maxsize=pool_size)
+    client = ActionsCommands(owner="octo", repo="demo", token="benchmark", api_url=server.url,
+                             transport=transport, rate_limiter=RateLimiter())
+    server.reset_counters()
+
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    workload(client)
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1] if trace_memory else 0
+    if trace_memory:
+        tracemalloc.stop()
+    transport.close()
+    return {"elapsed": elapsed, "latencies": transport.latencies, "peak": peak, "connections": server.connections}
+
+
+def measure(name: str, make_server: Callable[[], FakeGitHub], workload: Callable[[ActionsCommands], Any],
+            pool_size: int = 32) -> Dict[str, Any]:
+    """
+    Run a workload against a fresh fake server and collect throughput, latency, memory and connection figures.
+    Timing and memory come from separate runs, since tracing allocations slows the workload down.
+    """
+    with make_server() as server:
+        timed = _run(server, workload, pool_size, trace_memory=False)
+    with make_server() as server:
+        traced = _run(server, workload, pool_size, trace_memory=True)
+
+    latencies = timed["latencies"]
+    elapsed = timed["elapsed"]
+    return {
+        "scenario": name,
+        "requests": len(latencies),
+        "seconds": round(elapsed, 3),
+        "requests_per_sec": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 2),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 2) if latencies else 0.0,
+        "peak_memory_kb": round(traced["peak"] / 1024, 1),
+        "connections": timed["connections"],
+    }
+
+
+def bench_single_calls(calls: int, latency: float) -> Dict[str, Any]:
+    def workload(client: ActionsCommands):
+        for _ in range(calls):
+            client.run("list")
+
+    return measure("single_calls", lambda: FakeGitHub(runs=100, latency=latency), workload)
+
+
+def bench_pagination(runs: int, latency: float, prefetch: int) -> Dict[str, Any]:
+    def workload(client: ActionsCommands):
+        count = sum(1 for _ in client.paginate("actions/runs", item_key="workflow_runs", prefetch=prefetch))
+        assert count == runs, f"expected {runs} runs, got {count}"
+
+    return measure(f"pagination_prefetch_{prefetch}", lambda: FakeGitHub(runs=runs, latency=latency), workload)
+
+
+def bench_bulk_delete(runs: int, latency: float, workers: int) -> Dict[str, Any]:
+    def workload(client: ActionsCommands):
+        report = client.bulk_delete_workflow_runs(workers=workers)
+        assert report.counts["deleted"] == runs, report
+
+    return measure(f"bulk_delete_{workers}_workers", lambda: FakeGitHub(runs=runs, latency=latency), workload,
+                   pool_size=workers + 8)
+
+
+def run_all(runs: int = 5000, calls: int = 500, latency: float = 0.002, workers: int = 16) -> List[Dict[str, Any]]:
+    return [
+        bench_single_calls(calls, latency),
+        bench_pagination(runs, latency, prefetch=1),
+        bench_pagination(runs, latency, prefetch=4),
+        bench_bulk_delete(runs, latency, workers=workers),
+    ]
+
+
+def print_table(results: List[Dict[str, Any]]):
+    columns = list(results[0].keys())
+    widths = {column: max(len(column), *(len(str(row[column])) for row in results)) for column in columns}
+    print("  ".join(column.ljust(widths[column]) for column in columns))
+    for row in results:
+        print("  ".join(str(row[column]).ljust(widths[column]) for column in columns))
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark ghmate against a local fake GitHub API.")
+    parser.add_argument("--runs", type=int, default=5000, help="workflow runs used for pagination and deletion")
+    parser.add_argument("--calls", type=int, default=500, help="sequential calls in the single-call scenario")
+    parser.add_argument("--latency", type=float, default=0.002, help="server latency per request in seconds")
+    parser.add_argument("--workers", type=int, default=16, help="delete workers in the bulk-deletion scenario")
+    parser.add_argument("--json", dest="json_path", help="also write the results to this file as JSON")
+    args = parser.parse_args(argv)
+
+    results = run_all(runs=args.runs, calls=args.calls, latency=args.latency, workers=args.workers)
+    print_table(results)
+    if args.json_path:
+        with open(args.json_path, "w") as json_file:
+            json.dump(results, json_file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Optional, Any, Dict, List
+
+from benchmarks.fake_github import FakeGitHub
+from benchmarks.run_benchmarks import print_table
+
+
+def time_command(command: List[str], repeat: int, env: Optional[Dict[str, str]] = None) -> List[float]:
+    """
+    Wall-clock milliseconds of running a command to completion, once per repetition.
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        completed = subprocess.run(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        timings.append((time.perf_counter() - started) * 1000)
+        if completed.returncode != 0:
+            raise RuntimeError(f"{' '.join(command)} exited with {completed.returncode}: {completed.stderr.decode()}")
+    return timings
+
+
+def slowest_imports(command: List[str], env: Optional[Dict[str, str]] = None, count: int = 10) -> List[str]:
+    """
+    The top-level imports of a command with the highest cumulative import time, from -X importtime.
+    """
+    completed = subprocess.run([command[0], "-X", "importtime", *command[1:]], env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if cumulative.strip().isdigit() and not name.startswith("  "):
+            rows.append((int(cumulative), name.strip()))
+    return [f"{name} {cumulative / 1000:.1f}ms" for cumulative, name in sorted(rows, reverse=True)[:count]]
+
+
+def run_all(repeat: int) -> List[Dict[str, Any]]:
+    python = sys.executable
+    scenarios = [
+        ("python", [python, "-c", "pass"]),
+        ("ghmate --version", [python, "-m", "ghmate", "--version"]),
+        ("ghmate --help", [python, "-m", "ghmate", "--help"]),
+        ("ghmate actions run list", [python, "-m", "ghmate", "actions", "run", "list"]),
+    ]
+    results = []
+    with FakeGitHub(runs=100) as server:
+        env = dict(os.environ, GITHUB_TOKEN="test", GITHUB_REPOSITORY="octo/demo", GITHUB_API_URL=server.url)
+        baseline = None
+        for name, command in scenarios:
+            timings = time_command(command, repeat, env=env)
+            median = statistics.median(timings)
+            baseline = median if baseline is None else baseline
+            results.append({
+                "command": name,
+                "median_ms": round(median, 1),
+                "min_ms": round(min(timings), 1),
+                "overhead_ms": round(median - baseline, 1),
+            })
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure the cold start of the ghmate command line interface.")
+    parser.add_argument("--repeat", type=int, default=10, help="runs of every command")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="fail if a command takes longer than this over the bare interpreter")
+    parser.add_argument("--imports", action="store_true", help="also list the slowest imports of an API call")
+    parser.add_argument("--json", dest="json_path", help="also write the results to this file as JSON")
+    args = parser.parse_args(argv)
+
+    results = run_all(args.repeat)
+    print_table(results)
+    if args.imports:
+        with FakeGitHub(runs=10) as server:
+            env = dict(os.environ, GITHUB_TOKEN="test", GITHUB_REPOSITORY="octo/demo", GITHUB_API_URL=server.url)
+            print("\n".join(slowest_imports([sys.executable, "-m", "ghmate", "actions", "run", "list"], env=env)))
+    if args.json_path:
+        with open(args.json_path, "w") as json_file:
+            json.dump(results, json_file, indent=4)
+
+    over_budget = [row for row in results if args.budget_ms is not None and row["overhead_ms"] > args.budget_ms]
+    for row in over_budget:
+        print(f"{row['command']} is {row['overhead_ms']}ms over the interpreter start, above {args.budget_ms}ms")
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+import sys
+
+from ghmate.cli import main
+
+sys.exit(main())
@@ -0,0 +1,362 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Any, Callable, Dict, Iterable, List, Set
+
+from ghmate.records import ActionsCacheEntry
+
+DELETED = "deleted"
+NOT_FOUND = "not_found"
+FAILED = "failed"
+DRY_RUN = "dry_run"
+
+# GitHub evicts caches beyond 10 GB per repository; keep some headroom by default.
+REPOSITORY_LIMIT = 10 * 1024 ** 3
+
+
+def key_prefix(key: str) -> str:
+    """
+    Default key prefix: the cache key without its last "-" separated part, usually a lockfile hash.
+    """
+    return key.rsplit("-", 1)[0] if "-" in key else key
+
+
+def _parse_timestamp(value: Optional[str]) -> datetime:
+    if not value:
+        return datetime.min.replace(tzinfo=timezone.utc)
+    return datetime.strptime(value[:19], "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
+
+
+class CacheIndex:
+    """
+    In-memory index of the Actions cache entries of a repository by ref, key prefix, size and last access.
+
+    Args:
+    - entries (iterable of ActionsCacheEntry): The cache entries.
+    - prefix_of (callable): Maps a cache key to the prefix it is grouped under. Defaults to key_prefix.
+    """
+
+    def __init__(self, entries: Iterable[ActionsCacheEntry], prefix_of: Callable[[str], str] = key_prefix):
+        self.prefix_of = prefix_of
+        self.entries: Dict[int, ActionsCacheEntry] = {}
+        self.by_ref: Dict[str, Set[int]] = {}
+        self.by_prefix: Dict[str, Set[int]] = {}
+        self.total_bytes = 0
+        for entry in entries:
+            self.add(entry)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries.values())
+
+    def add(self, entry: ActionsCacheEntry):
+        if entry.id in self.entries:
+            self.remove(entry.id)
+        self.entries[entry.id] = entry
+        self.by_ref.setdefault(entry.ref, set()).add(entry.id)
+        self.by_prefix.setdefault(self.prefix_of(entry.key), set()).add(entry.id)
+        self.total_bytes += entry.size_in_bytes or 0
+
+    def remove(self, cache_id: int) -> Optional[ActionsCacheEntry]:
+        entry = self.entries.pop(cache_id, None)
+        if entry is None:
+            return None
+        for mapping, name in ((self.by_ref, entry.ref), (self.by_prefix, self.prefix_of(entry.key))):
+            ids = mapping[name]
+            ids.discard(cache_id)
+            if not ids:
+                del mapping[name]
+        self.total_bytes -= entry.size_in_bytes or 0
+        return entry
+
+    def least_recently_used(self) -> List[ActionsCacheEntry]:
+        """
+        All entries, least recently accessed first.
+        """
+        return sorted(self.entries.values(), key=lambda entry: (entry.last_accessed_at or "", entry.id))
+
+    def usage(self, group: str = "ref") -> Dict[str, int]:
+        """
+        Bytes used per ref or per key prefix, largest first.
+        """
+        mapping = self.by_ref if group == "ref" else self.by_prefix
+        sizes = {name: sum(self.entries[cache_id].size_in_bytes or 0 for cache_id in ids)
+                 for name, ids in mapping.items()}
+        return dict(sorted(sizes.items(), key=lambda item: item[1], reverse=True))
+
+
+class StaleRefPolicy:
+    """
+    Evicts the caches of refs that are gone: branches that no longer exist and pull requests
+    that are no longer open. Caches of the remaining refs are kept unless `older_than` is given,
+    in which case caches of any ref other than the protected ones that were not accessed for that
+    long are evicted as well.
+
+    Args:
+    - active_refs (iterable of str, optional): Refs to keep, e.g. "refs/heads/main". Fetched from
+    the repository's branches and open pull requests if not provided.
+    - protected_refs (iterable of str): Refs never purged, whatever their age.
+    - older_than (timedelta, optional): Also evict caches not accessed for this long.
+    """
+
+    name = "stale_ref"
+
+    def __init__(self, active_refs: Optional[Iterable[str]] = None, protected_refs: Iterable[str] = (),
+                 older_than: Optional[timedelta] = None):
+        self.active_refs = set(active_refs) if active_refs is not None else None
+        self.protected_refs = set(protected_refs)
+        self.older_than = older_than
+
+    def prepare(self, client: Any) -> Set[str]:
+        """
+        Return the refs to keep for the client's repository. Fetched refs are not stored on the
+        policy, so a reused policy or one shared between repositories always sees current refs.
+        """
+        if self.active_refs is not None:
+            return self.active_refs
+        refs = {f"refs/heads/{branch['name']}" for branch in client.paginate("branches")}
+        for pull in client.paginate("pulls", params={"state": "open"}):
+            refs.add(f"refs/pull/{pull['number']}/merge")
+            refs.add(f"refs/pull/{pull['number']}/head")
+        return refs
+
+    def select(self, index: CacheIndex, active_refs: Optional[Set[str]] = None) -> List[ActionsCacheEntry]:
+        active_refs = active_refs if active_refs is not None else self.active_refs
+        cutoff = datetime.now(timezone.utc) - self.older_than if self.older_than else None
+        selected = []
+        for ref, ids in index.by_ref.items():
+            if ref in self.protected_refs:
+                continue
+            gone = active_refs is not None and ref not in active_refs and not ref.startswith("refs/tags/")
+            for cache_id in ids:
+                entry = index.entries[cache_id]
+                if gone or (cutoff is not None and _parse_timestamp(entry.last_accessed_at) < cutoff):
+                    selected.append(entry)
+        return selected
+
+
+class PrefixRetentionPolicy:
+    """
+    Keeps only the `keep` most recently accessed entries of every key prefix, per ref, so
+    superseded caches (e.g. of an old lockfile hash) are evicted.
+
+    Args:
+    - keep (int): Number of entries kept for each key prefix and ref.
+    - prefixes (iterable of str, optional): Only apply to these key prefixes.
+    """
+
+    name = "prefix_retention"
+
+    def __init__(self, keep: int = 1, prefixes: Optional[Iterable[str]] = None):
+        self.keep = keep
+        self.prefixes = set(prefixes) if prefixes is not None else None
+
+    def prepare(self, client: Any) -> None:
+        return None
+
+    def select(self, index: CacheIndex, prepared: Any = None) -> List[ActionsCacheEntry]:
+        selected = []
+        for prefix, ids in index.by_prefix.items():
+            if self.prefixes is not None and prefix not in self.prefixes:
+                continue
+            per_ref: Dict[str, List[ActionsCacheEntry]] = {}
+            for cache_id in ids:
+                entry = index.entries[cache_id]
+                per_ref.setdefault(entry.ref, []).append(entry)
+            for entries in per_ref.values():
+                entries.sort(key=lambda entry: (entry.last_accessed_at or "", entry.id), reverse=True)
+                selected.extend(entries[self.keep:])
+        return selected
+
+
+class LRUPolicy:
+    """
+    Evicts the least recently accessed entries until the repository uses at most `target_bytes`.
+
+    Args:
+    - target_bytes (int): Size the caches of the repository are brought down to.
+    """
+
+    name = "lru"
+
+    def __init__(self, target_bytes: int = REPOSITORY_LIMIT * 8 // 10):
+        self.target_bytes = target_bytes
+
+    def prepare(self, client: Any) -> None:
+        return None
+
+    def select(self, index: CacheIndex, prepared: Any = None) -> List[ActionsCacheEntry]:
+        selected = []
+        excess = index.total_bytes - self.target_bytes
+        for entry in index.least_recently_used():
+            if excess <= 0:
+                break
+            selected.append(entry)
+            excess -= entry.size_in_bytes or 0
+        return selected
+
+
+class CacheEviction:
+    """
+    Outcome of evicting one cache entry.
+    """
+
+    __slots__ = ("cache_id", "key", "ref", "size_in_bytes", "policy", "status", "status_code")
+
+    def __init__(self, entry: ActionsCacheEntry, policy: str, status: str, status_code: Optional[int] = None):
+        self.cache_id = entry.id
+        self.key = entry.key
+        self.ref = entry.ref
+        self.size_in_bytes = entry.size_in_bytes or 0
+        self.policy = policy
+        self.status = status
+        self.status_code = status_code
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"CacheEviction(cache_id={self.cache_id}, key={self.key!r}, status={self.status!r})"
+
+
+class CacheEvictionReport:
+    """
+    Progress and outcome of a cache eviction.
+    """
+
+    def __init__(self, entries_before: int, bytes_before: int, dry_run: bool):
+        self.entries_before = entries_before
+        self.bytes_before = bytes_before
+        self.dry_run = dry_run
+        self.results: List[CacheEviction] = []
+        self.started_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+
+    @property
+    def bytes_reclaimed(self) -> int:
+        return sum(result.size_in_bytes for result in self.results if result.status in (DELETED, NOT_FOUND, DRY_RUN))
+
+    @property
+    def bytes_after(self) -> int:
+        return self.bytes_before - self.bytes_reclaimed
+
+    def count(self, status: str) -> int:
+        return sum(1 for result in self.results if result.status == status)
+
+    def by_policy(self) -> Dict[str, int]:
+        reclaimed: Dict[str, int] = {}
+        for result in self.results:
+            if result.status != FAILED:
+                reclaimed[result.policy] = reclaimed.get(result.policy, 0) + result.size_in_bytes
+        return reclaimed
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = (self.finished_at or time.monotonic()) - self.started_at
+        return {
+            "dry_run": self.dry_run,
+            "entries_before": self.entries_before,
+            "bytes_before": self.bytes_before,
+            "bytes_reclaimed": self.bytes_reclaimed,
+            "bytes_after": self.bytes_after,
+            "reclaimed_by_policy": self.by_policy(),
+            "planned": len(self.results),
+            **{status: self.count(status) for status in (DELETED, NOT_FOUND, FAILED)},
+            "elapsed": round(elapsed, 3),
+        }
+
+    def __repr__(self) -> str:
+        return f"CacheEvictionReport({self.to_dict()})"
+
+
+class CacheManager:
+    """
+    Pages through the Actions caches of a repository, indexes them and evicts entries by policy.
+
+    Policies are applied in order, each to what the previous ones left, so a stale-ref purge
+    followed by an LRU policy only evicts recently used caches if the purge did not free enough.
+    Deletions are sent concurrently through the client. A policy has a name, a prepare(client)
+    method returning what it needs to know about the repository for this run, and a
+    select(index, prepared) method returning the entries to evict.
+
+    Args:
+    - client (ActionsCommands): Client of the repository.
+    - workers (int): Number of deletions in flight at once.
+    - prefix_of (callable): Maps a cache key to its prefix. Defaults to key_prefix.
+
+    Usage:
+    manager = CacheManager(actions, workers=16)
+    report = manager.evict([StaleRefPolicy(), PrefixRetentionPolicy(keep=2), LRUPolicy(8 * 1024 ** 3)], dry_run=True)
+    print(report.bytes_reclaimed)
+    """
+
+    def __init__(self, client: Any, workers: int = 8, prefix_of: Callable[[str], str] = key_prefix):
+        self.client = client
+        self.workers = workers
+        self.prefix_of = prefix_of
+
+    def index(self, **filters: Any) -> CacheIndex:
+        """
+        List every cache entry of the repository into a CacheIndex.
+        Args:
+        - filters: Query parameters accepted by the list endpoint, e.g. ref or key.
+        """
+        entries = self.client.paginate("actions/caches", item_key="actions_caches", params=filters,
+                                       record=ActionsCacheEntry, keep_extra=False)
+        return CacheIndex(entries, prefix_of=self.prefix_of)
+
+    def plan(self, policies: Iterable[Any], index: Optional[CacheIndex] = None) -> List[CacheEviction]:
+        """
+        Return the entries the policies would evict, tagged with the policy that selected them.
+        The index, if given, is left untouched.
+        """
+        index = CacheIndex(index if index is not None else self.index(), prefix_of=self.prefix_of)
+        planned = []
+        for policy in policies:
+            prepared = policy.prepare(self.client)
+            for entry in policy.select(index, prepared):
+                if index.remove(entry.id) is not None:
+                    planned.append(CacheEviction(entry, policy.name, DRY_RUN))
+        return planned
+
+    def evict(self, policies: Iterable[Any], dry_run: bool = False,
+              index: Optional[CacheIndex] = None) -> CacheEvictionReport:
+        """
+        Evict the entries selected by the policies.
+        Args:
+        - policies (iterable): Policies such as StaleRefPolicy, PrefixRetentionPolicy and LRUPolicy.
+        - dry_run (bool): Report what would be evicted without deleting anything.
+        - index (CacheIndex, optional): An index built earlier; listed again if not provided.
+        Returns:
+        - CacheEvictionReport: Bytes reclaimed and the outcome of every deletion.
+        """
+        index = index if index is not None else self.index()
+        report = CacheEvictionReport(len(index), index.total_bytes, dry_run)
+        planned = self.plan(policies, index)
+        if dry_run:
+            report.results = planned
+        else:
+            with ThreadPoolExecutor(max_workers=max(1, self.workers), thread_name_prefix="ghmate-cache") as executor:
+                report.results = list(executor.map(self._delete, planned))
+
+        report.finished_at = time.monotonic()
+        logging.info(f"Actions cache eviction for {self.client.repo} finished: {report.to_dict()}")
+        return report
+
+    def _delete(self, eviction: CacheEviction) -> CacheEviction:
+        try:
+            response = self.client._make_request(method="DELETE", endpoint=f"actions/caches/{eviction.cache_id}")
+        except Exception as error:
+            logging.warning(f"Deleting cache {eviction.cache_id} failed: {error}")
+            eviction.status = FAILED
+            return eviction
+        eviction.status_code = response.status_code
+        if response.status_code == 204:
+            eviction.status = DELETED
+        elif response.status_code == 404:
+            eviction.status = NOT_FOUND
+        else:
+            eviction.status = FAILED
+        return eviction
@@ -1,7 +1,17 @@
-from typing import Optional, Any
+from typing import TYPE_CHECKING, Optional, Any, Callable, Iterable, Iterator, List
 
 from ghmate.github_client import GitHubClient
 
+# The records, cache, artifact and bulk delete helpers are imported by the methods using them, so
+# that short-lived processes such as the CLI only load what they run.
+if TYPE_CHECKING:  # pragma: no cover
+    from ghmate.records import ActionsCacheEntry, Artifact, WorkflowRun
+    from ghmate.actions_cache import CacheEvictionReport, CacheIndex
+    from ghmate.analytics import RunTable
+    from ghmate.artifacts import ArtifactDownload
+    from ghmate.bulk_delete import BulkDeleteReport, RunFilter
+    from ghmate.logs import LogFile, LogMatch
+
 
 class ActionsCommands(GitHubClient):
     """
@@ -12,13 +22,14 @@ class ActionsCommands(GitHubClient):
 
     LIST_ACTION = "list"
     RESTORE_ACTION = "restore"
+    DELETE_ACTION = "delete"
 
-    def __init__(self, owner: str, repo: str, token: Optional[str] = None):
-        super().__init__(owner=owner, repo=repo, token=token)
+    def __init__(self, owner: str, repo: str, token: Optional[str] = None, **kwargs: Any):
+        super().__init__(owner=owner, repo=repo, token=token, **kwargs)
 
     def cache(self, action: str, *args: Optional[Any]) -> Any:
         if action == ActionsCommands.LIST_ACTION:
-            endpoint = "actions/cache"
+            endpoint = "actions/caches"
             return self._make_request(method="GET", endpoint=endpoint)
 
         elif action == ActionsCommands.RESTORE_ACTION:
@@ -26,9 +37,60 @@ class ActionsCommands(GitHubClient):
             endpoint = f"actions/cache/{key}/restore"
             return self._make_request(method="POST", endpoint=endpoint)
 
+        elif action == ActionsCommands.DELETE_ACTION:
+            return self.delete_cache(*args)
+
         else:
             raise ValueError(f"Unsupported action: {action}")
 
+    def iter_caches(self, **filters: Any) -> Iterator["ActionsCacheEntry"]:
+        """
+        Lazily iterate over every Actions cache entry of the repository.
+        Args:
+        - filters: Query parameters accepted by the list endpoint, e.g. ref, key, sort or direction.
+        Returns:
+        - Iterator[ActionsCacheEntry]: The cache entries, fetched page by page.
+        """
+        from ghmate.records import ActionsCacheEntry
+
+        return self.paginate("actions/caches", item_key="actions_caches", params=filters, record=ActionsCacheEntry)
+
+    def delete_cache(self, cache: Any, ref: Optional[str] = None) -> Any:
+        """
+        Delete an Actions cache entry by ID, or every entry with a key (optionally limited to a ref).
+        Args:
+        - cache (int or str): The cache ID, or the full cache key.
+        - ref (str, optional): Only delete entries of this ref when deleting by key.
+        """
+        if isinstance(cache, int):
+            return self._make_request(method="DELETE", endpoint=f"actions/caches/{cache}")
+        params = {"key": cache}
+        if ref is not None:
+            params["ref"] = ref
+        return self._make_request(method="DELETE", endpoint="actions/caches", params=params)
+
+    def cache_usage(self) -> Any:
+        """
+        Get the number and total size of the repository's active Actions caches.
+        """
+        return self._make_request(method="GET", endpoint="actions/cache/usage").json()
+
+    def evict_caches(self, policies: Iterable[Any], dry_run: bool = False, workers: int = 8,
+                     index: Optional["CacheIndex"] = None) -> "CacheEvictionReport":
+        """
+        Evict Actions cache entries selected by policies, deleting them concurrently.
+        Args:
+        - policies (iterable): StaleRefPolicy, PrefixRetentionPolicy and LRUPolicy instances, applied in order.
+        - dry_run (bool): Report what would be evicted without deleting anything.
+        - workers (int): Number of deletes in flight at once.
+        - index (CacheIndex, optional): An index built earlier with CacheManager.index.
+        Returns:
+        - CacheEvictionReport: Bytes reclaimed and the outcome of every deletion.
+        """
+        from ghmate.actions_cache import CacheManager
+
+        return CacheManager(self, workers=workers).evict(policies, dry_run=dry_run, index=index)
+
     def run(self, action: str) -> Any:
         if action == ActionsCommands.LIST_ACTION:
             endpoint = "actions/runs"
@@ -40,10 +102,11 @@ class ActionsCommands(GitHubClient):
     def get_artifacts(self):
         endpoint = "actions/artifacts"
         payload = {}
+        from ghmate.records import Artifact
 
         try:
             response = self._make_request(method="GET", endpoint=endpoint, payload=payload)
-            artifacts = response.json().get('artifacts', [])
+            artifacts = Artifact.from_json(response.content, item_key="artifacts")
             if not artifacts:
                 no_artifacts = f"No artifacts found for repository {self.repo}"
                 return no_artifacts
@@ -75,14 +138,127 @@ class ActionsCommands(GitHubClient):
 
         return artifact_list
 
-    def get_all_workflow_runs(self):
-        runs = []
-        url = "actions/runs"
-        while url:
-            response = self._make_request(method="GET", endpoint=url)
-            runs.extend(response.json().get('workflow_runs', []))
-            url = response.json().get('next_page', None)
-        return runs
+    def iter_artifacts(self, **filters: Any) -> Iterator["Artifact"]:
+        """
+        Lazily iterate over every artifact of the repository.
+        Args:
+        - filters: Query parameters accepted by the list endpoint, e.g. name.
+        Returns:
+        - Iterator[Artifact]: The artifacts, fetched page by page.
+        """
+        from ghmate.records import Artifact
+
+        return self.paginate("actions/artifacts", item_key="artifacts", params=filters, record=Artifact)
+
+    def download_artifacts(self, directory: str, name: Optional[str] = None, workers: int = 4,
+                           verify: bool = True, extract: bool = False) -> List["ArtifactDownload"]:
+        """
+        Download artifact archives to a directory, streaming them to disk in parallel.
+        Partial downloads left by an earlier attempt are resumed.
+        Args:
+        - directory (str): Directory the archives are written to.
+        - name (str, optional): Only download artifacts with this name.
+        - workers (int): Number of artifacts downloaded at once.
+        - verify (bool): Check each archive against its sha256 digest when GitHub provides one.
+        - extract (bool): Extract every archive into a directory next to it.
+        Returns:
+        - List[ArtifactDownload]: The outcome of every download.
+        """
+        from ghmate.artifacts import ArtifactDownloader
+
+        filters = {"name": name} if name else {}
+        downloader = ArtifactDownloader(self, directory, workers=workers, verify=verify, extract=extract)
+        return list(downloader.download_all(self.iter_artifacts(**filters)))
+
+    def iter_workflow_runs(self, keep_extra: bool = True, **filters: Any) -> Iterator["WorkflowRun"]:
+        """
+        Lazily iterate over every workflow run of the repository, newest first.
+        Args:
+        - keep_extra (bool): Keep the fields WorkflowRun does not declare, such as the nested repository objects.
+        - filters: Query parameters accepted by the list endpoint, e.g. branch, status or created.
+        Returns:
+        - Iterator[WorkflowRun]: The workflow runs, fetched page by page.
+        """
+        from ghmate.records import WorkflowRun
+
+        return self.paginate("actions/runs", item_key="workflow_runs", params=filters, record=WorkflowRun,
+                             keep_extra=keep_extra)
+
+    def get_all_workflow_runs(self, keep_extra: bool = True) -> List["WorkflowRun"]:
+        return list(self.iter_workflow_runs(keep_extra=keep_extra))
+
+    def workflow_run_analytics(self, table: Optional["RunTable"] = None, **filters: Any) -> "RunTable":
+        """
+        Load workflow runs into a columnar RunTable for queue time, duration, failure rate and
+        flakiness statistics. Runs are added page by page as they are fetched.
+        Args:
+        - table (RunTable, optional): A table to add the runs to, e.g. to fetch only runs created
+        since the last refresh with created=">=2024-05-01". Runs already in it are updated.
+        - filters: Query parameters accepted by the list endpoint, e.g. branch, status or created.
+        Returns:
+        - RunTable: The table holding the runs.
+        """
+        from ghmate.analytics import RunTable
+
+        table = table if table is not None else RunTable()
+        table.extend(self.iter_workflow_runs(keep_extra=False, **filters))
+        return table
+
+    def download_run_logs(self, runs: Iterable[Any], cache_dir: Optional[str] = None,
+                          workers: int = 8) -> List["LogFile"]:
+        """
+        Download the log archives of workflow runs into the local log cache, in parallel.
+        Archives of completed runs already in the cache are not downloaded again.
+        Args:
+        - runs (iterable): Run IDs or run objects, e.g. from iter_workflow_runs.
+        - cache_dir (str, optional): Directory of the log cache. Defaults to ~/.cache/ghmate/logs.
+        - workers (int): Number of archives downloaded at once.
+        Returns:
+        - List[LogFile]: Where each archive was stored, or why it could not be fetched.
+        """
+        from ghmate.logs import LogCache, LogDownloader
+
+        cache = LogCache(cache_dir) if cache_dir else LogCache()
+        return list(LogDownloader(self, cache, workers=workers).fetch_runs(runs))
+
+    def get_job_logs(self, job_id: int, cache_dir: Optional[str] = None) -> str:
+        """
+        Get the plain-text log of a job, through the local log cache.
+        """
+        from ghmate.logs import LogCache, LogDownloader
+
+        cache = LogCache(cache_dir) if cache_dir else LogCache()
+        log = LogDownloader(self, cache).fetch_job(job_id)
+        if not log.ok:
+            raise Exception(f"Failed to get logs of job {job_id}: {log.error or log.status}")
+        with open(log.path, "r", encoding="utf-8", errors="replace") as log_file:
+            return log_file.read()
+
+    def search_run_logs(self, pattern: str, runs: Optional[Iterable[Any]] = None, limit: Optional[int] = 500,
+                        ignore_case: bool = False, cache_dir: Optional[str] = None, processes: Optional[int] = None,
+                        download_workers: int = 8, **filters: Any) -> Iterator["LogMatch"]:
+        """
+        Search the logs of workflow runs for a regular expression, downloading the archives that are
+        not cached yet and searching them in parallel processes as they arrive.
+        Args:
+        - pattern (str): Regular expression matched against every log line.
+        - runs (iterable, optional): Run IDs or run objects. Defaults to the runs matching `filters`, newest first.
+        - limit (int, optional): Only search the logs of the first `limit` runs.
+        - ignore_case (bool): Match case-insensitively.
+        - cache_dir (str, optional): Directory of the log cache. Defaults to ~/.cache/ghmate/logs.
+        - processes (int, optional): Number of search processes. Defaults to the number of CPUs.
+        - download_workers (int): Number of archives downloaded at once.
+        - filters: Query parameters of the run list endpoint, e.g. status="failure" or branch="main".
+        Returns:
+        - Iterator[LogMatch]: The matching lines, yielded as each archive is searched.
+        """
+        from ghmate.logs import LogCache, LogSearch
+
+        cache = LogCache(cache_dir) if cache_dir else LogCache()
+        if runs is None:
+            runs = self.iter_workflow_runs(keep_extra=False, **filters)
+        search = LogSearch(self, cache, download_workers=download_workers, processes=processes)
+        return search.search(runs, pattern, ignore_case=ignore_case, limit=limit)
 
     def delete_workflow_run(self, run_id):
         try:
@@ -98,11 +274,32 @@ class ActionsCommands(GitHubClient):
             print(f"Unexpected Error deleting workflow run {run_id}: {error}")
             return f"Unexpected Error: {error}"
 
-    def delete_all_workflow_runs(self):
-        all_runs = self.get_all_workflow_runs()
-        print(f"Total workflow runs found: {len(all_runs)}")
+    def bulk_delete_workflow_runs(self, run_filter: Optional["RunFilter"] = None, workers: int = 8,
+                                  dry_run: bool = False, checkpoint: Optional[str] = None,
+                                  progress: Optional[Callable[["BulkDeleteReport"], None]] = None
+                                  ) -> "BulkDeleteReport":
+        """
+        Delete the workflow runs selected by a filter concurrently while they are being listed.
+        Args:
+        - run_filter (RunFilter, optional): Which runs to delete. Every run is deleted if not provided.
+        - workers (int): Number of deletes in flight at once.
+        - dry_run (bool): Report what would be deleted without deleting anything.
+        - checkpoint (str, optional): Path of a file used to resume an interrupted cleanup.
+        - progress (callable, optional): Called with the report as deletions complete.
+        Returns:
+        - BulkDeleteReport: Counts, throughput and the per-run results.
+        """
+        from ghmate.bulk_delete import BulkDeleter
 
-        for run in all_runs:
-            self.delete_workflow_run(run['id'])
+        deleter = BulkDeleter(
+            self,
+            run_filter=run_filter,
+            workers=workers,
+            dry_run=dry_run,
+            checkpoint=checkpoint,
+            progress=progress,
+        )
+        return deleter.run()
 
-        print("\nAll workflow runs deletion process completed.")
+    def delete_all_workflow_runs(self) -> "BulkDeleteReport":
+        return self.bulk_delete_workflow_runs()
@@ -0,0 +1,311 @@
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Any, Dict, List, Mapping, Tuple
+
+from ghmate.singleflight import SingleFlight
+
+CREATED = "created"
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+DELETED = "deleted"
+FAILED = "failed"
+DRY_RUN = "dry_run"
+
+# Status GitHub answers a secret write with when the key_id no longer matches the repository key.
+_STALE_KEY_STATUSES = (400, 422)
+
+
+def encrypt_secret(public_key: str, value: str) -> str:
+    """
+    Encrypt a secret value for GitHub Actions with a libsodium sealed box.
+    Args:
+    - public_key (str): The base64-encoded repository public key.
+    - value (str): The plaintext secret value.
+    Returns:
+    - str: The base64-encoded encrypted value.
+    """
+    return base64.b64encode(_sealed_box(public_key).encrypt(value.encode("utf-8"))).decode("ascii")
+
+
+_boxes: Dict[str, Any] = {}
+_boxes_lock = threading.Lock()
+
+
+def _sealed_box(public_key: str) -> Any:
+    # PyNaCl is imported on first use so that importing the clients stays cheap.
+    try:
+        from nacl import public as nacl_public
+    except ImportError:  # pragma: no cover - optional dependency
+        raise ImportError("Encrypting secrets requires PyNaCl. Install it with 'pip install ghmate[secrets]'.") from None
+    with _boxes_lock:
+        box = _boxes.get(public_key)
+        if box is None:
+            box = nacl_public.SealedBox(nacl_public.PublicKey(base64.b64decode(public_key)))
+            _boxes[public_key] = box
+        return box
+
+
+class PublicKeyCache:
+    """
+    Process-wide cache of repository Actions public keys, so writing many secrets costs one key request per repository.
+
+    Keys are cached per API host and repository for `ttl` seconds. When GitHub rejects a write
+    because the key was rotated, the entry is invalidated and the key fetched again.
+
+    Args:
+    - ttl (float): Seconds a fetched key is reused before it is fetched again.
+    """
+
+    _shared: Optional["PublicKeyCache"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, ttl: float = 3600.0):
+        self.ttl = ttl
+        self._keys: Dict[str, Tuple[str, str, float]] = {}
+        self._lock = threading.Lock()
+        # Concurrent writes to a repository whose key is not cached yet wait for one fetch.
+        self._flight = SingleFlight()
+
+    @classmethod
+    def shared(cls) -> "PublicKeyCache":
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @staticmethod
+    def _key(client: Any) -> str:
+        return f"{client.api_url}/{client.owner}/{client.repo}"
+
+    def get(self, client: Any) -> Tuple[str, str]:
+        """
+        Return the (key_id, key) of the client's repository, fetching it if needed.
+        """
+        cache_key = self._key(client)
+        with self._lock:
+            entry = self._keys.get(cache_key)
+        if entry is not None and time.monotonic() - entry[2] < self.ttl:
+            return entry[0], entry[1]
+        return self._flight.do(cache_key, lambda: self._fetch(client, cache_key))[0]
+
+    def _fetch(self, client: Any, cache_key: str) -> Tuple[str, str]:
+        response = client._make_request(method="GET", endpoint="actions/secrets/public-key")
+        if response.status_code != 200:
+            raise Exception(f"Failed to get the public key of {client.owner}/{client.repo}. "
+                            f"HTTP Status Code: {response.status_code}")
+        data = response.json()
+        with self._lock:
+            self._keys[cache_key] = (data["key_id"], data["key"], time.monotonic())
+        return data["key_id"], data["key"]
+
+    def invalidate(self, client: Any, key_id: Optional[str] = None):
+        """
+        Drop the cached key of the client's repository, only if it still has the given key_id when one is passed.
+        """
+        cache_key = self._key(client)
+        with self._lock:
+            entry = self._keys.get(cache_key)
+            if entry is not None and (key_id is None or entry[0] == key_id):
+                del self._keys[cache_key]
+
+
+def put_secret(client: Any, name: str, value: str, key_cache: Optional[PublicKeyCache] = None) -> Any:
+    """
+    Encrypt a secret with the repository public key and write it, refetching the key once if it was rotated.
+    """
+    key_cache = key_cache or PublicKeyCache.shared()
+    for attempt in range(2):
+        key_id, key = key_cache.get(client)
+        response = client._make_request(
+            method="PUT",
+            endpoint=f"actions/secrets/{name}",
+            payload={"encrypted_value": encrypt_secret(key, value), "key_id": key_id},
+        )
+        if response.status_code in _STALE_KEY_STATUSES and attempt == 0:
+            logging.warning(f"Writing secret {name} to {client.owner}/{client.repo} failed with "
+                            f"HTTP {response.status_code}; refreshing the repository public key")
+            key_cache.invalidate(client, key_id)
+            continue
+        return response
+    return response
+
+
+class SecretSyncState:
+    """
+    Local record of the secrets written by sync_secrets, used to tell which ones are unchanged.
+
+    GitHub never returns secret values, only their updated_at time. For every secret written, the
+    state keeps a keyed digest of the value and the updated_at GitHub reported afterwards. A secret
+    is unchanged when its desired value has the same digest and GitHub still reports the same
+    updated_at, meaning nobody else has written it since. Digests are HMACs under a random key
+    kept in the same file, but the file should still be protected like the secrets themselves.
+
+    Args:
+    - path (str, optional): JSON file the state is loaded from and saved to. Kept in memory only if not provided.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, str]] = {}
+        self._salt = os.urandom(32)
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as state_file:
+                data = json.load(state_file)
+            self._salt = base64.b64decode(data["salt"])
+            self._entries = data.get("secrets", {})
+
+    def digest(self, value: str) -> str:
+        return hmac.new(self._salt, value.encode("utf-8"), hashlib.sha256).hexdigest()
+
+    @staticmethod
+    def key(client: Any, name: str) -> str:
+        return f"{client.owner}/{client.repo}/{name}"
+
+    def is_unchanged(self, client: Any, name: str, value: str, updated_at: Optional[str]) -> bool:
+        with self._lock:
+            entry = self._entries.get(self.key(client, name))
+        return (entry is not None and updated_at is not None and entry["updated_at"] == updated_at
+                and hmac.compare_digest(entry["digest"], self.digest(value)))
+
+    def record(self, client: Any, name: str, value: str, updated_at: str):
+        with self._lock:
+            self._entries[self.key(client, name)] = {"digest": self.digest(value), "updated_at": updated_at}
+
+    def forget(self, client: Any, name: str):
+        with self._lock:
+            self._entries.pop(self.key(client, name), None)
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            data = {"salt": base64.b64encode(self._salt).decode("ascii"), "secrets": self._entries}
+        temporary = self.path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as state_file:
+            json.dump(data, state_file, indent=1, sort_keys=True)
+        os.chmod(temporary, 0o600)
+        os.replace(temporary, self.path)
+
+
+class SecretSyncReport:
+    """
+    Outcome of synchronizing the secrets of one repository.
+    """
+
+    def __init__(self, repo: str):
+        self.repo = repo
+        self.results: Dict[str, str] = {}
+        self.errors: Dict[str, str] = {}
+        self.started_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+
+    def names(self, status: str) -> List[str]:
+        return sorted(name for name, result in self.results.items() if result == status)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def to_dict(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for result in self.results.values():
+            counts[result] = counts.get(result, 0) + 1
+        elapsed = (self.finished_at or time.monotonic()) - self.started_at
+        return {"repo": self.repo, **counts, "errors": dict(self.errors), "elapsed": round(elapsed, 3)}
+
+    def __repr__(self) -> str:
+        return f"SecretSyncReport({self.to_dict()})"
+
+
+def list_secrets(client: Any) -> Dict[str, Dict[str, Any]]:
+    """
+    Return the metadata (name, created_at, updated_at) of every Actions secret of the repository, by name.
+    """
+    return {secret["name"]: secret for secret in client.paginate("actions/secrets", item_key="secrets")}
+
+
+def sync_secrets(client: Any, desired: Mapping[str, str], state: Optional[SecretSyncState] = None,
+                 workers: int = 8, delete_missing: bool = False, dry_run: bool = False,
+                 key_cache: Optional[PublicKeyCache] = None) -> SecretSyncReport:
+    """
+    Make the Actions secrets of a repository match a desired name-to-value mapping.
+
+    Current secrets are listed once and compared with the state; secrets whose value and
+    updated_at are unchanged are skipped and the rest are encrypted and written concurrently.
+    Without a state every desired secret is written.
+    Args:
+    - client (GitHubClient): Client of the repository.
+    - desired (mapping of str to str): Secret names and their plaintext values.
+    - state (SecretSyncState, optional): Record of earlier writes, updated and saved after the sync.
+    - workers (int): Number of secrets written at once.
+    - delete_missing (bool): Delete secrets that exist in the repository but not in `desired`.
+    - dry_run (bool): Report what would change without writing anything.
+    - key_cache (PublicKeyCache, optional): Cache of repository public keys. The shared cache is used if not provided.
+    Returns:
+    - SecretSyncReport: The action taken for every secret and the errors.
+    """
+    report = SecretSyncReport(f"{client.owner}/{client.repo}")
+    state = state or SecretSyncState()
+    current = list_secrets(client)
+
+    writes: List[Tuple[str, str]] = []
+    for name, value in desired.items():
+        metadata = current.get(name)
+        if metadata is not None and state.is_unchanged(client, name, value, metadata.get("updated_at")):
+            report.results[name] = UNCHANGED
+        elif dry_run:
+            report.results[name] = DRY_RUN
+        else:
+            writes.append((name, value))
+    deletes = [name for name in current if name not in desired] if delete_missing else []
+    if dry_run:
+        report.results.update((name, DRY_RUN) for name in deletes)
+        report.finished_at = time.monotonic()
+        return report
+
+    def write(name: str, value: str) -> Tuple[str, Any]:
+        response = put_secret(client, name, value, key_cache=key_cache)
+        if response.status_code not in (201, 204):
+            raise Exception(f"HTTP Status Code: {response.status_code}")
+        return name, CREATED if response.status_code == 201 else UPDATED
+
+    def delete(name: str) -> Tuple[str, Any]:
+        response = client._make_request(method="DELETE", endpoint=f"actions/secrets/{name}")
+        if response.status_code not in (204, 404):
+            raise Exception(f"HTTP Status Code: {response.status_code}")
+        return name, DELETED
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="ghmate-secret") as executor:
+        futures = {executor.submit(write, name, value): name for name, value in writes}
+        futures.update({executor.submit(delete, name): name for name in deletes})
+        for future, name in futures.items():
+            try:
+                _, result = future.result()
+                report.results[name] = result
+            except Exception as error:
+                report.results[name] = FAILED
+                report.errors[name] = str(error)
+
+    # Record the updated_at GitHub assigned to what was written, so the next sync can skip it.
+    written = {name: value for name, value in writes if report.results[name] in (CREATED, UPDATED)}
+    if written:
+        current = list_secrets(client)
+        for name, value in written.items():
+            if name in current:
+                state.record(client, name, value, current[name]["updated_at"])
+    for name in deletes:
+        if report.results[name] == DELETED:
+            state.forget(client, name)
+    state.save()
+
+    report.finished_at = time.monotonic()
+    logging.info(f"Secret sync for {report.repo} finished: {report.to_dict()}")
+    return report
@@ -0,0 +1,300 @@
+import math
+from array import array
+from datetime import datetime
+from typing import Optional, Any, Dict, Iterable, List, Sequence, Tuple, Union
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - optional dependency
+    numpy = None
+
+# Conclusions counted as a failure, and the conclusions a failure rate is taken over.
+FAILURE_CONCLUSIONS = frozenset(("failure", "timed_out", "startup_failure"))
+DECISIVE_CONCLUSIONS = FAILURE_CONCLUSIONS | {"success"}
+
+# Columns a table can be grouped by, and the run field each one holds.
+GROUP_KEYS = {"workflow": "name", "branch": "head_branch", "event": "event", "conclusion": "conclusion"}
+METRICS = ("queue", "duration")
+
+_NAN = float("nan")
+
+
+def _epoch(value: Optional[str]) -> float:
+    if not value:
+        return _NAN
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def _percentile(ordered: Sequence[float], q: float) -> float:
+    # Linear interpolation between the closest ranks, as numpy.percentile does by default.
+    if not ordered:
+        return _NAN
+    position = (len(ordered) - 1) * q / 100
+    low = math.floor(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+class _Categories:
+    """
+    Dictionary encoding of a string column: every distinct value is stored once and rows hold its code.
+    """
+
+    __slots__ = ("codes", "values")
+
+    def __init__(self):
+        self.codes: Dict[Optional[str], int] = {}
+        self.values: List[Optional[str]] = []
+
+    def encode(self, value: Optional[str]) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class RunTable:
+    """
+    Column-oriented table of workflow runs for analytics over large run histories.
+
+    Each field is kept in a typed array instead of one dict per run: timestamps and derived
+    durations as doubles, IDs as integers, and repeated strings (workflow names, branches,
+    events, conclusions) dictionary-encoded as integer codes, which takes a few dozen bytes per
+    run. Rows can be added while pages of runs are still streaming in; a run that is added again,
+    e.g. once it has completed, replaces its earlier row.
+
+    Aggregations run on NumPy views of the arrays when NumPy is installed ('pip install
+    ghmate[analytics]') and fall back to plain Python otherwise, with the same results.
+
+    Metrics are in seconds: "queue" from creation until the run started, and "duration" from the
+    start until the last update of a completed run. Failure rates are taken over runs that
+    succeeded or failed; cancelled and skipped runs do not count. A run is flaky when it
+    succeeded on a later attempt.
+
+    Args:
+    - runs (iterable, optional): Workflow runs, as WorkflowRun records or dicts, to load right away.
+    - use_numpy (bool, optional): Force the NumPy or the plain Python implementation. By default
+    NumPy is used when it is installed.
+
+    Usage:
+    table = RunTable(actions.iter_workflow_runs(keep_extra=False))
+    for row in table.summary(by=("workflow", "branch")):
+        print(row["workflow"], row["branch"], row["failure_rate"], row["duration_p95"])
+    """
+
+    def __init__(self, runs: Optional[Iterable[Any]] = None, use_numpy: Optional[bool] = None):
+        if use_numpy and numpy is None:
+            raise ImportError("NumPy is required for use_numpy=True. Install it with 'pip install ghmate[analytics]'.")
+        self.use_numpy = numpy is not None if use_numpy is None else use_numpy
+        self.ids = array("q")
+        self.attempts = array("q")
+        self.created = array("d")
+        self.queue = array("d")
+        self.duration = array("d")
+        self.failed = array("b")
+        self.decisive = array("b")
+        self.flaky = array("b")
+        self.categories = {name: _Categories() for name in GROUP_KEYS}
+        self.codes = {name: array("q") for name in GROUP_KEYS}
+        self._rows: Dict[int, int] = {}
+        self._columns = (self.attempts, self.created, self.queue, self.duration, self.failed, self.decisive,
+                         self.flaky, *self.codes.values())
+        if runs is not None:
+            self.extend(runs)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def extend(self, runs: Iterable[Any]) -> int:
+        """
+        Add runs to the table. Returns the number of new rows; runs already in it are updated.
+        """
+        added = 0
+        for run in runs:
+            added += self.add(run)
+        return added
+
+    def add(self, run: Any) -> bool:
+        """
+        Add one run, as a WorkflowRun record or a dict. Returns False if it replaced an earlier row.
+        """
+        get = run.get
+        created = _epoch(get("created_at"))
+        started = _epoch(get("run_started_at")) if get("run_started_at") else created
+        conclusion = get("conclusion")
+        attempt = get("run_attempt") or 1
+        values = (
+            attempt,
+            created,
+            started - created,
+            _epoch(get("updated_at")) - started if get("status") == "completed" else _NAN,
+            conclusion in FAILURE_CONCLUSIONS,
+            conclusion in DECISIVE_CONCLUSIONS,
+            conclusion == "success" and attempt > 1,
+            *(self.categories[name].encode(get(field)) for name, field in GROUP_KEYS.items()),
+        )
+
+        row = self._rows.get(run["id"])
+        if row is None:
+            self._rows[run["id"]] = len(self.ids)
+            self.ids.append(run["id"])
+            for column, value in zip(self._columns, values):
+                column.append(value)
+            return True
+        for column, value in zip(self._columns, values):
+            column[row] = value
+        return False
+
+    def column(self, name: str) -> Any:
+        """
+        A copy of a column by name (e.g. "duration", "created" or "workflow" codes), as a NumPy
+        array when NumPy is used and a list otherwise.
+        """
+        values = self.codes[name] if name in self.codes else getattr(self, name)
+        return numpy.array(values) if self.use_numpy else list(values)
+
+    def _groups(self, by: Sequence[str]) -> List[Tuple[Tuple[Optional[str], ...], Any]]:
+        """
+        Row indices of every group, each ordered by creation time, as (label, indices) pairs.
+        """
+        for name in by:
+            if name not in GROUP_KEYS:
+                raise ValueError(f"Unsupported group key: {name}")
+        if not len(self):
+            return []
+
+        if self.use_numpy:
+            # Fold the codes of all keys into one integer per row, then sort by group and time.
+            key = numpy.zeros(len(self), dtype=numpy.int64)
+            for name in by:
+                key = key * len(self.categories[name].values) + numpy.frombuffer(self.codes[name], dtype=numpy.int64)
+            order = numpy.lexsort((numpy.frombuffer(self.created, dtype=numpy.float64), key))
+            bounds = numpy.flatnonzero(numpy.diff(key[order])) + 1
+            groups = numpy.split(order, bounds)
+        else:
+            by_key: Dict[Tuple[int, ...], List[int]] = {}
+            columns = [self.codes[name] for name in by]
+            for row in range(len(self)):
+                by_key.setdefault(tuple(column[row] for column in columns), []).append(row)
+            created = self.created
+            groups = [sorted(rows, key=created.__getitem__) for _, rows in sorted(by_key.items())]
+
+        return [(tuple(self.categories[name].values[self.codes[name][int(rows[0])]] for name in by), rows)
+                for rows in groups]
+
+    def _metric(self, name: str) -> Any:
+        if name not in METRICS:
+            raise ValueError(f"Unsupported metric: {name}")
+        values = getattr(self, name)
+        return numpy.frombuffer(values, dtype=numpy.float64) if self.use_numpy else values
+
+    def _stats(self, values: Any, rows: Any, percentiles: Sequence[float]) -> List[float]:
+        # Percentiles of a metric over the rows of a group, ignoring runs it does not apply to.
+        if self.use_numpy:
+            selected = values[rows]
+            selected = selected[~numpy.isnan(selected)]
+            if not selected.size:
+                return [_NAN] * len(percentiles)
+            return [float(value) for value in numpy.percentile(selected, percentiles)]
+        selected = sorted(value for value in (values[row] for row in rows) if value == value)
+        return [_percentile(selected, q) for q in percentiles]
+
+    def _counts(self, rows: Any) -> Tuple[int, int, int, int]:
+        if self.use_numpy:
+            failed, decisive, flaky = (numpy.frombuffer(column, dtype=numpy.int8)[rows]
+                                       for column in (self.failed, self.decisive, self.flaky))
+            return len(rows), int(failed.sum()), int(decisive.sum()), int(flaky.sum())
+        return (len(rows), sum(self.failed[row] for row in rows), sum(self.decisive[row] for row in rows),
+                sum(self.flaky[row] for row in rows))
+
+    def summary(self, by: Sequence[str] = ("workflow",),
+                percentiles: Sequence[float] = (50, 90, 95)) -> List[Dict[str, Any]]:
+        """
+        One row per group: run, failure and flaky counts and rates, and queue and duration percentiles.
+        Args:
+        - by (sequence of str): Group keys among "workflow", "branch", "event" and "conclusion".
+        - percentiles (sequence of float): Percentiles reported as e.g. "duration_p95".
+        Returns:
+        - List[dict]: The groups, in the order of their keys.
+        """
+        queue, duration = self._metric("queue"), self._metric("duration")
+        rows = []
+        for label, indices in self._groups(by):
+            runs, failed, decisive, flaky = self._counts(indices)
+            row: Dict[str, Any] = dict(zip(by, label))
+            row.update({
+                "runs": runs,
+                "failures": failed,
+                "failure_rate": failed / decisive if decisive else None,
+                "flaky": flaky,
+                "flaky_rate": flaky / decisive if decisive else None,
+            })
+            for metric, values in (("queue", queue), ("duration", duration)):
+                for q, value in zip(percentiles, self._stats(values, indices, percentiles)):
+                    row[f"{metric}_p{q:g}"] = None if value != value else value
+            rows.append(row)
+        return rows
+
+    def percentiles(self, metric: str = "duration", by: Sequence[str] = ("workflow",),
+                    percentiles: Sequence[float] = (50, 90, 95)) -> Dict[Union[str, Tuple], List[float]]:
+        """
+        Percentiles of "queue" or "duration" per group, keyed by the group value, or by a tuple of
+        values when grouping by several keys.
+        """
+        values = self._metric(metric)
+        return {label[0] if len(by) == 1 else label: self._stats(values, indices, percentiles)
+                for label, indices in self._groups(by)}
+
+    def slowest(self, n: int = 10, metric: str = "duration", by: Sequence[str] = ("workflow",),
+                percentile: float = 95) -> List[Tuple[Union[str, Tuple], float]]:
+        """
+        The `n` groups with the highest percentile of a metric, slowest first, as (group, seconds) pairs.
+        """
+        ranked = [(group, stats[0]) for group, stats in self.percentiles(metric, by, (percentile,)).items()
+                  if stats[0] == stats[0]]
+        ranked.sort(key=lambda item: item[1], reverse=True)
+        return ranked[:n]
+
+    def rolling_failure_rate(self, window: int = 20,
+                             by: Sequence[str] = ("workflow",)) -> Dict[Union[str, Tuple], List[Tuple[float, float]]]:
+        """
+        Failure rate over the last `window` decisive runs of every group, after each of its runs.
+        Args:
+        - window (int): Number of succeeded or failed runs the rate is taken over.
+        - by (sequence of str): Group keys.
+        Returns:
+        - Dict: Per group, (created_at as a Unix timestamp, failure rate) pairs in creation order.
+        """
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        series = {}
+        for label, indices in self._groups(by):
+            group = label[0] if len(by) == 1 else label
+            if self.use_numpy:
+                decisive = numpy.frombuffer(self.decisive, dtype=numpy.int8)[indices].astype(bool)
+                rows = indices[decisive]
+                failed = numpy.frombuffer(self.failed, dtype=numpy.int8)[rows].astype(numpy.int64)
+                totals = numpy.concatenate(([0], numpy.cumsum(failed)))
+                ends = numpy.arange(1, len(rows) + 1)
+                starts = numpy.maximum(ends - window, 0)
+                rates = (totals[ends] - totals[starts]) / (ends - starts)
+                created = numpy.frombuffer(self.created, dtype=numpy.float64)[rows]
+                series[group] = list(zip(created.tolist(), rates.tolist()))
+            else:
+                rows = [row for row in indices if self.decisive[row]]
+                points = []
+                in_window = 0
+                for position, row in enumerate(rows):
+                    in_window += self.failed[row]
+                    if position >= window:
+                        in_window -= self.failed[rows[position - window]]
+                    points.append((self.created[row], in_window / min(position + 1, window)))
+                series[group] = points
+        return series
+
+    def nbytes(self) -> int:
+        """
+        Approximate memory held by the columns, without the distinct string values.
+        """
+        return sum(column.itemsize * len(column) for column in (self.ids, *self._columns))
@@ -0,0 +1,208 @@
+import hashlib
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Any, Dict, Iterable, Iterator
+
+DOWNLOADED = "downloaded"
+SKIPPED = "skipped"
+EXPIRED = "expired"
+FAILED = "failed"
+
+_UNSAFE_NAME = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+class ArtifactDownload:
+    """
+    Outcome of downloading a single artifact archive.
+    """
+
+    __slots__ = ("artifact_id", "name", "path", "size", "bytes_received", "resumed", "status",
+                 "sha256", "extracted_to", "error")
+
+    def __init__(self, artifact_id: int, name: str, path: str, size: int):
+        self.artifact_id = artifact_id
+        self.name = name
+        self.path = path
+        self.size = size
+        self.bytes_received = 0
+        self.resumed = False
+        self.status = FAILED
+        self.sha256: Optional[str] = None
+        self.extracted_to: Optional[str] = None
+        self.error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status in (DOWNLOADED, SKIPPED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"ArtifactDownload(artifact_id={self.artifact_id}, name={self.name!r}, status={self.status!r})"
+
+
+class ArtifactDownloader:
+    """
+    Streams artifact archives to disk in fixed-size chunks.
+
+    Each archive is written to a `.part` file that is renamed once complete, so memory use is
+    bounded by the chunk size per worker. An interrupted download is resumed with a Range
+    request from the size of its partial file, both across attempts and across runs. Several
+    artifacts download in parallel and the largest start first, which keeps the workers busy
+    until the end instead of leaving one big archive running alone. Archives can be checked
+    against the artifact's sha256 digest and extracted as soon as each one completes; extraction
+    waits for the whole archive, since a zip lists its files at its end and the digest covers
+    the whole archive.
+
+    Args:
+    - client (GitHubClient): Client of the repository the artifacts belong to.
+    - directory (str): Directory the archives are written to.
+    - workers (int): Number of artifacts downloaded at once.
+    - chunk_size (int): Bytes read from the network and written to disk at a time.
+    - verify (bool): Check the archive against the artifact's digest when GitHub provides one.
+    - extract (bool): Extract every archive into a directory next to it once it is downloaded and verified.
+    - max_attempts (int): Attempts per artifact before giving up; each one resumes the last.
+
+    Usage:
+    downloader = ArtifactDownloader(actions, "artifacts", workers=8, extract=True)
+    for result in downloader.download_all(actions.iter_artifacts()):
+        print(result.name, result.status)
+    """
+
+    def __init__(self, client: Any, directory: str, workers: int = 4, chunk_size: int = 256 * 1024,
+                 verify: bool = True, extract: bool = False, max_attempts: int = 3):
+        self.client = client
+        self.directory = directory
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.verify = verify
+        self.extract = extract
+        self.max_attempts = max_attempts
+
+    def path_for(self, artifact: Dict[str, Any]) -> str:
+        name = _UNSAFE_NAME.sub("_", artifact["name"]).strip("._") or "artifact"
+        return os.path.join(self.directory, f"{name}-{artifact['id']}.zip")
+
+    def download_all(self, artifacts: Iterable[Dict[str, Any]]) -> Iterator[ArtifactDownload]:
+        """
+        Download many artifacts in parallel, largest first, and yield the results as they finish.
+        """
+        ordered = sorted(artifacts, key=lambda artifact: artifact.get("size_in_bytes", 0), reverse=True)
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ghmate-artifact") as executor:
+            futures = [executor.submit(self.download, artifact) for artifact in ordered]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def download(self, artifact: Dict[str, Any]) -> ArtifactDownload:
+        """
+        Download one artifact, resuming a partial download if one exists.
+        """
+        path = self.path_for(artifact)
+        result = ArtifactDownload(artifact["id"], artifact["name"], path, artifact.get("size_in_bytes", 0))
+        if artifact.get("expired"):
+            result.status = EXPIRED
+            return result
+
+        os.makedirs(self.directory, exist_ok=True)
+        expected = _expected_sha256(artifact) if self.verify else None
+        if os.path.exists(path):
+            result.status = SKIPPED
+            result.sha256 = _file_sha256(path) if expected else None
+            if expected is None or result.sha256 == expected:
+                self._maybe_extract(result)
+                return result
+
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                self._fetch(artifact, result, path + ".part", expected)
+                break
+            except Exception as error:
+                result.error = str(error)
+                logging.warning(f"Download of artifact {artifact['id']} failed (attempt {attempt}): {error}")
+        else:
+            result.status = FAILED
+            return result
+
+        result.error = None
+        result.status = DOWNLOADED
+        self._maybe_extract(result)
+        return result
+
+    def _fetch(self, artifact: Dict[str, Any], result: ArtifactDownload, part_path: str, expected: Optional[str]):
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        digest = hashlib.sha256()
+        if offset and expected:
+            digest = _file_digest(part_path)
+
+        # Byte ranges refer to the stored archive, so ask for it without transfer compression.
+        headers = {"Accept-Encoding": "identity"}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+        response = self.client._make_request(
+            method="GET", endpoint=artifact["archive_download_url"], headers=headers, stream=True
+        )
+        try:
+            if response.status_code == 416 and offset:
+                # The partial file already holds the whole archive.
+                pass
+            elif response.status_code == 206 and offset:
+                result.resumed = True
+                self._write(response, part_path, "ab", digest, result)
+            elif response.status_code == 200:
+                digest = hashlib.sha256()
+                self._write(response, part_path, "wb", digest, result)
+            else:
+                raise Exception(f"HTTP Status Code: {response.status_code}")
+        finally:
+            response.close()
+
+        if expected:
+            result.sha256 = digest.hexdigest() if response.status_code != 416 else _file_sha256(part_path)
+            if result.sha256 != expected:
+                os.remove(part_path)
+                raise Exception(f"Checksum mismatch: expected {expected}, got {result.sha256}")
+        os.replace(part_path, result.path)
+
+    def _write(self, response: Any, part_path: str, mode: str, digest: Any, result: ArtifactDownload):
+        with open(part_path, mode) as part_file:
+            for chunk in response.iter_content(chunk_size=self.chunk_size):
+                part_file.write(chunk)
+                digest.update(chunk)
+                result.bytes_received += len(chunk)
+
+    def _maybe_extract(self, result: ArtifactDownload):
+        if not self.extract:
+            return
+        import zipfile
+
+        target = result.path[:-len(".zip")]
+        try:
+            with zipfile.ZipFile(result.path) as archive:
+                archive.extractall(target)
+        except (zipfile.BadZipFile, OSError) as error:
+            result.status = FAILED
+            result.error = f"Extraction failed: {error}"
+            return
+        result.extracted_to = target
+
+
+def _expected_sha256(artifact: Dict[str, Any]) -> Optional[str]:
+    digest = artifact.get("digest") or ""
+    if digest.startswith("sha256:"):
+        return digest[len("sha256:"):]
+    return None
+
+
+def _file_digest(path: str) -> Any:
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        for block in iter(lambda: source.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest
+
+
+def _file_sha256(path: str) -> str:
+    return _file_digest(path).hexdigest()
@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import time
+from typing import Optional, Any, AsyncIterator, Callable, Set
+
+from ghmate.async_client import AsyncGitHubClient
+from ghmate.records import ActionsCacheEntry, Artifact, WorkflowRun
+from ghmate.bulk_delete import (
+    RunFilter,
+    RunDeletion,
+    BulkDeleteReport,
+    DELETED,
+    NOT_FOUND,
+    FAILED,
+    DRY_RUN,
+)
+
+
+class AsyncActionsCommands(AsyncGitHubClient):
+    """
+    Asynchronous counterpart of ActionsCommands.
+
+    Inherits from AsyncGitHubClient for shared attributes and methods.
+    """
+
+    LIST_ACTION = "list"
+    RESTORE_ACTION = "restore"
+    DELETE_ACTION = "delete"
+
+    def __init__(self, owner: str, repo: str, token: Optional[str] = None, **kwargs: Any):
+        super().__init__(owner=owner, repo=repo, token=token, **kwargs)
+
+    async def cache(self, action: str, *args: Optional[Any]) -> Any:
+        if action == AsyncActionsCommands.LIST_ACTION:
+            endpoint = "actions/caches"
+            return await self._make_request(method="GET", endpoint=endpoint)
+
+        elif action == AsyncActionsCommands.RESTORE_ACTION:
+            key = args[0]
+            endpoint = f"actions/cache/{key}/restore"
+            return await self._make_request(method="POST", endpoint=endpoint)
+
+        elif action == AsyncActionsCommands.DELETE_ACTION:
+            return await self.delete_cache(*args)
+
+        else:
+            raise ValueError(f"Unsupported action: {action}")
+
+    def iter_caches(self, **filters: Any) -> AsyncIterator[ActionsCacheEntry]:
+        """
+        Asynchronously iterate over every Actions cache entry of the repository.
+        Args:
+        - filters: Query parameters accepted by the list endpoint, e.g. ref, key, sort or direction.
+        """
+        return self.paginate("actions/caches", item_key="actions_caches", params=filters, record=ActionsCacheEntry)
+
+    async def delete_cache(self, cache: Any, ref: Optional[str] = None) -> Any:
+        """
+        Delete an Actions cache entry by ID, or every entry with a key (optionally limited to a ref).
+        """
+        if isinstance(cache, int):
+            return await self._make_request(method="DELETE", endpoint=f"actions/caches/{cache}")
+        params = {"key": cache}
+        if ref is not None:
+            params["ref"] = ref
+        return await self._make_request(method="DELETE", endpoint="actions/caches", params=params)
+
+    async def run(self, action: str) -> Any:
+        if action == AsyncActionsCommands.LIST_ACTION:
+            endpoint = "actions/runs"
+            return await self._make_request(method="GET", endpoint=endpoint)
+        else:
+            raise ValueError(f"Unsupported action: {action}")
+
+    def iter_artifacts(self) -> AsyncIterator[Artifact]:
+        """
+        Asynchronously iterate over every artifact of the repository.
+        """
+        return self.paginate("actions/artifacts", item_key="artifacts", record=Artifact)
+
+    async def get_artifacts(self) -> list:
+        return [artifact async for artifact in self.iter_artifacts()]
+
+    def iter_workflow_runs(self, **filters: Any) -> AsyncIterator[WorkflowRun]:
+        """
+        Asynchronously iterate over every workflow run of the repository, newest first.
+        Args:
+        - filters: Query parameters accepted by the list endpoint, e.g. branch, status or created.
+        """
+        return self.paginate("actions/runs", item_key="workflow_runs", params=filters, record=WorkflowRun)
+
+    async def get_all_workflow_runs(self) -> list:
+        return [run async for run in self.iter_workflow_runs()]
+
+    async def delete_workflow_run(self, run_id: int) -> RunDeletion:
+        try:
+            response = await self._make_request(method="DELETE", endpoint=f"actions/runs/{run_id}")
+        except Exception as error:
+            return RunDeletion(run_id, None, FAILED, error=str(error))
+
+        if response.status_code == 204:
+            return RunDeletion(run_id, None, DELETED, status_code=204)
+        if response.status_code == 404:
+            return RunDeletion(run_id, None, NOT_FOUND, status_code=404)
+        return RunDeletion(run_id, None, FAILED, status_code=response.status_code)
+
+    async def bulk_delete_workflow_runs(self, run_filter: Optional[RunFilter] = None, concurrency: int = 32,
+                                        dry_run: bool = False,
+                                        progress: Optional[Callable[[BulkDeleteReport], None]] = None,
+                                        progress_every: int = 100) -> BulkDeleteReport:
+        """
+        Delete the workflow runs selected by a filter while they are being listed,
+        with at most `concurrency` deletes in flight. Mirrors ActionsCommands.bulk_delete_workflow_runs.
+        """
+        run_filter = run_filter or RunFilter()
+        report = BulkDeleteReport()
+        slots = asyncio.Semaphore(concurrency)
+        attempted: Set[int] = set()
+
+        def record(result: RunDeletion):
+            report.counts[result.status] += 1
+            report.results.append(result)
+            if progress is not None and report.completed % progress_every == 0:
+                progress(report)
+
+        async def delete(run: WorkflowRun):
+            try:
+                result = await self.delete_workflow_run(run["id"])
+                result.workflow_id = run.get("workflow_id")
+                record(result)
+            finally:
+                slots.release()
+
+        while True:
+            report.passes += 1
+            deleted_before = report.counts[DELETED]
+            tasks = []
+            seen: Set[int] = set()
+            async for run in self.iter_workflow_runs(**run_filter.query_params()):
+                report.scanned += 1
+                # Runs created during the pass shift the pages; count a run listed twice only once.
+                if run["id"] in seen:
+                    continue
+                seen.add(run["id"])
+                if not run_filter.matches(run) or run["id"] in attempted:
+                    continue
+                attempted.add(run["id"])
+                report.matched += 1
+                if dry_run:
+                    record(RunDeletion(run["id"], run.get("workflow_id"), DRY_RUN))
+                    continue
+                await slots.acquire()
+                tasks.append(asyncio.ensure_future(delete(run)))
+            await asyncio.gather(*tasks)
+
+            # Deleting runs shifts later pages of the listing, so walk it again until nothing changes.
+            if dry_run or report.counts[DELETED] == deleted_before:
+                break
+            run_filter.reset()
+
+        report.finished_at = time.monotonic()
+        logging.info(f"Workflow run cleanup for {self.repo} finished: {report.to_dict()}")
+        return report
+
+    async def delete_all_workflow_runs(self) -> BulkDeleteReport:
+        return await self.bulk_delete_workflow_runs()
@@ -0,0 +1,412 @@
+import asyncio
+import json
+import logging
+import math
+import os
+import time
+import weakref
+from collections import deque
+from typing import Optional, Dict, Any, AsyncIterator, Deque, Iterable, List, Tuple
+
+from ghmate.instrumentation import RequestEvent, RequestHooks, emit, endpoint_template
+from ghmate.pagination import parse_link_header, page_number
+from ghmate.records import loads
+from ghmate.rate_limit import RateLimiter, RateLimitBudget, resource_for_url
+from ghmate.retry import RetryPolicy, CircuitBreaker, CONNECTION_ERROR, TIMEOUT, SERVER_ERROR
+from ghmate.transport import DEFAULT_API_URL
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+
+class AsyncResponse:
+    """
+    A fully read response from the asynchronous transport.
+    Mirrors the parts of requests.Response used by the commands: status_code, headers, content and json().
+    """
+
+    __slots__ = ("status_code", "headers", "content", "url")
+
+    def __init__(self, status_code: int, headers: Any, content: bytes, url: str):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return loads(self.content)
+
+
+class AsyncTransport:
+    """
+    Pooled aiohttp session with a cap on the number of requests in flight.
+    One transport can be shared by any number of asynchronous clients.
+
+    Shared transports count the clients using them and close their session when the last one is
+    closed. A transport passed to a client explicitly belongs to the caller, who closes it.
+
+    Args:
+    - connection_limit (int): Maximum number of open connections in the pool.
+    - max_concurrency (int): Maximum number of requests in flight at once.
+    - connect_timeout (float): Seconds to wait for a connection to be established.
+    - read_timeout (float): Seconds to wait between bytes received from the server.
+    """
+
+    # Per event loop, so transports of finished loops are dropped along with the loop.
+    _shared: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, AsyncTransport]]" = \
+        weakref.WeakKeyDictionary()
+
+    def __init__(self, connection_limit: int = 100, max_concurrency: int = 100,
+                 connect_timeout: float = 10.0, read_timeout: float = 30.0):
+        if aiohttp is None:
+            raise ImportError("The asynchronous client requires aiohttp. Install it with 'pip install ghmate[async]'.")
+
+        self.connection_limit = connection_limit
+        self.max_concurrency = max_concurrency
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._users = 0
+
+    @classmethod
+    def shared(cls, api_url: str = DEFAULT_API_URL) -> "AsyncTransport":
+        """
+        Return the transport shared by clients of the same host on the running event loop.
+        Callers keeping it should acquire() it and release() it when done.
+        """
+        transports = cls._shared.setdefault(asyncio.get_running_loop(), {})
+        transport = transports.get(api_url)
+        if transport is None:
+            transport = transports[api_url] = cls()
+        return transport
+
+    def acquire(self):
+        self._users += 1
+
+    async def release(self):
+        """
+        Give up a reference taken with acquire(), closing the session once nobody uses it.
+        """
+        self._users = max(0, self._users - 1)
+        if self._users == 0:
+            await self.close()
+
+    async def _ensure_session(self) -> "aiohttp.ClientSession":
+        # Sessions and semaphores belong to the loop they were created on.
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            if self._session is not None and not self._session.closed:
+                await self._close_stale_session(self._session)
+            connector = aiohttp.TCPConnector(limit=self.connection_limit, ttl_dns_cache=300)
+            timeout = aiohttp.ClientTimeout(sock_connect=self.connect_timeout, sock_read=self.read_timeout)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=timeout,
+                headers={"Accept-Encoding": "gzip, deflate"},
+                cookie_jar=aiohttp.DummyCookieJar(),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._session
+
+    async def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                      json: Optional[Any] = None, params: Optional[Dict[str, Any]] = None) -> AsyncResponse:
+        session = await self._ensure_session()
+        async with self._semaphore:
+            async with session.request(method, url, headers=headers, json=json, params=params) as response:
+                content = await response.read()
+                return AsyncResponse(response.status, response.headers, content, str(response.url))
+
+    @staticmethod
+    async def _close_stale_session(session: "aiohttp.ClientSession"):
+        # The session was made on an earlier event loop; its connections cannot be reused here.
+        try:
+            await session.close()
+        except Exception as error:
+            logging.debug(f"Could not close the session of a previous event loop: {error}")
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        # Drop the loop's objects too, so the shared table does not keep a finished loop alive.
+        self._session = None
+        self._semaphore = None
+        self._loop = None
+
+
+class AsyncGitHubClient:
+    """
+    Asynchronous counterpart of GitHubClient built on asyncio and aiohttp.
+
+    Requests share a pooled session and a concurrency cap through an AsyncTransport, and
+    draw on the same RateLimiter as the synchronous clients without blocking the event loop.
+
+    Args:
+    - owner (str): The GitHub repository owner/organization.
+    - repo (str): The name of the GitHub repository.
+    - token (str, optional): The GitHub personal access token.
+    If not provided, the token should be set as an environment variable named 'GITHUB_TOKEN'.
+    - api_url (str, optional): Root URL of the GitHub API. Defaults to https://api.github.com.
+    - transport (AsyncTransport, optional): Transport to send requests through. It is not closed with the client.
+    If not provided, the transport shared by clients of the same host on the running loop is used, and
+    released when the client is closed.
+    - rate_limiter (RateLimiter, optional): Scheduler that keeps requests inside the rate limits.
+    - hooks (iterable of RequestHooks, optional): Instrumentation called before and after every request.
+    - retry_policy (RetryPolicy, optional): Which transient failures are retried and how. Defaults to RetryPolicy().
+    - circuit_breaker (CircuitBreaker, optional): Breaker that fails fast while the API is down.
+    If not provided, the breaker shared by all clients of the same host is used.
+
+    Usage:
+    async with AsyncGitHubClient(owner="owner", repo="repo", token="your_token") as client:
+        response = await client._make_request(method="GET", endpoint="actions/runs")
+    """
+
+    def __init__(
+        self,
+        owner: str,
+        repo: str,
+        token: Optional[str] = None,
+        api_url: str = DEFAULT_API_URL,
+        transport: Optional[AsyncTransport] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        hooks: Optional[Iterable[RequestHooks]] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+    ):
+        if aiohttp is None:
+            raise ImportError("The asynchronous client requires aiohttp. Install it with 'pip install ghmate[async]'.")
+        if not all([owner, repo]):
+            raise ValueError("GitHub owner and repository name are required.")
+
+        self.owner = owner
+        self.repo = repo
+        self.api_url = api_url.rstrip("/")
+        self.base_url = f"{self.api_url}/repos/{self.owner}"
+
+        self.token = token or os.environ.get('GITHUB_TOKEN')
+
+        if not self.token:
+            raise ValueError("GitHub token is required. Set it as a parameter or as an environment variable.")
+
+        self.headers = {
+            "Authorization": f"token {self.token}",
+            "Accept": "application/vnd.github.v3+json"
+        }
+
+        self._transport = transport
+        self._shares_transport = False
+        self.rate_limiter = rate_limiter or RateLimiter.shared()
+        self.hooks = list(hooks or [])
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker.shared(self.api_url)
+
+    @property
+    def transport(self) -> AsyncTransport:
+        if self._transport is None:
+            self._transport = AsyncTransport.shared(self.api_url)
+            self._transport.acquire()
+            self._shares_transport = True
+        return self._transport
+
+    async def __aenter__(self) -> "AsyncGitHubClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any):
+        await self.close()
+
+    async def close(self):
+        # Only the shared transport is released here; a transport passed in belongs to the caller.
+        if self._shares_transport:
+            self._shares_transport = False
+            transport, self._transport = self._transport, None
+            await transport.release()
+
+    def rate_limit_budget(self, resource: str = "core") -> RateLimitBudget:
+        return self.rate_limiter.budget(self.token, resource)
+
+    def _build_url(self, endpoint: str) -> str:
+        if endpoint.startswith(("http://", "https://")):
+            return endpoint
+        return f"{self.base_url}/{self.repo}/{endpoint}"
+
+    async def _make_request(self, method: str, endpoint: str, payload: Optional[Dict] = None,
+                            params: Optional[Dict] = None) -> AsyncResponse:
+        """
+        Send a request, waiting for rate-limit quota without blocking the loop and retrying
+        after rate-limit responses, and after transient failures as the retry policy allows.
+        """
+        url = self._build_url(endpoint)
+        if not self.hooks:
+            return await self._send(method, url, payload, params, None)
+
+        event = RequestEvent(method, url, endpoint_template(url, self.api_url), resource_for_url(url))
+        emit(self.hooks, "before_send", event)
+        started = time.perf_counter()
+        try:
+            response = await self._send(method, url, payload, params, event)
+        except Exception as error:
+            event.elapsed = time.perf_counter() - started
+            event.error = str(error)
+            emit(self.hooks, "on_error", event)
+            raise
+        event.elapsed = time.perf_counter() - started
+        event.record_response(response)
+        if payload is not None:
+            event.bytes_sent = len(json.dumps(payload).encode("utf-8"))
+        emit(self.hooks, "after_response", event)
+        return response
+
+    async def _send(self, method: str, url: str, payload: Optional[Dict], params: Optional[Dict],
+                    event: Optional[RequestEvent]) -> AsyncResponse:
+        resource = resource_for_url(url)
+        rate_limited = 0
+        attempt = 0
+        while True:
+            attempt += 1
+            self.circuit_breaker.before_request()
+            try:
+                wait = self.rate_limiter.try_acquire(self.token, resource)
+                while wait > 0:
+                    if event is not None:
+                        event.rate_limit_wait += wait
+                    await asyncio.sleep(wait)
+                    wait = self.rate_limiter.try_acquire(self.token, resource)
+                if event is not None:
+                    event.attempts += 1
+                response = await self.transport.request(method, url, headers=self.headers, json=payload, params=params)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+                self.circuit_breaker.record_failure()
+                kind, sent = _classify_error(error)
+                if self.retry_policy.should_retry(method, attempt, kind, sent=sent):
+                    delay = self.retry_policy.backoff(attempt)
+                    logging.warning(f"Request to {url} failed: {error!r}; retrying in {delay:.1f}s (attempt {attempt})")
+                    await asyncio.sleep(delay)
+                    continue
+                logging.error(f"Request to {url} failed: {error!r}")
+                raise Exception(f"Request failed: {str(error)}")
+            except BaseException:
+                # Cancelled or failed before reaching the host: give back a half-open probe slot,
+                # or the breaker shared by every client of the host would stay half-open for good.
+                self.circuit_breaker.release()
+                raise
+
+            self.rate_limiter.update(self.token, resource, response.headers)
+            if self.retry_policy.is_retryable_status(response.status_code):
+                self.circuit_breaker.record_failure()
+                if not self.retry_policy.should_retry(method, attempt, SERVER_ERROR):
+                    return response
+                delay = self.retry_policy.backoff(attempt, response.headers.get("Retry-After"))
+                logging.warning(f"{url} returned {response.status_code}; retrying in {delay:.1f}s (attempt {attempt})")
+                await asyncio.sleep(delay)
+                continue
+
+            delay = self.rate_limiter.retry_delay(self.token, resource, response)
+            if delay is None:
+                self.circuit_breaker.record_success()
+                self.rate_limiter.reset_backoff(self.token, resource)
+                return response
+            self.circuit_breaker.release()
+            if rate_limited >= self.rate_limiter.max_retries:
+                return response
+
+            rate_limited += 1
+            logging.warning(f"Rate limited on {url}; retrying in {delay:.0f}s (attempt {rate_limited})")
+            self.rate_limiter.pause(self.token, resource, delay)
+
+    def paginate(self, endpoint: str, item_key: Optional[str] = None, params: Optional[Dict] = None,
+                 per_page: int = 100, prefetch: int = 4, record: Optional[type] = None,
+                 keep_extra: bool = True) -> AsyncIterator[Any]:
+        """
+        Asynchronously iterate over every item of a list endpoint. See Paginator for the semantics.
+        """
+        return _paginate(self, endpoint, item_key, dict(params or {}), per_page, max(1, prefetch),
+                         record, keep_extra)
+
+
+def _classify_error(error: Exception) -> Tuple[str, bool]:
+    """
+    Async counterpart of retry.classify_error: the failure kind and whether the request may have been sent.
+    """
+    if isinstance(error, aiohttp.ClientConnectorError):
+        return CONNECTION_ERROR, False
+    if isinstance(error, (asyncio.TimeoutError, aiohttp.ServerTimeoutError)):
+        return TIMEOUT, True
+    return CONNECTION_ERROR, True
+
+
+def _decode(response: AsyncResponse, item_key: Optional[str], record: Optional[type] = None,
+            keep_extra: bool = True) -> Tuple[List[Any], Optional[int]]:
+    data = loads(response.content)
+    total_count = None
+    if item_key is not None:
+        data, total_count = data.get(item_key, []), data.get("total_count")
+    if record is not None:
+        data = [record.from_dict(item, keep_extra=keep_extra) for item in data]
+    return data, total_count
+
+
+async def _paginate(client: AsyncGitHubClient, endpoint: str, item_key: Optional[str], params: Dict[str, Any],
+                    per_page: int, prefetch: int, record: Optional[type] = None,
+                    keep_extra: bool = True) -> AsyncIterator[Any]:
+    async def fetch(target: str, page_params: Optional[Dict[str, Any]] = None) -> AsyncResponse:
+        response = await client._make_request(method="GET", endpoint=target, params=page_params)
+        if response.status_code != 200:
+            raise Exception(f"Failed to list {endpoint}. HTTP Status Code: {response.status_code}")
+        return response
+
+    async def fetch_items(page: int) -> List[Any]:
+        items, _ = _decode(await fetch(endpoint, dict(params, page=page)), item_key, record, keep_extra)
+        return items
+
+    params = dict(params, per_page=per_page)
+    response = await fetch(endpoint, params)
+    items, total_count = _decode(response, item_key, record, keep_extra)
+    for item in items:
+        yield item
+
+    links = parse_link_header(response.headers.get("Link"))
+    if "next" not in links or not items:
+        return
+
+    last_page = page_number(links["last"]) if "last" in links else None
+    if last_page is None and total_count is not None:
+        last_page = math.ceil(total_count / per_page)
+
+    if last_page is None or prefetch == 1:
+        url = links["next"]
+        while url:
+            response = await fetch(url)
+            items, _ = _decode(response, item_key, record, keep_extra)
+            for item in items:
+                yield item
+            url = parse_link_header(response.headers.get("Link")).get("next") if items else None
+        return
+
+    pending: Deque[asyncio.Task] = deque()
+    pages = iter(range(2, last_page + 1))
+    try:
+        for page in pages:
+            pending.append(asyncio.ensure_future(fetch_items(page)))
+            if len(pending) >= prefetch:
+                break
+
+        while pending:
+            items = await pending.popleft()
+            if not items:
+                return
+            page = next(pages, None)
+            if page is not None:
+                pending.append(asyncio.ensure_future(fetch_items(page)))
+            for item in items:
+                yield item
+    finally:
+        for task in pending:
+            task.cancel()
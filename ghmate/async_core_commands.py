@@ -0,0 +1,143 @@
+from typing import Optional, Any
+
+from ghmate.async_client import AsyncGitHubClient
+from ghmate.records import Issue, PullRequest, Release
+
+
+class AsyncCoreCommands(AsyncGitHubClient):
+    """
+    Asynchronous counterpart of CoreCommands.
+
+    Inherits from AsyncGitHubClient for shared attributes and methods.
+    """
+
+    def __init__(self, token: str, owner: str, repo: str, **kwargs: Any):
+        super().__init__(owner=owner, repo=repo, token=token, **kwargs)
+
+    async def auth(self):
+        url = f"{self.api_url}/user"
+        return await self._make_request(method="GET", endpoint=url)
+
+    async def browse(self):
+        url = "topics"
+        return await self._make_request(method="GET", endpoint=url)
+
+    async def codespace(self):
+        url = "codespaces"
+        return await self._make_request(method="GET", endpoint=url)
+
+    async def gist(self):
+        url = f"{self.api_url}/gists"
+        return await self._make_request(method="GET", endpoint=url)
+
+    async def issue(self, action: str, *args: Optional[Any]) -> Any:
+        if action == 'create':
+            title, body = args
+            url = "issues"
+            payload = {
+                "title": title,
+                "body": body,
+            }
+            return await self._make_request(
+                method="POST",
+                endpoint=url,
+                payload=payload
+            )
+
+        elif action == 'list':
+            url = "issues"
+            return await self._make_request(method="GET", endpoint=url)
+
+    async def org(self, action: str, *args: Optional[Any]) -> Any:
+        if action == 'create':
+            org_name = args[0]
+            url = f"{self.api_url}/orgs"
+            payload = {
+                "login": org_name,
+            }
+            return await self._make_request(
+                method="POST",
+                endpoint=url,
+                payload=payload
+            )
+
+        elif action == 'list':
+            url = f"{self.api_url}/organizations"
+            return await self._make_request(method="GET", endpoint=url)
+
+    async def pr(self, action: str, *args: Optional[Any]) -> Any:
+        if action == 'checkout':
+            pr_number = args[0]
+            url = f"pulls/{pr_number}"
+            return await self._make_request(method="GET", endpoint=url)
+
+        elif action == 'list':
+            url = "pulls"
+            return await self._make_request(method="GET", endpoint=url)
+
+    async def project(self, action: str, *args: Optional[Any]) -> Any:
+        if action == 'create':
+            project_name = args[0]
+            url = "projects"
+            payload = {
+                "name": project_name,
+            }
+            return await self._make_request(
+                method="POST",
+                endpoint=url,
+                payload=payload
+            )
+
+        elif action == 'list':
+            url = "projects"
+            return await self._make_request(method="GET", endpoint=url)
+
+    async def release(self, action: str, *args: Optional[Any]) -> Any:
+        if action == 'create':
+            tag_name, target_commitish = args
+            url = "releases"
+            payload = {
+                "tag_name": tag_name,
+                "target_commitish": target_commitish,
+            }
+            return await self._make_request(
+                method="POST",
+                endpoint=url,
+                payload=payload
+            )
+
+        elif action == 'list':
+            url = "releases"
+            return await self._make_request(method="GET", endpoint=url)
+
+    def iter_issues(self, **filters: Any):
+        """
+        Asynchronously iterate over every issue of the repository.
+        """
+        return self.paginate("issues", params=filters, record=Issue)
+
+    def iter_pulls(self, **filters: Any):
+        """
+        Asynchronously iterate over every pull request of the repository.
+        """
+        return self.paginate("pulls", params=filters, record=PullRequest)
+
+    def iter_releases(self):
+        """
+        Asynchronously iterate over every release of the repository.
+        """
+        return self.paginate("releases", record=Release)
+
+    def get_repo_clone_url(self, repo_name: str) -> str:
+        return f"https://github.com/{self.owner}/{repo_name}.git"
+
+    async def create_repo(self, repo_name: str):
+        url = f"{self.api_url}/user/repos"
+        payload = {
+            "name": repo_name,
+        }
+        return await self._make_request(method="POST", endpoint=url, payload=payload)
+
+    async def delete_secret(self, secret_name: str):
+        url = f"actions/secrets/{secret_name}"
+        await self._make_request(method="DELETE", endpoint=url)
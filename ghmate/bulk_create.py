@@ -0,0 +1,436 @@
+import csv
+import hashlib
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Optional, Any, Callable, Dict, Iterable, Iterator, List, Set, Tuple, Union
+
+from ghmate.rate_limit import ContentPacer, SECONDARY_LIMIT_BACKOFF, is_rate_limited
+
+ISSUES = "issues"
+RELEASES = "releases"
+
+PENDING = "pending"
+CREATED = "created"
+RECONCILED = "reconciled"
+SKIPPED = "skipped"
+FAILED = "failed"
+DRY_RUN = "dry_run"
+
+# Fields of a CSV row holding lists, separated by semicolons.
+LIST_FIELDS = ("labels", "assignees")
+BOOLEAN_FIELDS = ("draft", "prerelease", "generate_release_notes")
+
+# Hidden marker appended to issue bodies so an issue whose creation was interrupted can be found again.
+MARKER = "<!-- ghmate-import:{key} -->"
+
+# Attempts at creating one item while GitHub keeps reporting a secondary limit.
+MAX_LIMITED_ATTEMPTS = 5
+
+
+def _timestamp(seconds: float) -> str:
+    return datetime.fromtimestamp(seconds, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _parse_cell(field: str, value: str) -> Any:
+    if field in LIST_FIELDS:
+        return [item.strip() for item in value.split(";") if item.strip()]
+    if field in BOOLEAN_FIELDS:
+        return value.strip().lower() in ("1", "true", "yes")
+    if field == "milestone" and value.strip().isdigit():
+        return int(value)
+    return value
+
+
+def read_specs(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Read issue or release specs from a JSON Lines file, or from a CSV file with a header row.
+
+    CSV cells are strings, except labels and assignees, which are lists separated by semicolons,
+    draft, prerelease and generate_release_notes, which are booleans, and numeric milestones.
+    Empty CSV cells are left out of the spec.
+    """
+    with open(path, "r", encoding="utf-8", newline="") as spec_file:
+        if path.lower().endswith(".csv"):
+            for row in csv.DictReader(spec_file):
+                yield {field: _parse_cell(field, value) for field, value in row.items() if field and value != ""}
+        else:
+            for number, line in enumerate(spec_file, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError as error:
+                    raise ValueError(f"Invalid spec on line {number} of {path}: {error}")
+
+
+def spec_key(kind: str, spec: Dict[str, Any]) -> str:
+    """
+    Key identifying a spec across runs: its "key" field if it has one, the tag of a release, and
+    otherwise a digest of the issue's fields.
+    """
+    if spec.get("key"):
+        return str(spec["key"])
+    if kind == RELEASES:
+        return spec["tag_name"]
+    canonical = json.dumps(spec, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:24]
+
+
+class ImportJournal:
+    """
+    Append-only JSON Lines log of a bulk import.
+
+    A "pending" entry is written and synced to disk before every create request, and a "created"
+    or "failed" entry once its response arrived. Reading the journal back tells which specs were
+    created, and which were sent without a recorded outcome and have to be looked up on GitHub
+    before they are sent again.
+
+    Args:
+    - path (str): Path of the journal file. It is created if it does not exist.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._file = None
+        if os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        with open(self.path, "r", encoding="utf-8") as journal_file:
+            for line in journal_file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A line cut short by a crash; the entry before it still holds.
+                    continue
+                self.entries[entry["key"]] = entry
+
+    def state(self, key: str) -> Optional[str]:
+        entry = self.entries.get(key)
+        return entry["state"] if entry else None
+
+    def pending(self) -> List[Dict[str, Any]]:
+        return [entry for entry in self.entries.values() if entry["state"] == PENDING]
+
+    def sent_at(self) -> List[float]:
+        """
+        Times of the create requests recorded in the journal, to seed a ContentPacer with.
+        """
+        return [entry["sent_at"] for entry in self.entries.values() if entry.get("sent_at")]
+
+    def record(self, key: str, state: str, sync: bool = False, **fields: Any):
+        entry = dict(fields, key=key, state=state)
+        previous = self.entries.get(key)
+        if previous is not None and "sent_at" in previous:
+            entry.setdefault("sent_at", previous["sent_at"])
+        self.entries[key] = entry
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class CreateResult:
+    """
+    Outcome of creating a single issue or release.
+    """
+
+    __slots__ = ("key", "status", "number", "url", "status_code", "error")
+
+    def __init__(self, key: str, status: str, number: Optional[int] = None, url: Optional[str] = None,
+                 status_code: Optional[int] = None, error: Optional[str] = None):
+        self.key = key
+        self.status = status
+        self.number = number
+        self.url = url
+        self.status_code = status_code
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.status != FAILED
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"CreateResult(key={self.key!r}, status={self.status!r}, number={self.number})"
+
+
+class BulkCreateReport:
+    """
+    Progress and outcome of a bulk import.
+    """
+
+    def __init__(self):
+        self.read = 0
+        self.counts: Dict[str, int] = {CREATED: 0, RECONCILED: 0, SKIPPED: 0, FAILED: 0, DRY_RUN: 0}
+        self.results: List[CreateResult] = []
+        self.waited = 0.0
+        self.aborted = False
+        self.started_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """
+        Items created per minute.
+        """
+        elapsed = self.elapsed
+        return self.counts[CREATED] * 60 / elapsed if elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "read": self.read,
+            **self.counts,
+            "aborted": self.aborted,
+            "waited": round(self.waited, 3),
+            "elapsed": round(self.elapsed, 3),
+            "throughput_per_minute": round(self.throughput, 1),
+        }
+
+    def __repr__(self) -> str:
+        return f"BulkCreateReport({self.to_dict()})"
+
+
+class BulkCreator:
+    """
+    Paced, resumable creation of issues or releases from a stream of specs.
+
+    Specs are the request bodies of the create endpoints, e.g. {"title": ..., "body": ...,
+    "labels": [...]} for issues or {"tag_name": ..., "name": ...} for releases, with an optional
+    "key" identifying the spec across runs. Items are created one at a time, as GitHub asks of
+    requests that create content, and a ContentPacer holds each request back just long enough to
+    stay inside the content-creation limits, so throughput stays at the allowed maximum without
+    tripping secondary limits.
+
+    Every request is recorded in a journal before it is sent. Running the same import again with
+    the same journal skips the specs created before, and looks up those whose outcome was never
+    recorded before deciding to send them again: issues by a hidden marker appended to their body,
+    releases by their tag name in the release listing, which includes drafts. An interrupted import can therefore be restarted without duplicates.
+
+    Args:
+    - client (GitHubClient): Client of the repository the items are created in.
+    - kind (str): "issues" or "releases".
+    - journal (str, optional): Path of the import journal. Without one, nothing is skipped on a rerun.
+    - pacer (ContentPacer, optional): Pacing of the create requests. Defaults to GitHub's documented limits.
+    - dry_run (bool): Report what would be created without creating anything.
+    - progress (callable, optional): Called with the report after every `progress_every` results.
+    - progress_every (int): Number of results between progress callbacks.
+    - keep_results (bool): Keep every CreateResult on the report. Disable for very large imports.
+
+    Usage:
+    creator = BulkCreator(client, "issues", journal="import.journal")
+    report = creator.run(read_specs("issues.csv"))
+    """
+
+    KINDS = (ISSUES, RELEASES)
+
+    def __init__(self, client: Any, kind: str, journal: Optional[str] = None,
+                 pacer: Optional[ContentPacer] = None, dry_run: bool = False,
+                 progress: Optional[Callable[[BulkCreateReport], None]] = None,
+                 progress_every: int = 10, keep_results: bool = True):
+        if kind not in BulkCreator.KINDS:
+            raise ValueError(f"Unsupported kind: {kind}")
+        self.client = client
+        self.kind = kind
+        self.journal = ImportJournal(journal) if journal else None
+        self.pacer = pacer or ContentPacer()
+        self.dry_run = dry_run
+        self.progress = progress
+        self.progress_every = progress_every
+        self.keep_results = keep_results
+
+    def run(self, specs: Union[str, Iterable[Dict[str, Any]]]) -> BulkCreateReport:
+        """
+        Create every spec not created before. `specs` is an iterable of dicts, or the path of a
+        JSON Lines or CSV file.
+        """
+        report = BulkCreateReport()
+        if isinstance(specs, str):
+            specs = read_specs(specs)
+        if self.journal is not None:
+            self.pacer.seed(self.journal.sent_at())
+
+        try:
+            unresolved = self._reconcile(report) if self.journal is not None and not self.dry_run else set()
+            for spec in specs:
+                report.read += 1
+                key = spec_key(self.kind, spec)
+                if self.journal is not None and self.journal.state(key) in (CREATED, RECONCILED):
+                    self._record(report, CreateResult(key, SKIPPED))
+                    continue
+                if key in unresolved:
+                    self._record(report, CreateResult(key, FAILED, error="earlier request has no recorded outcome"))
+                    continue
+                if self.dry_run:
+                    self._record(report, CreateResult(key, DRY_RUN))
+                    continue
+
+                result, limited = self._create(key, spec, report)
+                self._record(report, result)
+                if limited:
+                    logging.error(f"Bulk import into {self.client.repo} stopped: still rate limited "
+                                  f"after {MAX_LIMITED_ATTEMPTS} attempts; run it again to resume")
+                    report.aborted = True
+                    break
+        finally:
+            if self.journal is not None:
+                self.journal.close()
+            report.finished_at = time.monotonic()
+
+        logging.info(f"Bulk {self.kind} import into {self.client.repo} finished: {report.to_dict()}")
+        return report
+
+    def _payload(self, key: str, spec: Dict[str, Any]) -> Dict[str, Any]:
+        payload = {name: value for name, value in spec.items() if name != "key"}
+        if self.kind == ISSUES and self.journal is not None:
+            body = payload.get("body") or ""
+            payload["body"] = f"{body}\n\n{MARKER.format(key=key)}" if body else MARKER.format(key=key)
+        return payload
+
+    def _create(self, key: str, spec: Dict[str, Any], report: BulkCreateReport) -> Tuple[CreateResult, bool]:
+        payload = self._payload(key, spec)
+        response = None
+        for _ in range(MAX_LIMITED_ATTEMPTS):
+            report.waited += self.pacer.wait()
+            if self.journal is not None:
+                lookup = {"tag_name": spec["tag_name"], "draft": bool(spec.get("draft"))} if self.kind == RELEASES else {}
+                self.journal.record(key, PENDING, sync=True, sent_at=time.time(), **lookup)
+            try:
+                response = self.client._make_request(method="POST", endpoint=self.kind, payload=payload)
+            except Exception as error:
+                # The request may or may not have reached GitHub; leave the entry pending so a
+                # rerun looks the item up before sending it again.
+                return CreateResult(key, FAILED, error=str(error)), False
+
+            if response.status_code == 201:
+                item = response.json()
+                result = CreateResult(key, CREATED, number=item.get("number") or item.get("id"),
+                                      url=item.get("html_url"), status_code=201)
+                self._journal(result)
+                return result, False
+            limited = is_rate_limited(response)
+            if not limited:
+                # A 403 without rate limit headers is a permission or validation error; waiting
+                # will not change the answer.
+                break
+            # The client already waited out and retried the limit; back off on top of that.
+            logging.warning(f"Creating {self.kind} is still rate limited, pausing for {SECONDARY_LIMIT_BACKOFF}s")
+            self.pacer.pause(SECONDARY_LIMIT_BACKOFF)
+
+        result = CreateResult(key, FAILED, status_code=response.status_code, error=response.text[:500])
+        self._journal(result)
+        return result, limited
+
+    def _journal(self, result: CreateResult):
+        if self.journal is not None:
+            self.journal.record(result.key, result.status, number=result.number, url=result.url,
+                                status_code=result.status_code)
+
+    def _reconcile(self, report: BulkCreateReport) -> Set[str]:
+        """
+        Look up the items whose create request has no recorded outcome, and record those that exist.
+        Returns the keys that could not be looked up; they stay pending for the next run.
+        """
+        pending = self.journal.pending()
+        if not pending:
+            return set()
+        logging.info(f"Looking up {len(pending)} {self.kind} sent by an interrupted import")
+        find = self._find_issues if self.kind == ISSUES else self._find_releases
+        found, complete = find(pending)
+
+        unresolved = set()
+        for entry in pending:
+            key = entry["key"]
+            if key in found:
+                item = found[key]
+                result = CreateResult(key, RECONCILED, number=item.get("number") or item.get("id"),
+                                      url=item.get("html_url"))
+                self._journal(result)
+                report.counts[RECONCILED] += 1
+                if self.keep_results:
+                    report.results.append(result)
+            elif complete:
+                # Not on GitHub: the request never got through, so the spec is sent again.
+                self.journal.record(key, FAILED, error="not found after interruption")
+            else:
+                unresolved.add(key)
+        return unresolved
+
+    def _find_issues(self, pending: List[Dict[str, Any]]) -> Tuple[Dict[str, Dict[str, Any]], bool]:
+        markers = {MARKER.format(key=entry["key"]): entry["key"] for entry in pending}
+        # Allow for clock skew between this machine and GitHub.
+        since = _timestamp(min(entry.get("sent_at", 0) for entry in pending) - 300)
+        found: Dict[str, Dict[str, Any]] = {}
+        try:
+            for issue in self.client.paginate("issues", params={"state": "all", "since": since}):
+                body = issue.get("body") or ""
+                for marker, key in markers.items():
+                    if marker in body:
+                        found[key] = issue
+                if len(found) == len(markers):
+                    break
+        except Exception as error:
+            logging.error(f"Could not look up issues of an interrupted import: {error}")
+            return found, False
+        return found, True
+
+    def _find_releases(self, pending: List[Dict[str, Any]]) -> Tuple[Dict[str, Dict[str, Any]], bool]:
+        # Draft releases have no tag yet, so releases/tags/{tag} does not find them; the release
+        # listing includes drafts and is searched by tag name instead, newest first.
+        tags = {entry.get("tag_name", entry["key"]): entry["key"] for entry in pending}
+        found: Dict[str, Dict[str, Any]] = {}
+        try:
+            for release in self.client.paginate("releases", prefetch=1):
+                key = tags.get(release.get("tag_name"))
+                if key is not None:
+                    found[key] = release
+                    if len(found) == len(tags):
+                        break
+            return found, True
+        except Exception as error:
+            logging.error(f"Could not list releases of an interrupted import: {error}")
+
+        # Fall back to looking up published releases one by one; drafts stay unresolved.
+        complete = True
+        for entry in pending:
+            tag = entry.get("tag_name", entry["key"])
+            if entry["key"] in found:
+                continue
+            if entry.get("draft"):
+                complete = False
+                continue
+            try:
+                response = self.client._make_request(method="GET", endpoint=f"releases/tags/{tag}")
+            except Exception as error:
+                logging.error(f"Could not look up release {tag}: {error}")
+                complete = False
+                continue
+            if response.status_code == 200:
+                found[entry["key"]] = response.json()
+            elif response.status_code != 404:
+                complete = False
+        return found, complete
+
+    def _record(self, report: BulkCreateReport, result: CreateResult):
+        report.counts[result.status] += 1
+        if self.keep_results:
+            report.results.append(result)
+        if self.progress is not None and sum(report.counts.values()) % self.progress_every == 0:
+            self.progress(report)
@@ -0,0 +1,287 @@
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Any, Callable, Dict, Iterable, List, Set
+
+DELETED = "deleted"
+NOT_FOUND = "not_found"
+FAILED = "failed"
+DRY_RUN = "dry_run"
+
+
+def _parse_timestamp(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+
+
+class RunFilter:
+    """
+    Selects which workflow runs a bulk deletion removes.
+
+    Args:
+    - older_than (timedelta, optional): Only delete runs created longer ago than this.
+    - statuses (iterable of str, optional): Only delete runs whose status or conclusion is listed,
+    e.g. {"failure", "cancelled"}.
+    - branches (iterable of str, optional): Only delete runs of these head branches.
+    - workflow_ids (iterable of int, optional): Only delete runs of these workflows.
+    - keep_last (int): Never delete the newest N matching runs of each workflow.
+    """
+
+    def __init__(self, older_than: Optional[timedelta] = None, statuses: Optional[Iterable[str]] = None,
+                 branches: Optional[Iterable[str]] = None, workflow_ids: Optional[Iterable[int]] = None,
+                 keep_last: int = 0):
+        self.older_than = older_than
+        self.statuses = set(statuses) if statuses else None
+        self.branches = set(branches) if branches else None
+        self.workflow_ids = set(workflow_ids) if workflow_ids else None
+        self.keep_last = keep_last
+        self._cutoff = datetime.now(timezone.utc) - older_than if older_than else None
+        self._seen_per_workflow: Dict[int, int] = {}
+
+    def reset(self):
+        """
+        Forget the runs counted for keep_last before listing the runs again.
+        """
+        self._seen_per_workflow = {}
+
+    def query_params(self) -> Dict[str, str]:
+        """
+        Query parameters that let the list endpoint do part of the filtering.
+        The age filter is only pushed down when no runs need to be kept, since
+        keep_last has to see the newest runs to count them.
+        """
+        params = {}
+        if self.branches is not None and len(self.branches) == 1:
+            params["branch"] = next(iter(self.branches))
+        if self.statuses is not None and len(self.statuses) == 1:
+            params["status"] = next(iter(self.statuses))
+        if self._cutoff is not None and not self.keep_last:
+            params["created"] = f"<{self._cutoff.strftime('%Y-%m-%dT%H:%M:%SZ')}"
+        return params
+
+    def matches(self, run: Dict[str, Any]) -> bool:
+        """
+        Return True if the run should be deleted. Runs must be passed newest first, each once per listing.
+        """
+        if self.workflow_ids is not None and run.get("workflow_id") not in self.workflow_ids:
+            return False
+        if self.branches is not None and run.get("head_branch") not in self.branches:
+            return False
+        if self.statuses is not None and not ({run.get("status"), run.get("conclusion")} & self.statuses):
+            return False
+
+        if self.keep_last:
+            workflow_id = run.get("workflow_id")
+            seen = self._seen_per_workflow.get(workflow_id, 0)
+            self._seen_per_workflow[workflow_id] = seen + 1
+            if seen < self.keep_last:
+                return False
+
+        if self._cutoff is not None and _parse_timestamp(run["created_at"]) >= self._cutoff:
+            return False
+        return True
+
+
+class RunDeletion:
+    """
+    Outcome of deleting a single workflow run.
+    """
+
+    __slots__ = ("run_id", "workflow_id", "status", "status_code", "error")
+
+    def __init__(self, run_id: int, workflow_id: Optional[int], status: str,
+                 status_code: Optional[int] = None, error: Optional[str] = None):
+        self.run_id = run_id
+        self.workflow_id = workflow_id
+        self.status = status
+        self.status_code = status_code
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.status in (DELETED, NOT_FOUND, DRY_RUN)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"RunDeletion(run_id={self.run_id}, status={self.status!r}, status_code={self.status_code})"
+
+
+class BulkDeleteReport:
+    """
+    Progress and outcome of a bulk deletion.
+    """
+
+    def __init__(self):
+        self.passes = 0
+        self.scanned = 0
+        self.matched = 0
+        self.skipped = 0
+        self.counts: Dict[str, int] = {DELETED: 0, NOT_FOUND: 0, FAILED: 0, DRY_RUN: 0}
+        self.results: List[RunDeletion] = []
+        self.started_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+
+    @property
+    def completed(self) -> int:
+        return sum(self.counts.values())
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """
+        Completed deletions per second.
+        """
+        elapsed = self.elapsed
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "passes": self.passes,
+            "scanned": self.scanned,
+            "matched": self.matched,
+            "skipped": self.skipped,
+            "completed": self.completed,
+            **self.counts,
+            "elapsed": round(self.elapsed, 3),
+            "throughput": round(self.throughput, 3),
+        }
+
+    def __repr__(self) -> str:
+        return f"BulkDeleteReport({self.to_dict()})"
+
+
+class BulkDeleter:
+    """
+    Streaming, concurrent deletion of workflow runs.
+
+    Runs are deleted while the listing is still being paged through. Deletes are sent by a
+    bounded pool of worker threads through the client, so they share its connection pool and
+    rate-limit scheduler, and at most `workers * 2` deletions are queued at any time.
+    Deleting runs shifts the later pages of the listing, so the listing is walked again until
+    a pass deletes nothing more.
+
+    Args:
+    - client (ActionsCommands): Client of the repository whose runs are deleted.
+    - run_filter (RunFilter, optional): Which runs to delete. Every run is deleted if not provided.
+    - workers (int): Number of deletes in flight at once.
+    - dry_run (bool): Report what would be deleted without deleting anything.
+    - checkpoint (str, optional): Path of a file recording finished run IDs. Runs listed in it
+    are skipped, so an interrupted cleanup can be resumed.
+    - progress (callable, optional): Called with the report after every `progress_every` results.
+    - progress_every (int): Number of results between progress callbacks.
+    - keep_results (bool): Keep every RunDeletion on the report. Disable for very large histories.
+
+    Usage:
+    deleter = BulkDeleter(actions, RunFilter(older_than=timedelta(days=30), keep_last=5), workers=16)
+    report = deleter.run()
+    """
+
+    def __init__(self, client: Any, run_filter: Optional[RunFilter] = None, workers: int = 8,
+                 dry_run: bool = False, checkpoint: Optional[str] = None,
+                 progress: Optional[Callable[[BulkDeleteReport], None]] = None,
+                 progress_every: int = 100, keep_results: bool = True):
+        self.client = client
+        self.run_filter = run_filter or RunFilter()
+        self.workers = workers
+        self.dry_run = dry_run
+        self.checkpoint = checkpoint
+        self.progress = progress
+        self.progress_every = progress_every
+        self.keep_results = keep_results
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(workers * 2)
+        self._checkpoint_file = None
+
+    def run(self) -> BulkDeleteReport:
+        report = BulkDeleteReport()
+        finished = self._load_checkpoint()
+        attempted: Set[int] = set()
+        if self.checkpoint and not self.dry_run:
+            self._checkpoint_file = open(self.checkpoint, "a", encoding="utf-8")
+
+        try:
+            while True:
+                deleted_before = report.counts[DELETED]
+                self._run_pass(report, finished, attempted)
+                if self.dry_run or report.counts[DELETED] == deleted_before:
+                    break
+                self.run_filter.reset()
+        finally:
+            if self._checkpoint_file is not None:
+                self._checkpoint_file.close()
+                self._checkpoint_file = None
+            report.finished_at = time.monotonic()
+
+        logging.info(f"Workflow run cleanup for {self.client.repo} finished: {report.to_dict()}")
+        return report
+
+    def _run_pass(self, report: BulkDeleteReport, finished: Set[int], attempted: Set[int]):
+        report.passes += 1
+        # Runs created during the pass shift the pages, so a run can be listed twice; it must only
+        # be counted once for keep_last.
+        seen: Set[int] = set()
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ghmate-delete")
+        try:
+            for run in self.client.iter_workflow_runs(keep_extra=False, **self.run_filter.query_params()):
+                report.scanned += 1
+                if run["id"] in seen:
+                    continue
+                seen.add(run["id"])
+                if not self.run_filter.matches(run) or run["id"] in attempted:
+                    continue
+                attempted.add(run["id"])
+                report.matched += 1
+                if run["id"] in finished:
+                    report.skipped += 1
+                    continue
+
+                if self.dry_run:
+                    self._record(report, RunDeletion(run["id"], run.get("workflow_id"), DRY_RUN))
+                    continue
+
+                self._slots.acquire()
+                future = executor.submit(self._delete, run["id"], run.get("workflow_id"))
+                future.add_done_callback(lambda done: self._on_done(report, done))
+        finally:
+            executor.shutdown(wait=True)
+
+    def _delete(self, run_id: int, workflow_id: Optional[int]) -> RunDeletion:
+        try:
+            response = self.client._make_request(method="DELETE", endpoint=f"actions/runs/{run_id}")
+        except Exception as error:
+            return RunDeletion(run_id, workflow_id, FAILED, error=str(error))
+
+        if response.status_code == 204:
+            return RunDeletion(run_id, workflow_id, DELETED, status_code=204)
+        if response.status_code == 404:
+            return RunDeletion(run_id, workflow_id, NOT_FOUND, status_code=404)
+        return RunDeletion(run_id, workflow_id, FAILED, status_code=response.status_code)
+
+    def _on_done(self, report: BulkDeleteReport, future: Future):
+        self._slots.release()
+        self._record(report, future.result())
+
+    def _record(self, report: BulkDeleteReport, result: RunDeletion):
+        with self._lock:
+            report.counts[result.status] += 1
+            if self.keep_results:
+                report.results.append(result)
+            if self._checkpoint_file is not None and result.status in (DELETED, NOT_FOUND):
+                self._checkpoint_file.write(f"{json.dumps(result.run_id)}\n")
+                self._checkpoint_file.flush()
+            if self.progress is not None and report.completed % self.progress_every == 0:
+                self.progress(report)
+
+    def _load_checkpoint(self) -> Set[int]:
+        if not self.checkpoint or not os.path.exists(self.checkpoint):
+            return set()
+        with open(self.checkpoint, "r", encoding="utf-8") as checkpoint_file:
+            return {json.loads(line) for line in checkpoint_file if line.strip()}
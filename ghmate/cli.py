@@ -0,0 +1,241 @@
+"""
+Command line interface exposing the CoreCommands and ActionsCommands methods.
+
+Usage:
+ghmate -R owner/repo core --format ndjson issue list_all
+ghmate -R owner/repo actions iter_workflow_runs status=failure
+ghmate actions --list
+
+Positional arguments are passed to the method in order and `name=value` arguments as keywords.
+Integers, true, false, null and JSON arrays or objects are decoded; anything else is passed as a
+string. Results are written to stdout as one JSON document, or as one JSON document per line
+with --format ndjson, which streams paginated results as they arrive.
+
+Only the standard library is imported at startup. The client module of the command, and with it
+requests, is imported once the arguments have been parsed, so --help, --version and argument
+errors return without loading the HTTP stack.
+"""
+import argparse
+import os
+import re
+import sys
+from typing import Optional, Any, Dict, Iterator, List, Tuple
+
+CLIENTS: Dict[str, Tuple[str, str]] = {
+    "core": ("ghmate.core_commands", "CoreCommands"),
+    "actions": ("ghmate.actions_commands", "ActionsCommands"),
+}
+
+JSON = "json"
+NDJSON = "ndjson"
+
+_KEYWORD = re.compile(r"([A-Za-z_]\w*)=(.*)", re.DOTALL)
+_INTEGER = re.compile(r"-?\d+")
+
+
+def _add_options(parser: argparse.ArgumentParser, defaults: bool):
+    # Options are accepted before and after the command; on the command parser they default to
+    # SUPPRESS so they do not overwrite values given before it.
+    def default(value: Any) -> Any:
+        return value if defaults else argparse.SUPPRESS
+
+    parser.add_argument("-R", "--repo", default=default(os.environ.get("GITHUB_REPOSITORY")),
+                        help="Repository as OWNER/REPO. Defaults to $GITHUB_REPOSITORY.")
+    parser.add_argument("--token", default=default(None), help="API token. Defaults to $GITHUB_TOKEN.")
+    parser.add_argument("--api-url", default=default(os.environ.get("GITHUB_API_URL")),
+                        help="API root URL. Defaults to $GITHUB_API_URL, then https://api.github.com.")
+    parser.add_argument("--format", choices=(JSON, NDJSON), default=default(JSON),
+                        help="Print one JSON document, or one document per line (default: json).")
+    parser.add_argument("--backend", choices=("rest", "graphql"), default=default(None),
+                        help="Backend of the core list_all actions.")
+    parser.add_argument("--http", choices=("stdlib", "requests"), default=default("stdlib"),
+                        help="HTTP transport: the standard library one, which starts faster, or requests "
+                             "(default: stdlib).")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="ghmate",
+        description="Call ghmate commands against a GitHub repository and print the results as JSON.",
+    )
+    parser.add_argument("--version", action="store_true", help="Print the ghmate version and exit.")
+    _add_options(parser, defaults=True)
+
+    commands = parser.add_subparsers(dest="client", metavar="{core,actions}")
+    for name, (_, class_name) in CLIENTS.items():
+        command = commands.add_parser(name, help=f"Call {class_name} methods.")
+        command.add_argument("--list", action="store_true", help="List the available methods and exit.")
+        _add_options(command, defaults=False)
+        command.add_argument("method", nargs="?", help="Method to call, e.g. issue or iter_workflow_runs.")
+        command.add_argument("args", nargs="*", help="Method arguments, positional or name=value.")
+    return parser
+
+
+def parse_value(value: str) -> Any:
+    """
+    Decode integers, true, false, null and JSON arrays or objects; return anything else unchanged.
+    """
+    if _INTEGER.fullmatch(value):
+        return int(value)
+    if value in ("true", "false", "null"):
+        return {"true": True, "false": False, "null": None}[value]
+    if value[:1] in ("[", "{"):
+        import json
+
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return value
+
+
+def parse_arguments(values: List[str]) -> Tuple[List[Any], Dict[str, Any]]:
+    args: List[Any] = []
+    kwargs: Dict[str, Any] = {}
+    for value in values:
+        match = _KEYWORD.fullmatch(value)
+        if match:
+            kwargs[match.group(1)] = parse_value(match.group(2))
+        else:
+            args.append(parse_value(value))
+    return args, kwargs
+
+
+def load_client_class(name: str) -> type:
+    import importlib
+
+    module_name, class_name = CLIENTS[name]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def public_methods(client_class: type) -> List[str]:
+    return sorted(name for name in dir(client_class)
+                  if not name.startswith("_") and callable(getattr(client_class, name)) and not name.isupper())
+
+
+def to_jsonable(value: Any) -> Any:
+    """
+    Convert a command result to plain JSON values. Responses become their decoded body, records
+    and reports their to_dict(). Iterators are returned as lists; use iter_items to stream them.
+    """
+    if hasattr(value, "status_code") and hasattr(value, "content"):
+        if not value.content:
+            return {"status": value.status_code}
+        from ghmate.records import loads
+
+        try:
+            return loads(value.content)
+        except ValueError:
+            return value.text
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if isinstance(value, dict):
+        return {key: to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if hasattr(value, "__iter__"):
+        return [to_jsonable(item) for item in value]
+    return str(value)
+
+
+def iter_items(value: Any) -> Iterator[Any]:
+    """
+    Yield the documents of an NDJSON output: the items of a list result or of a list response body,
+    and any other result as a single document.
+    """
+    if hasattr(value, "status_code") and hasattr(value, "content"):
+        value = to_jsonable(value)
+    if isinstance(value, (str, bytes, dict)) or not hasattr(value, "__iter__") or hasattr(value, "to_dict"):
+        yield to_jsonable(value)
+        return
+    for item in value:
+        yield to_jsonable(item)
+
+
+def write_result(result: Any, output_format: str, stream: Any):
+    from ghmate.records import dumps
+
+    if output_format == NDJSON:
+        for item in iter_items(result):
+            stream.write(dumps(item).decode("utf-8"))
+            stream.write("\n")
+    else:
+        stream.write(dumps(to_jsonable(result)).decode("utf-8"))
+        stream.write("\n")
+    stream.flush()
+
+
+def _version() -> str:
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("ghmate")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    # Method arguments may follow options given after the method, which argparse leaves over.
+    options, extra = parser.parse_known_args(argv)
+    unknown = [value for value in extra if value.startswith("-") and not _INTEGER.fullmatch(value)]
+    if unknown or (extra and options.client is None):
+        parser.error(f"unrecognized arguments: {' '.join(unknown or extra)}")
+    if extra:
+        options.args = options.args + extra
+
+    if options.version:
+        print(f"ghmate {_version()}")
+        return 0
+    if options.client is None:
+        parser.print_help()
+        return 2
+
+    command = f"ghmate {options.client}"
+    if not options.list:
+        if not options.method:
+            parser.error(f"{command}: a method is required; see '{command} --list'")
+        if not options.repo or "/" not in options.repo:
+            parser.error("a repository is required as -R OWNER/REPO or $GITHUB_REPOSITORY")
+
+    result = None
+    try:
+        client_class = load_client_class(options.client)
+        if options.list:
+            sys.stdout.write("\n".join(public_methods(client_class)) + "\n")
+            sys.stdout.flush()
+            return 0
+        if options.method.startswith("_") or options.method not in public_methods(client_class):
+            parser.error(f"{command}: unknown method '{options.method}'; see '{command} --list'")
+
+        owner, repo = options.repo.split("/", 1)
+        client_options: Dict[str, Any] = {"owner": owner, "repo": repo, "token": options.token}
+        if options.api_url:
+            client_options["api_url"] = options.api_url
+        if options.backend and options.client == "core":
+            client_options["backend"] = options.backend
+        if options.http == "stdlib":
+            from ghmate.transport import StdlibTransport, DEFAULT_API_URL
+
+            client_options["transport"] = StdlibTransport.shared(options.api_url or DEFAULT_API_URL)
+
+        args, kwargs = parse_arguments(options.args)
+        result = getattr(client_class(**client_options), options.method)(*args, **kwargs)
+        write_result(result, options.format, sys.stdout)
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:
+        # The reader went away (e.g. `| head`); keep the flush at interpreter exit from failing again.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+    except Exception as error:
+        print(f"ghmate: error: {error}", file=sys.stderr)
+        return 1
+
+    status_code = getattr(result, "status_code", None)
+    return 1 if isinstance(status_code, int) and status_code >= 400 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
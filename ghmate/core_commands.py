@@ -1,37 +1,61 @@
-from typing import Optional, Any
+from typing import TYPE_CHECKING, Optional, Any, Dict, Iterable, Union
 from ghmate.github_client import GitHubClient  # Import the GitHubClient class
 
+# Secrets, GraphQL, records and bulk helpers are imported by the methods using them, so that
+# short-lived processes such as the CLI only load what they run.
+if TYPE_CHECKING:
+    from ghmate.bulk_create import BulkCreateReport
+    from ghmate.graphql import GraphQLBatcher
+    from ghmate.rate_limit import ContentPacer
+
 
 class CoreCommands(GitHubClient):
     """
     Handles GitHub core commands.
 
     Inherits from GitHubClient for shared attributes and methods.
+
+    The 'list_all' actions of issue, pr and release read through the REST list endpoints by
+    default; pass backend="graphql" to read them through batched GraphQL queries instead.
     """
 
-    def __init__(self, token: str, owner: str, repo: str):
-        super().__init__(token, owner, repo)
+    BACKENDS = ("rest", "graphql")
+
+    def __init__(self, token: str, owner: str, repo: str, backend: str = "rest", **kwargs: Any):
+        if backend not in CoreCommands.BACKENDS:
+            raise ValueError(f"Unsupported backend: {backend}")
+        super().__init__(owner=owner, repo=repo, token=token, **kwargs)
+        self.backend = backend
+        self._graphql_batcher: Optional["GraphQLBatcher"] = None
+
+    @property
+    def _graphql(self) -> "GraphQLBatcher":
+        if self._graphql_batcher is None:
+            from ghmate.graphql import GraphQLBatcher
+
+            self._graphql_batcher = GraphQLBatcher(self)
+        return self._graphql_batcher
 
     def auth(self):
-        url = "https://api.github.com/user"
+        url = f"{self.api_url}/user"
         return self._make_request(method="GET", endpoint=url)
 
     def browse(self):
-        url = f"{self.base_url}/topics"
+        url = "topics"
         return self._make_request(method="GET", endpoint=url)
 
     def codespace(self):
-        url = f"{self.base_url}/codespaces"
+        url = "codespaces"
         return self._make_request(method="GET", endpoint=url)
 
     def gist(self):
-        url = "https://api.github.com/gists"
+        url = f"{self.api_url}/gists"
         return self._make_request(method="GET", endpoint=url)
 
     def issue(self, action: str, *args: Optional[Any]) -> Any:
         if action == 'create':
             title, body = args
-            url = f"{self.base_url}/issues"
+            url = "issues"
             payload = {
                 "title": title,
                 "body": body,
@@ -43,13 +67,21 @@ class CoreCommands(GitHubClient):
             )
 
         elif action == 'list':
-            url = f"{self.base_url}/issues"
+            url = "issues"
             return self._make_request(method="GET", endpoint=url)
 
+        elif action == 'list_all':
+            from ghmate.records import Issue, to_records
+
+            if self.backend == "graphql":
+                issues = self._graphql.list_resource(self.owner, self.repo, "issues", state="open")
+                return list(to_records(Issue, issues))
+            return self.paginate("issues", record=Issue)
+
     def org(self, action: str, *args: Optional[Any]) -> Any:
         if action == 'create':
             org_name = args[0]
-            url = "https://api.github.com/orgs"
+            url = f"{self.api_url}/orgs"
             payload = {
                 "login": org_name,
             }
@@ -60,23 +92,31 @@ class CoreCommands(GitHubClient):
             )
 
         elif action == 'list':
-            url = "https://api.github.com/organizations"
+            url = f"{self.api_url}/organizations"
             return self._make_request(method="GET", endpoint=url)
 
     def pr(self, action: str, *args: Optional[Any]) -> Any:
         if action == 'checkout':
             pr_number = args[0]
-            url = f"{self.base_url}/pulls/{pr_number}"
+            url = f"pulls/{pr_number}"
             return self._make_request(method="GET", endpoint=url)
 
         elif action == 'list':
-            url = f"{self.base_url}/pulls"
+            url = "pulls"
             return self._make_request(method="GET", endpoint=url)
 
+        elif action == 'list_all':
+            from ghmate.records import PullRequest, to_records
+
+            if self.backend == "graphql":
+                pulls = self._graphql.list_resource(self.owner, self.repo, "pulls", state="open")
+                return list(to_records(PullRequest, pulls))
+            return self.paginate("pulls", record=PullRequest)
+
     def project(self, action: str, *args: Optional[Any]) -> Any:
         if action == 'create':
             project_name = args[0]
-            url = f"{self.base_url}/projects"
+            url = "projects"
             payload = {
                 "name": project_name,
             }
@@ -87,13 +127,13 @@ class CoreCommands(GitHubClient):
             )
 
         elif action == 'list':
-            url = f"{self.base_url}/projects"
+            url = "projects"
             return self._make_request(method="GET", endpoint=url)
 
     def release(self, action: str, *args: Optional[Any]) -> Any:
         if action == 'create':
             tag_name, target_commitish = args
-            url = f"{self.base_url}/releases"
+            url = "releases"
             payload = {
                 "tag_name": tag_name,
                 "target_commitish": target_commitish,
@@ -105,9 +145,45 @@ class CoreCommands(GitHubClient):
             )
 
         elif action == 'list':
-            url = f"{self.base_url}/releases"
+            url = "releases"
             return self._make_request(method="GET", endpoint=url)
 
+        elif action == 'list_all':
+            from ghmate.records import Release, to_records
+
+            if self.backend == "graphql":
+                releases = self._graphql.list_resource(self.owner, self.repo, "releases")
+                return list(to_records(Release, releases))
+            return self.paginate("releases", record=Release)
+
+    def bulk_create_issues(self, specs: Union[str, Iterable[Dict[str, Any]]], journal: Optional[str] = None,
+                           dry_run: bool = False, pacer: Optional["ContentPacer"] = None) -> "BulkCreateReport":
+        """
+        Create issues from specs, paced to stay inside GitHub's content-creation limits.
+        Args:
+        - specs (str or iterable of dict): Issue bodies ({"title": ..., "body": ..., "labels": [...]}),
+        or the path of a JSON Lines or CSV file of them.
+        - journal (str, optional): Path of the import journal. Rerunning an import with the same
+        journal creates only the issues it has not created yet, also after a crash.
+        - dry_run (bool): Report what would be created without creating anything.
+        - pacer (ContentPacer, optional): Pacing of the create requests.
+        Returns:
+        - BulkCreateReport: Counts of created, skipped and failed issues.
+        """
+        from ghmate.bulk_create import BulkCreator, ISSUES
+
+        return BulkCreator(self, ISSUES, journal=journal, pacer=pacer, dry_run=dry_run).run(specs)
+
+    def bulk_create_releases(self, specs: Union[str, Iterable[Dict[str, Any]]], journal: Optional[str] = None,
+                             dry_run: bool = False, pacer: Optional["ContentPacer"] = None) -> "BulkCreateReport":
+        """
+        Create releases from specs ({"tag_name": ..., "name": ..., "body": ...}), paced and resumable
+        like bulk_create_issues. Releases are identified by their tag across runs.
+        """
+        from ghmate.bulk_create import BulkCreator, RELEASES
+
+        return BulkCreator(self, RELEASES, journal=journal, pacer=pacer, dry_run=dry_run).run(specs)
+
     def get_repo_clone_url(self, repo_name: str) -> str:
         """
         Get the clone URL for a repository.
@@ -126,28 +202,40 @@ class CoreCommands(GitHubClient):
         Returns:
         - dict: The response JSON containing repository information.
         """
-        url = "https://api.github.com/user/repos"
+        url = f"{self.api_url}/user/repos"
         payload = {
             "name": repo_name,
         }
         return self._make_request(method="POST", endpoint=url, payload=payload)
 
+    def get_public_key(self) -> dict:
+        """
+        Get the public key used to encrypt the repository's Actions secrets, from the shared key cache.
+        Returns:
+        - dict: The key_id and the base64-encoded key.
+        """
+        from ghmate.actions_secrets import PublicKeyCache
+
+        key_id, key = PublicKeyCache.shared().get(self)
+        return {"key_id": key_id, "key": key}
+
     def set_secret(self, secret_name: str, secret_value: str):
-        url = f"{self.base_url}/actions/secrets/{secret_name}"
-        payload = {
-            "encrypted_value": secret_value
-        }
-        return self._make_request(
-            method="PUT",
-            endpoint=url,
-            payload=payload
-        )
-
-    def get_secret(self, secret_name: str):
-        url = f"{self.base_url}/actions/secrets/{secret_name}"
+        """
+        Create or update an Actions secret, encrypted with the repository public key.
+        Requires PyNaCl ('pip install ghmate[secrets]').
+        """
+        from ghmate.actions_secrets import put_secret
+
+        return put_secret(self, secret_name, secret_value)
+
+    def get_secret(self, secret_name: str) -> Optional[dict]:
+        """
+        Get the metadata of an Actions secret (name, created_at, updated_at). GitHub never returns secret values.
+        """
+        url = f"actions/secrets/{secret_name}"
         response = self._make_request(method="GET", endpoint=url)
-        return response.get("value") if response else None
+        return response.json() if response.status_code == 200 else None
 
     def delete_secret(self, secret_name: str):
-        url = f"{self.base_url}/actions/secrets/{secret_name}"
+        url = f"actions/secrets/{secret_name}"
         self._make_request(method="DELETE", endpoint=url)
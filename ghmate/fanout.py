@@ -0,0 +1,204 @@
+import fnmatch
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Any, Callable, Dict, Iterable, Iterator, List, Mapping
+
+from ghmate.actions_commands import ActionsCommands
+from ghmate.actions_secrets import SecretSyncState, sync_secrets
+from ghmate.bulk_delete import RunFilter
+from ghmate.github_client import GitHubClient
+from ghmate.graphql import GraphQLBatcher, ISSUES, PULLS, RELEASES
+from ghmate.records import ActionsCacheEntry, Release
+
+
+class RepoResult:
+    """
+    Outcome of running a command against one repository.
+    """
+
+    __slots__ = ("owner", "repo", "value", "error", "elapsed")
+
+    def __init__(self, owner: str, repo: str, value: Any = None, error: Optional[Exception] = None,
+                 elapsed: float = 0.0):
+        self.owner = owner
+        self.repo = repo
+        self.value = value
+        self.error = error
+        self.elapsed = elapsed
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.owner}/{self.repo}"
+
+    def __repr__(self) -> str:
+        status = "ok" if self.ok else f"error={self.error!r}"
+        return f"RepoResult({self.full_name}, {status}, elapsed={self.elapsed:.3f})"
+
+
+class FanOut:
+    """
+    Runs a command across many repositories of one owner on a shared thread pool.
+
+    Every repository gets its own client, but all clients share the pooled transport and the
+    rate-limit scheduler of their host and token, so the whole batch draws on one budget.
+    Results are streamed back as repositories finish; a failing repository is reported in its
+    RepoResult and does not abort the batch.
+
+    Args:
+    - owner (str): The user or organization owning the repositories.
+    - repos (iterable of str): Repository names. Names may be glob patterns such as "service-*",
+    which are matched against the owner's repositories.
+    - token (str, optional): The GitHub personal access token.
+    - workers (int): Number of repositories processed at once.
+    - client_class (type): Client class built for each repository. Defaults to ActionsCommands.
+    - client_options: Extra keyword arguments passed to every client, e.g. api_url or cache.
+
+    Usage:
+    fanout = FanOut("my-org", ["api", "web-*"], token="your_token")
+    for result in fanout.run(list_releases):
+        print(result.full_name, len(result.value) if result.ok else result.error)
+    """
+
+    def __init__(self, owner: str, repos: Iterable[str], token: Optional[str] = None, workers: int = 16,
+                 client_class: type = ActionsCommands, **client_options: Any):
+        self.owner = owner
+        self.token = token
+        self.workers = workers
+        self.client_class = client_class
+        self.client_options = client_options
+
+        repos = list(repos)
+        patterns = [name for name in repos if any(char in name for char in "*?[")]
+        if patterns:
+            available = list_repositories(owner, token=token, **client_options)
+            matched = [name for name in available if any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)]
+            repos = [name for name in repos if name not in patterns] + matched
+        self.repos = list(dict.fromkeys(repos))
+
+    @classmethod
+    def for_owner(cls, owner: str, pattern: str = "*", token: Optional[str] = None,
+                  include_archived: bool = False, **kwargs: Any) -> "FanOut":
+        """
+        Build a fan-out over every repository of a user or organization whose name matches a glob pattern.
+        """
+        client_options = {key: value for key, value in kwargs.items() if key not in ("workers", "client_class")}
+        names = list_repositories(owner, token=token, include_archived=include_archived, **client_options)
+        return cls(owner, [name for name in names if fnmatch.fnmatchcase(name, pattern)], token=token, **kwargs)
+
+    def client(self, repo: str) -> GitHubClient:
+        return self.client_class(owner=self.owner, repo=repo, token=self.token, **self.client_options)
+
+    def run(self, command: Callable[[GitHubClient], Any]) -> Iterator[RepoResult]:
+        """
+        Run `command(client)` for every repository and yield the results in completion order.
+        """
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ghmate-fanout") as executor:
+            futures = [executor.submit(self._run_one, repo, command) for repo in self.repos]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def run_all(self, command: Callable[[GitHubClient], Any]) -> List[RepoResult]:
+        """
+        Run `command(client)` for every repository and return the results in repository order.
+        """
+        results = {result.repo: result for result in self.run(command)}
+        return [results[repo] for repo in self.repos]
+
+    def list_resources(self, resources: Iterable[str] = (ISSUES, PULLS, RELEASES),
+                       backend: str = "rest") -> Dict[str, Dict[str, List[dict]]]:
+        """
+        Read issues, pull requests and releases of every repository.
+        Args:
+        - resources (iterable of str): Any of "issues", "pulls" and "releases".
+        - backend (str): "rest" pages through the list endpoints of each repository;
+        "graphql" merges the reads into a few batched GraphQL queries.
+        Returns:
+        - dict: Maps repository name to a dict of resource name to the list of items.
+        """
+        resources = list(resources)
+        if backend == "graphql":
+            if not self.repos:
+                return {}
+            batcher = GraphQLBatcher(self.client(self.repos[0]))
+            results = batcher.fetch([(self.owner, repo) for repo in self.repos], resources=resources)
+            return {repo: results[(self.owner, repo)] for repo in self.repos}
+        if backend != "rest":
+            raise ValueError(f"Unsupported backend: {backend}")
+
+        def command(client: GitHubClient) -> Dict[str, List[dict]]:
+            return {resource: list(client.paginate(resource)) for resource in resources}
+
+        listed = {}
+        for result in self.run_all(command):
+            if not result.ok:
+                raise result.error
+            listed[result.repo] = result.value
+        return listed
+
+    def _run_one(self, repo: str, command: Callable[[GitHubClient], Any]) -> RepoResult:
+        started = time.monotonic()
+        try:
+            value = command(self.client(repo))
+        except Exception as error:
+            return RepoResult(self.owner, repo, error=error, elapsed=time.monotonic() - started)
+        return RepoResult(self.owner, repo, value=value, elapsed=time.monotonic() - started)
+
+
+def list_repositories(owner: str, token: Optional[str] = None, include_archived: bool = False,
+                      **client_options: Any) -> List[str]:
+    """
+    Return the names of the repositories of a user or organization visible to the token.
+    """
+    # Only absolute URLs are requested, so the client's repository name is never used.
+    client = GitHubClient(owner=owner, repo=owner, token=token, **client_options)
+    response = client._make_request(method="GET", endpoint=f"{client.api_url}/orgs/{owner}")
+    kind = "orgs" if response.status_code == 200 else "users"
+
+    names = []
+    for repository in client.paginate(f"{client.api_url}/{kind}/{owner}/repos", params={"type": "all"}):
+        if repository.get("archived") and not include_archived:
+            continue
+        names.append(repository["name"])
+    return names
+
+
+def list_releases(client: GitHubClient) -> list:
+    """
+    Fan-out command returning every release of a repository.
+    """
+    return list(client.paginate("releases", record=Release))
+
+
+def list_cache_entries(client: GitHubClient) -> list:
+    """
+    Fan-out command returning every Actions cache entry of a repository.
+    """
+    return list(client.paginate("actions/caches", item_key="actions_caches", record=ActionsCacheEntry))
+
+
+def prune_runs(run_filter_factory: Callable[[], RunFilter], workers: int = 8,
+               dry_run: bool = False) -> Callable[[ActionsCommands], Any]:
+    """
+    Build a fan-out command deleting the workflow runs selected by a fresh RunFilter in each repository.
+    """
+    def command(client: ActionsCommands):
+        return client.bulk_delete_workflow_runs(run_filter_factory(), workers=workers, dry_run=dry_run)
+
+    return command
+
+
+def push_secrets(desired: Mapping[str, str], state: Optional[SecretSyncState] = None, workers: int = 4,
+                 delete_missing: bool = False, dry_run: bool = False) -> Callable[[GitHubClient], Any]:
+    """
+    Build a fan-out command syncing the same Actions secrets into every repository.
+    One state can be shared by all repositories; its entries are keyed by repository.
+    """
+    def command(client: GitHubClient):
+        return sync_secrets(client, desired, state=state, workers=workers, delete_missing=delete_missing,
+                            dry_run=dry_run)
+
+    return command
@@ -1,8 +1,22 @@
+import json
 import logging
 import os
-from typing import Optional, Dict
-import requests
-from requests import Response
+import time
+from typing import TYPE_CHECKING, Optional, Dict, Iterable
+
+from ghmate.rate_limit import RateLimiter, RateLimitBudget, resource_for_url
+from ghmate.retry import RetryPolicy, CircuitBreaker, SERVER_ERROR, classify_error, is_transport_error
+from ghmate.singleflight import SingleFlight, request_key, copy_response
+from ghmate.transport import Transport, DEFAULT_API_URL
+
+# Only what every request needs is imported up front. requests is loaded by the transport when
+# it sends its first request, and instrumentation, pagination and the response cache (sqlite3)
+# when a client uses them, which keeps short-lived processes such as the CLI quick to start.
+if TYPE_CHECKING:  # pragma: no cover
+    from requests import Response
+    from ghmate.instrumentation import RequestEvent, RequestHooks
+    from ghmate.pagination import Paginator
+    from ghmate.response_cache import ResponseCache
 
 
 class GitHubClient:
@@ -15,18 +29,48 @@ class GitHubClient:
     - repo (str): The name of the GitHub repository.
     - token (str, optional): The GitHub personal access token.
     If not provided, the token should be set as an environment variable named 'GITHUB_TOKEN'.
+    - api_url (str, optional): Root URL of the GitHub API. Defaults to https://api.github.com.
+    - transport (Transport, optional): HTTP transport to send requests through.
+    If not provided, the pooled transport shared by all clients of the same host is used.
+    - cache (ResponseCache, optional): Conditional-request cache for GET responses. Disabled if not provided.
+    - rate_limiter (RateLimiter, optional): Scheduler that keeps requests inside the rate limits.
+    If not provided, the scheduler shared by all clients in the process is used.
+    - hooks (iterable of RequestHooks, optional): Instrumentation called before and after every request,
+    e.g. a MetricsCollector.
+    - retry_policy (RetryPolicy, optional): Which transient failures are retried and how. Defaults to RetryPolicy().
+    - circuit_breaker (CircuitBreaker, optional): Breaker that fails fast while the API is down.
+    If not provided, the breaker shared by all clients of the same host is used.
+    - singleflight (SingleFlight, optional): Coalescer of concurrent identical GET requests, e.g. one with a
+    reuse window. Passing one enables coalescing.
+    - coalesce (bool): Coalesce identical concurrent GET requests through the instance shared by all clients
+    in the process. Off by default, since a GET joining one sent before a write may not see that write.
 
     Usage:
     github_client = GitHubClient(owner="owner", repo="repo", token="your_token")
     """
 
-    def __init__(self, owner: str, repo: str, token: Optional[str] = None):
+    def __init__(
+        self,
+        owner: str,
+        repo: str,
+        token: Optional[str] = None,
+        api_url: str = DEFAULT_API_URL,
+        transport: Optional[Transport] = None,
+        cache: Optional["ResponseCache"] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        hooks: Optional[Iterable["RequestHooks"]] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        singleflight: Optional[SingleFlight] = None,
+        coalesce: bool = False,
+    ):
         if not all([owner, repo]):
             raise ValueError("GitHub owner and repository name are required.")
 
         self.owner = owner
         self.repo = repo
-        self.base_url = f"https://api.github.com/repos/{self.owner}"
+        self.api_url = api_url.rstrip("/")
+        self.base_url = f"{self.api_url}/repos/{self.owner}"
 
         # Retrieve the token from the parameter or environment variable
         self.token = token or os.environ.get('GITHUB_TOKEN')
@@ -39,15 +83,226 @@ class GitHubClient:
             "Accept": "application/vnd.github.v3+json"
         }
 
-    def _make_request(self, method: str, endpoint: str, payload: Optional[Dict] = None) -> Response:
+        self.transport = transport or Transport.shared(self.api_url)
+        self.response_cache = cache
+        self.rate_limiter = rate_limiter or RateLimiter.shared()
+        self.hooks = list(hooks or [])
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker.shared(self.api_url)
+        self.singleflight = singleflight or (SingleFlight.shared() if coalesce else None)
+
+    def rate_limit_budget(self, resource: str = "core") -> RateLimitBudget:
+        """
+        Return the remaining quota known for this client's token in the given resource bucket.
+        """
+        return self.rate_limiter.budget(self.token, resource)
+
+    def paginate(self, endpoint: str, item_key: Optional[str] = None, params: Optional[Dict] = None,
+                 per_page: int = 100, prefetch: int = 4, record: Optional[type] = None,
+                 keep_extra: bool = True) -> "Paginator":
+        """
+        Lazily iterate over every item of a list endpoint, following the Link headers.
+        Args:
+        - endpoint (str): Repository-relative endpoint or absolute URL of the list endpoint.
+        - item_key (str, optional): Key of the item list in the response object, e.g. "workflow_runs".
+        - params (dict, optional): Extra query parameters sent with every page.
+        - per_page (int): Number of items requested per page.
+        - prefetch (int): Number of pages fetched concurrently once the page count is known.
+        - record (type, optional): Record class the items are decoded into instead of dicts.
+        - keep_extra (bool): Keep the fields the record class does not declare.
+        Returns:
+        - Paginator: An iterator over the items of all pages.
+        """
+        from ghmate.pagination import Paginator
+
+        return Paginator(self, endpoint, item_key=item_key, params=params, per_page=per_page, prefetch=prefetch,
+                         record=record, keep_extra=keep_extra)
+
+    def _build_url(self, endpoint: str) -> str:
+        """
+        Resolve an endpoint relative to the repository, passing absolute URLs through unchanged.
+        """
+        if endpoint.startswith(("http://", "https://")):
+            return endpoint
+        return f"{self.base_url}/{self.repo}/{endpoint}"
+
+    def _make_request(self, method: str, endpoint: str, payload: Optional[Dict] = None,
+                      params: Optional[Dict] = None, headers: Optional[Dict[str, str]] = None,
+                      stream: bool = False, idempotent: Optional[bool] = None) -> "Response":
         """
         Helper method to make requests to the GitHub API.
         Raises an exception for HTTP errors and returns the JSON response.
+        GET responses are revalidated against the response cache when one is configured.
+        Extra headers are sent on top of the client's headers; streamed responses are never cached.
+        Transient failures are retried for idempotent methods; pass idempotent=True for POSTs that are safe
+        to send twice.
+        Identical GET requests made concurrently share one call when coalescing is enabled; each gets
+        its own copy of the response.
         """
-        url = f"{self.base_url}/{self.repo}/{endpoint}"
+        url = self._build_url(endpoint)
+        headers = dict(self.headers, **headers) if headers else self.headers
+        if self.singleflight is not None and method == "GET" and not stream and payload is None:
+            return self._coalesced_request(method, url, headers, params, idempotent)
+        return self._request(method, url, headers, payload, params, stream, idempotent)
+
+    def _coalesced_request(self, method: str, url: str, headers: Dict[str, str], params: Optional[Dict],
+                           idempotent: Optional[bool]) -> "Response":
+        led = []
+
+        def lead() -> "Response":
+            led.append(True)
+            return self._request(method, url, headers, None, params, False, idempotent)
+
+        started = time.perf_counter()
+        try:
+            response, _ = self.singleflight.do(request_key(method, url, params, headers), lead)
+        except Exception as error:
+            if self.hooks and not led:
+                self._emit_coalesced(method, url, started, error=error)
+            raise
+        # Every caller gets its own copy, so changes one makes to the response or its decoded
+        # JSON are not seen by the others.
+        response = copy_response(response)
+        if self.hooks and not led:
+            self._emit_coalesced(method, url, started, response=response)
+        return response
+
+    def _emit_coalesced(self, method: str, url: str, started: float, response: Optional["Response"] = None,
+                        error: Optional[Exception] = None):
+        # The leader's hooks saw the request itself; this caller only waited for it.
+        from ghmate.instrumentation import RequestEvent, emit, endpoint_template
+
+        event = RequestEvent(method, url, endpoint_template(url, self.api_url), resource_for_url(url))
+        event.coalesced = True
+        event.elapsed = time.perf_counter() - started
+        if error is not None:
+            event.error = str(error)
+            emit(self.hooks, "on_error", event)
+            return
+        event.record_response(response)
+        event.bytes_received = 0
+        emit(self.hooks, "after_response", event)
+
+    def _request(self, method: str, url: str, headers: Dict[str, str], payload: Optional[Dict],
+                 params: Optional[Dict], stream: bool, idempotent: Optional[bool]) -> "Response":
+        cache_key = None
+        cached = None
+
+        if self.response_cache is not None and method == "GET" and not stream:
+            from ghmate.response_cache import ResponseCache
+
+            cache_key = ResponseCache.make_key(url, params, headers)
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                headers = dict(headers)
+                if cached.etag:
+                    headers["If-None-Match"] = cached.etag
+                if cached.last_modified:
+                    headers["If-Modified-Since"] = cached.last_modified
+
+        event = None
+        if self.hooks:
+            from ghmate.instrumentation import RequestEvent, emit, endpoint_template
+
+            event = RequestEvent(method, url, endpoint_template(url, self.api_url), resource_for_url(url))
+            emit(self.hooks, "before_send", event)
+        started = time.perf_counter()
+
         try:
-            response = requests.request(method, url, headers=self.headers, json=payload)
-            return response
-        except requests.exceptions.RequestException as error:
-            logging.error(f"Request to {url} failed: {error}")
-            raise Exception(f"Request failed: {str(error)}")
+            response = self._send(method, url, headers=headers, payload=payload, params=params, stream=stream,
+                                  event=event, idempotent=idempotent)
+        except Exception as error:
+            if event is not None:
+                event.elapsed = time.perf_counter() - started
+                event.error = str(error)
+                emit(self.hooks, "on_error", event)
+            raise
+
+        if event is not None:
+            event.elapsed = time.perf_counter() - started
+            event.record_response(response)
+
+        if cache_key is not None:
+            if response.status_code == 304 and cached is not None:
+                self.response_cache.record(hit=True)
+                response = cached.to_response(response.url, revalidation=response)
+            else:
+                self.response_cache.record(hit=False)
+                if response.status_code == 200 and (response.headers.get("ETag") or
+                                                    response.headers.get("Last-Modified")):
+                    from ghmate.response_cache import CacheEntry
+
+                    self.response_cache.put(cache_key, CacheEntry.from_response(response))
+
+        if event is not None:
+            from ghmate.instrumentation import HIT, MISS
+
+            if cache_key is not None:
+                event.cache = HIT if getattr(response, "from_cache", False) else MISS
+            emit(self.hooks, "after_response", event)
+        return response
+
+    def _send(self, method: str, url: str, headers: Dict[str, str], payload: Optional[Dict] = None,
+              params: Optional[Dict] = None, stream: bool = False, event: Optional["RequestEvent"] = None,
+              idempotent: Optional[bool] = None) -> "Response":
+        """
+        Send a request through the transport, waiting for rate-limit quota first and retrying
+        after rate-limit responses, and after transient failures as the retry policy allows.
+        Attempts and waiting time are recorded on the event.
+        """
+        resource = resource_for_url(url)
+        rate_limited = 0
+        attempt = 0
+        while True:
+            attempt += 1
+            self.circuit_breaker.before_request()
+            try:
+                waited = self.rate_limiter.acquire(self.token, resource)
+                if event is not None:
+                    event.rate_limit_wait += waited
+                    event.attempts += 1
+                    if payload is not None:
+                        # Encoded as the transports do; their responses do not all carry the request.
+                        event.bytes_sent = len(json.dumps(payload).encode("utf-8"))
+                response = self.transport.request(method, url, headers=headers, json=payload, params=params,
+                                                  stream=stream)
+            except BaseException as error:
+                if not is_transport_error(error):
+                    # Nothing was learnt about the host; give back a half-open probe slot, or the
+                    # breaker shared by every client of the host would stay half-open for good.
+                    self.circuit_breaker.release()
+                    raise
+                self.circuit_breaker.record_failure()
+                kind, sent = classify_error(error)
+                if self.retry_policy.should_retry(method, attempt, kind, sent=sent, idempotent=idempotent):
+                    delay = self.retry_policy.backoff(attempt)
+                    logging.warning(f"Request to {url} failed: {error}; retrying in {delay:.1f}s (attempt {attempt})")
+                    time.sleep(delay)
+                    continue
+                logging.error(f"Request to {url} failed: {error}")
+                raise Exception(f"Request failed: {str(error)}")
+
+            self.rate_limiter.update(self.token, resource, response.headers)
+            if self.retry_policy.is_retryable_status(response.status_code):
+                self.circuit_breaker.record_failure()
+                if not self.retry_policy.should_retry(method, attempt, SERVER_ERROR, idempotent=idempotent):
+                    return response
+                delay = self.retry_policy.backoff(attempt, response.headers.get("Retry-After"))
+                response.close()
+                logging.warning(f"{url} returned {response.status_code}; retrying in {delay:.1f}s (attempt {attempt})")
+                time.sleep(delay)
+                continue
+
+            delay = self.rate_limiter.retry_delay(self.token, resource, response)
+            if delay is None:
+                self.circuit_breaker.record_success()
+                self.rate_limiter.reset_backoff(self.token, resource)
+                return response
+            self.circuit_breaker.release()
+            if rate_limited >= self.rate_limiter.max_retries:
+                return response
+
+            response.close()
+            rate_limited += 1
+            logging.warning(f"Rate limited on {url}; retrying in {delay:.0f}s (attempt {rate_limited})")
+            self.rate_limiter.pause(self.token, resource, delay)
@@ -0,0 +1,279 @@
+import math
+from typing import Optional, Any, Dict, Iterable, List, Tuple
+
+from ghmate.records import loads
+
+ISSUES = "issues"
+PULLS = "pulls"
+RELEASES = "releases"
+
+# GitHub rejects queries that could return more than 500,000 nodes; stay well below it.
+MAX_NODES = 100000
+MAX_ALIASES = 50
+PAGE_SIZE = 100
+LABELS_PAGE_SIZE = 20
+
+_STATES = {
+    ISSUES: {"open": "[OPEN]", "closed": "[CLOSED]", "all": "[OPEN, CLOSED]"},
+    PULLS: {"open": "[OPEN]", "closed": "[CLOSED, MERGED]", "all": "[OPEN, CLOSED, MERGED]"},
+}
+
+_CONNECTIONS = {ISSUES: "issues", PULLS: "pullRequests", RELEASES: "releases"}
+
+_FIELDS = {
+    ISSUES: f"""
+        databaseId number title body state url createdAt updatedAt closedAt
+        author {{ login }}
+        labels(first: {LABELS_PAGE_SIZE}) {{ nodes {{ name color }} }}
+        comments {{ totalCount }}
+    """,
+    PULLS: f"""
+        databaseId number title body state url createdAt updatedAt closedAt mergedAt isDraft
+        headRefName baseRefName
+        author {{ login }}
+        labels(first: {LABELS_PAGE_SIZE}) {{ nodes {{ name color }} }}
+    """,
+    RELEASES: """
+        databaseId tagName name description url createdAt publishedAt isDraft isPrerelease
+        tagCommit { oid }
+        author { login }
+    """,
+}
+
+# Nested connections requested for every node, used to estimate the node count of a query.
+_NESTED_PAGE_SIZE = {ISSUES: LABELS_PAGE_SIZE, PULLS: LABELS_PAGE_SIZE, RELEASES: 0}
+
+
+def _user(author: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    return {"login": author["login"]} if author else None
+
+
+def _labels(node: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"name": label["name"], "color": label["color"]} for label in node["labels"]["nodes"]]
+
+
+def _to_rest(resource: str, node: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a GraphQL node into the subset of the REST representation that both APIs provide.
+    """
+    if resource == ISSUES:
+        return {
+            "id": node["databaseId"],
+            "number": node["number"],
+            "title": node["title"],
+            "body": node["body"],
+            "state": node["state"].lower(),
+            "html_url": node["url"],
+            "user": _user(node["author"]),
+            "labels": _labels(node),
+            "comments": node["comments"]["totalCount"],
+            "created_at": node["createdAt"],
+            "updated_at": node["updatedAt"],
+            "closed_at": node["closedAt"],
+        }
+    if resource == PULLS:
+        return {
+            "id": node["databaseId"],
+            "number": node["number"],
+            "title": node["title"],
+            "body": node["body"],
+            "state": "open" if node["state"] == "OPEN" else "closed",
+            "html_url": node["url"],
+            "user": _user(node["author"]),
+            "labels": _labels(node),
+            "draft": node["isDraft"],
+            "head": {"ref": node["headRefName"]},
+            "base": {"ref": node["baseRefName"]},
+            "created_at": node["createdAt"],
+            "updated_at": node["updatedAt"],
+            "closed_at": node["closedAt"],
+            "merged_at": node["mergedAt"],
+        }
+    return {
+        "id": node["databaseId"],
+        "tag_name": node["tagName"],
+        "target_commitish": node["tagCommit"]["oid"] if node["tagCommit"] else None,
+        "name": node["name"],
+        "body": node["description"],
+        "html_url": node["url"],
+        "author": _user(node["author"]),
+        "draft": node["isDraft"],
+        "prerelease": node["isPrerelease"],
+        "created_at": node["createdAt"],
+        "published_at": node["publishedAt"],
+    }
+
+
+class _Work:
+    __slots__ = ("owner", "repo", "resource", "cursor", "remaining")
+
+    def __init__(self, owner: str, repo: str, resource: str, cursor: Optional[str], remaining: Optional[int]):
+        self.owner = owner
+        self.repo = repo
+        self.resource = resource
+        self.cursor = cursor
+        self.remaining = remaining
+
+    @property
+    def page_size(self) -> int:
+        return PAGE_SIZE if self.remaining is None else min(PAGE_SIZE, self.remaining)
+
+
+class GraphQLBatcher:
+    """
+    Reads issues, pull requests and releases of many repositories through aliased GraphQL queries.
+
+    Every (repository, resource) pair becomes one alias; pairs are packed into queries until the
+    estimated node count or alias count reaches its limit, and pairs with more pages are carried
+    into later queries with their cursors. Items are returned in the same shape as the REST list
+    endpoints (the fields both APIs share), newest first. Unlike the REST issues endpoint, the
+    issues listing does not include pull requests.
+
+    Args:
+    - client (GitHubClient): Client whose token, transport and rate-limit scheduler are used.
+    - max_nodes (int): Maximum estimated number of nodes per query.
+    - max_aliases (int): Maximum number of repository/resource pairs per query.
+
+    Usage:
+    batcher = GraphQLBatcher(core_commands)
+    results = batcher.fetch([("my-org", "api"), ("my-org", "web")], resources=("issues", "releases"))
+    open_issues = results[("my-org", "api")]["issues"]
+    """
+
+    def __init__(self, client: Any, max_nodes: int = MAX_NODES, max_aliases: int = MAX_ALIASES):
+        self.client = client
+        self.max_nodes = max_nodes
+        self.max_aliases = max_aliases
+        self.queries_sent = 0
+
+    @staticmethod
+    def estimate(work: Iterable[_Work]) -> Tuple[int, int]:
+        """
+        Estimate the node count and the rate-limit cost in points of a query over the given work.
+        """
+        nodes = 0
+        requests = 0
+        for item in work:
+            size = item.page_size
+            nested = _NESTED_PAGE_SIZE[item.resource]
+            nodes += size + size * nested
+            requests += 1 + (size if nested else 0)
+        return nodes, max(1, math.ceil(requests / 100))
+
+    def fetch(self, repos: Iterable[Tuple[str, str]], resources: Iterable[str] = (ISSUES, PULLS, RELEASES),
+              state: str = "open", limit: Optional[int] = None) -> Dict[Tuple[str, str], Dict[str, List[dict]]]:
+        """
+        Read the given resources of every repository.
+        Args:
+        - repos (iterable of (owner, repo)): The repositories to read.
+        - resources (iterable of str): Any of "issues", "pulls" and "releases".
+        - state (str): "open", "closed" or "all"; applies to issues and pull requests.
+        - limit (int, optional): Maximum number of items read per repository and resource.
+        Returns:
+        - dict: Maps (owner, repo) to a dict of resource name to the list of items.
+        """
+        resources = list(resources)
+        for resource in resources:
+            if resource not in _CONNECTIONS:
+                raise ValueError(f"Unsupported resource: {resource}")
+        if state not in ("open", "closed", "all"):
+            raise ValueError(f"Unsupported state: {state}")
+
+        results: Dict[Tuple[str, str], Dict[str, List[dict]]] = {}
+        pending: List[_Work] = []
+        for owner, repo in repos:
+            results[(owner, repo)] = {resource: [] for resource in resources}
+            pending.extend(_Work(owner, repo, resource, None, limit) for resource in resources)
+
+        while pending:
+            batch = self._take_batch(pending)
+            pending = pending[len(batch):] + self._run(batch, state, results)
+        return results
+
+    def list_resource(self, owner: str, repo: str, resource: str, state: str = "open",
+                      limit: Optional[int] = None) -> List[dict]:
+        """
+        Read one resource of one repository.
+        """
+        return self.fetch([(owner, repo)], resources=(resource,), state=state, limit=limit)[(owner, repo)][resource]
+
+    def _take_batch(self, pending: List[_Work]) -> List[_Work]:
+        batch: List[_Work] = []
+        for item in pending:
+            if len(batch) >= self.max_aliases:
+                break
+            if batch and self.estimate(batch + [item])[0] > self.max_nodes:
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self, batch: List[_Work], state: str,
+             results: Dict[Tuple[str, str], Dict[str, List[dict]]]) -> List[_Work]:
+        """
+        Send one query for the batch, store its items and return the work left for later queries.
+        """
+        query, variables = self._build_query(batch, state)
+        response = self.client._make_request(
+            method="POST",
+            endpoint=f"{self.client.api_url}/graphql",
+            payload={"query": query, "variables": variables},
+        )
+        self.queries_sent += 1
+
+        try:
+            data = loads(response.content)
+        except ValueError:
+            data = {}
+        errors = data.get("errors") or []
+        if response.status_code in (502, 504) or any(_is_limit_error(error) for error in errors):
+            if len(batch) > 1:
+                # The query was too heavy for GitHub; send the same work again in smaller queries.
+                self.max_aliases = max(1, len(batch) // 2)
+                return batch
+        if response.status_code != 200 or not data.get("data"):
+            message = errors[0].get("message") if errors else f"HTTP Status Code: {response.status_code}"
+            raise Exception(f"GraphQL query failed: {message}")
+
+        follow_up = []
+        for index, item in enumerate(batch):
+            repository = data["data"].get(f"r{index}")
+            if repository is None:
+                raise Exception(f"GraphQL query failed: repository {item.owner}/{item.repo} not found")
+            connection = repository[_CONNECTIONS[item.resource]]
+            items = [_to_rest(item.resource, node) for node in connection["nodes"] if node]
+            results[(item.owner, item.repo)][item.resource].extend(items)
+
+            remaining = None if item.remaining is None else item.remaining - len(items)
+            if connection["pageInfo"]["hasNextPage"] and (remaining is None or remaining > 0):
+                follow_up.append(_Work(item.owner, item.repo, item.resource,
+                                       connection["pageInfo"]["endCursor"], remaining))
+        return follow_up
+
+    @staticmethod
+    def _build_query(batch: List[_Work], state: str) -> Tuple[str, Dict[str, Any]]:
+        declarations = []
+        selections = []
+        variables: Dict[str, Any] = {}
+        for index, item in enumerate(batch):
+            declarations.append(f"$o{index}: String!, $n{index}: String!, $c{index}: String")
+            variables.update({f"o{index}": item.owner, f"n{index}": item.repo, f"c{index}": item.cursor})
+
+            arguments = [f"first: {item.page_size}", f"after: $c{index}",
+                         "orderBy: {field: CREATED_AT, direction: DESC}"]
+            if item.resource in _STATES:
+                arguments.append(f"states: {_STATES[item.resource][state]}")
+
+            selections.append(
+                f"r{index}: repository(owner: $o{index}, name: $n{index}) {{\n"
+                f"  {_CONNECTIONS[item.resource]}({', '.join(arguments)}) {{\n"
+                f"    pageInfo {{ hasNextPage endCursor }}\n"
+                f"    nodes {{ {_FIELDS[item.resource]} }}\n"
+                f"  }}\n"
+                f"}}"
+            )
+        query = f"query({', '.join(declarations)}) {{\n" + "\n".join(selections) + "\n}"
+        return query, variables
+
+
+def _is_limit_error(error: Dict[str, Any]) -> bool:
+    return error.get("type") in ("MAX_NODE_LIMIT_EXCEEDED", "RESOURCE_LIMITS_EXCEEDED")
@@ -0,0 +1,361 @@
+import bisect
+import json
+import logging
+import re
+import threading
+import time
+from typing import Optional, Any, Dict, IO, Iterable, List, Tuple, Union
+
+HIT = "hit"
+MISS = "miss"
+
+# Upper bounds in seconds of the latency histogram buckets, as in the Prometheus client defaults.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+_TEMPLATE_RULES = [
+    (re.compile(r"^/repos/[^/]+/[^/]+"), "/repos/{owner}/{repo}"),
+    (re.compile(r"^/(orgs|users)/[^/]+"), r"/\1/{owner}"),
+    (re.compile(r"/(secrets|variables|environments|tags|branches|labels)/[^/]+"), r"/\1/{name}"),
+    (re.compile(r"/[0-9a-f]{40}(?=/|$)"), "/{sha}"),
+    (re.compile(r"/\d+(?=/|$)"), "/{id}"),
+]
+
+
+def endpoint_template(url: str, api_url: str = "") -> str:
+    """
+    Reduce a request URL to its endpoint template, e.g. "/repos/{owner}/{repo}/actions/runs/{id}",
+    so that metrics of requests to the same endpoint are aggregated together.
+    """
+    path = url.split("?", 1)[0]
+    if api_url and path.startswith(api_url):
+        path = path[len(api_url):]
+    elif "://" in path:
+        path = "/" + path.split("://", 1)[1].partition("/")[2]
+    for pattern, replacement in _TEMPLATE_RULES:
+        path = pattern.sub(replacement, path)
+    return path or "/"
+
+
+class RequestEvent:
+    """
+    Measurements of one API call, passed to the hooks of the client that made it.
+
+    before_send receives the event with the method, url, endpoint, resource and start time set;
+    the remaining fields are filled in before after_response or on_error is called. Rate-limit
+    retries are part of the same event: `attempts` counts the requests actually sent and
+    `rate_limit_wait` the seconds spent waiting for quota. A GET that joined an identical request
+    already in flight gets its own event with `coalesced` set and no attempts or bytes; only
+    after_response or on_error is called for it.
+    """
+
+    __slots__ = ("method", "url", "endpoint", "resource", "started", "elapsed", "status", "bytes_sent",
+                 "bytes_received", "cache", "rate_limit_remaining", "rate_limit_wait", "attempts", "coalesced",
+                 "error")
+
+    def __init__(self, method: str, url: str, endpoint: str, resource: str):
+        self.method = method
+        self.url = url
+        self.endpoint = endpoint
+        self.resource = resource
+        self.started = time.time()
+        self.elapsed = 0.0
+        self.status: Optional[int] = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.cache: Optional[str] = None
+        self.rate_limit_remaining: Optional[int] = None
+        self.rate_limit_wait = 0.0
+        self.attempts = 0
+        self.coalesced = False
+        self.error: Optional[str] = None
+
+    def record_response(self, response: Any):
+        """
+        Fill in the status, received size and rate-limit fields from a requests or AsyncResponse response.
+        """
+        self.status = response.status_code
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        if remaining is not None and remaining.isdigit():
+            self.rate_limit_remaining = int(remaining)
+
+        # Streamed bodies are not read yet, so fall back to the advertised length for them.
+        content = getattr(response, "_content", getattr(response, "content", None))
+        length = response.headers.get("Content-Length")
+        if isinstance(content, bytes):
+            self.bytes_received = len(content)
+        elif length is not None and length.isdigit():
+            self.bytes_received = int(length)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"RequestEvent({self.method} {self.endpoint}, status={self.status}, elapsed={self.elapsed:.3f})"
+
+
+class RequestHooks:
+    """
+    Base class for request instrumentation. Override any of the three methods and pass an
+    instance to a client with `hooks=[...]`. Hooks run on the thread that made the request,
+    so they should be quick; exceptions raised by a hook are logged and otherwise ignored.
+
+    Usage:
+    class SlowRequestLogger(RequestHooks):
+        def after_response(self, event):
+            if event.elapsed > 1:
+                print(event.method, event.endpoint, event.elapsed)
+    """
+
+    def before_send(self, event: RequestEvent):
+        pass
+
+    def after_response(self, event: RequestEvent):
+        pass
+
+    def on_error(self, event: RequestEvent):
+        pass
+
+
+def emit(hooks: Iterable[RequestHooks], name: str, event: RequestEvent):
+    for hook in hooks:
+        try:
+            getattr(hook, name)(event)
+        except Exception:
+            logging.exception(f"Request hook {hook!r} failed in {name}")
+
+
+class _EndpointStats:
+    __slots__ = ("buckets", "count", "total_seconds", "errors", "statuses", "bytes_sent", "bytes_received",
+                 "cache_hits", "cache_misses", "attempts", "coalesced", "rate_limit_wait")
+
+    def __init__(self, bucket_count: int):
+        self.buckets = [0] * (bucket_count + 1)
+        self.count = 0
+        self.total_seconds = 0.0
+        self.errors = 0
+        self.statuses: Dict[int, int] = {}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.attempts = 0
+        self.coalesced = 0
+        self.rate_limit_wait = 0.0
+
+
+class MetricsCollector(RequestHooks):
+    """
+    Aggregates request events per (method, endpoint template) into latency histograms and
+    counters for status codes, errors, bytes, cache hits and misses, retries and time spent
+    waiting for rate-limit quota. It also tracks the last remaining quota seen per resource.
+    The aggregates can be exposed in the Prometheus text format or written as JSON lines.
+
+    Args:
+    - buckets (tuple of float): Upper bounds in seconds of the latency histogram buckets.
+    - namespace (str): Prefix of the Prometheus metric names.
+
+    Usage:
+    metrics = MetricsCollector()
+    actions = ActionsCommands(owner="owner", repo="repo", token="your_token", hooks=[metrics])
+    actions.get_all_workflow_runs()
+    print(metrics.to_prometheus())
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, namespace: str = "ghmate"):
+        self.bucket_bounds = tuple(sorted(buckets))
+        self.namespace = namespace
+        self.rate_limit_remaining: Dict[str, int] = {}
+        self._stats: Dict[Tuple[str, str], _EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def after_response(self, event: RequestEvent):
+        self._record(event)
+
+    def on_error(self, event: RequestEvent):
+        self._record(event)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self.rate_limit_remaining.clear()
+
+    def _record(self, event: RequestEvent):
+        bucket = bisect.bisect_left(self.bucket_bounds, event.elapsed)
+        with self._lock:
+            stats = self._stats.get((event.method, event.endpoint))
+            if stats is None:
+                stats = _EndpointStats(len(self.bucket_bounds))
+                self._stats[(event.method, event.endpoint)] = stats
+            stats.buckets[bucket] += 1
+            stats.count += 1
+            stats.total_seconds += event.elapsed
+            stats.bytes_sent += event.bytes_sent
+            stats.bytes_received += event.bytes_received
+            stats.attempts += event.attempts
+            if event.coalesced:
+                stats.coalesced += 1
+            stats.rate_limit_wait += event.rate_limit_wait
+            if event.error is not None:
+                stats.errors += 1
+            if event.status is not None:
+                stats.statuses[event.status] = stats.statuses.get(event.status, 0) + 1
+            if event.cache == HIT:
+                stats.cache_hits += 1
+            elif event.cache == MISS:
+                stats.cache_misses += 1
+            if event.rate_limit_remaining is not None:
+                self.rate_limit_remaining[event.resource] = event.rate_limit_remaining
+
+    def quantile(self, method: str, endpoint: str, fraction: float) -> Optional[float]:
+        """
+        Estimate a latency quantile of an endpoint from its histogram, interpolating inside the bucket.
+        """
+        with self._lock:
+            stats = self._stats.get((method, endpoint))
+            if stats is None or not stats.count:
+                return None
+            return self._quantile(stats, fraction)
+
+    def _quantile(self, stats: _EndpointStats, fraction: float) -> float:
+        rank = fraction * stats.count
+        seen = 0
+        for index, count in enumerate(stats.buckets):
+            if count and seen + count >= rank:
+                lower = self.bucket_bounds[index - 1] if index else 0.0
+                if index == len(self.bucket_bounds):
+                    return lower
+                return lower + (self.bucket_bounds[index] - lower) * (rank - seen) / count
+            seen += count
+        return self.bucket_bounds[-1]
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """
+        Return one summary dict per (method, endpoint), slowest total time first.
+        """
+        now = time.time()
+        with self._lock:
+            rows = []
+            for (method, endpoint), stats in self._stats.items():
+                rows.append({
+                    "time": now,
+                    "method": method,
+                    "endpoint": endpoint,
+                    "count": stats.count,
+                    "errors": stats.errors,
+                    "statuses": {str(status): count for status, count in sorted(stats.statuses.items())},
+                    "total_seconds": round(stats.total_seconds, 6),
+                    "mean_seconds": round(stats.total_seconds / stats.count, 6),
+                    "p50_seconds": round(self._quantile(stats, 0.50), 6),
+                    "p99_seconds": round(self._quantile(stats, 0.99), 6),
+                    "bytes_sent": stats.bytes_sent,
+                    "bytes_received": stats.bytes_received,
+                    "cache_hits": stats.cache_hits,
+                    "cache_misses": stats.cache_misses,
+                    "attempts": stats.attempts,
+                    "coalesced": stats.coalesced,
+                    "rate_limit_wait_seconds": round(stats.rate_limit_wait, 6),
+                })
+        rows.sort(key=lambda row: row["total_seconds"], reverse=True)
+        return rows
+
+    def write_jsonl(self, target: Union[str, IO[str]]):
+        """
+        Append the current snapshot to a file path or text stream, one JSON object per endpoint.
+        """
+        lines = "".join(json.dumps(row, sort_keys=True) + "\n" for row in self.snapshot())
+        if isinstance(target, str):
+            with open(target, "a", encoding="utf-8") as output:
+                output.write(lines)
+        else:
+            target.write(lines)
+
+    def to_prometheus(self) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+        """
+        name = self.namespace
+        lines = [
+            f"# HELP {name}_request_duration_seconds Latency of GitHub API calls, including rate-limit retries.",
+            f"# TYPE {name}_request_duration_seconds histogram",
+        ]
+        with self._lock:
+            items = sorted(self._stats.items())
+            remaining = sorted(self.rate_limit_remaining.items())
+            for (method, endpoint), stats in items:
+                labels = f'method="{method}",endpoint="{_escape(endpoint)}"'
+                cumulative = 0
+                for bound, count in zip(self.bucket_bounds, stats.buckets):
+                    cumulative += count
+                    lines.append(f'{name}_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_request_duration_seconds_bucket{{{labels},le="+Inf"}} {stats.count}')
+                lines.append(f"{name}_request_duration_seconds_sum{{{labels}}} {stats.total_seconds}")
+                lines.append(f"{name}_request_duration_seconds_count{{{labels}}} {stats.count}")
+
+            counters = [
+                ("requests_total", "GitHub API responses by status code.", "counter"),
+                ("request_errors_total", "GitHub API calls that failed without a response.", "counter"),
+                ("request_bytes_sent_total", "Request body bytes sent.", "counter"),
+                ("request_bytes_received_total", "Response body bytes received.", "counter"),
+                ("cache_requests_total", "Conditional GET requests by cache result.", "counter"),
+                ("request_attempts_total", "Requests sent, including rate-limit retries.", "counter"),
+                ("coalesced_requests_total", "Calls answered by an identical request already in flight.", "counter"),
+                ("rate_limit_wait_seconds_total", "Seconds spent waiting for rate-limit quota.", "counter"),
+            ]
+            samples: Dict[str, List[str]] = {metric: [] for metric, _, _ in counters}
+            for (method, endpoint), stats in items:
+                labels = f'method="{method}",endpoint="{_escape(endpoint)}"'
+                for status, count in sorted(stats.statuses.items()):
+                    samples["requests_total"].append(f'{{{labels},status="{status}"}} {count}')
+                samples["request_errors_total"].append(f"{{{labels}}} {stats.errors}")
+                samples["request_bytes_sent_total"].append(f"{{{labels}}} {stats.bytes_sent}")
+                samples["request_bytes_received_total"].append(f"{{{labels}}} {stats.bytes_received}")
+                if stats.cache_hits or stats.cache_misses:
+                    samples["cache_requests_total"].append(f'{{{labels},result="hit"}} {stats.cache_hits}')
+                    samples["cache_requests_total"].append(f'{{{labels},result="miss"}} {stats.cache_misses}')
+                samples["request_attempts_total"].append(f"{{{labels}}} {stats.attempts}")
+                samples["coalesced_requests_total"].append(f"{{{labels}}} {stats.coalesced}")
+                samples["rate_limit_wait_seconds_total"].append(f"{{{labels}}} {stats.rate_limit_wait}")
+
+        for metric, help_text, kind in counters:
+            lines.append(f"# HELP {name}_{metric} {help_text}")
+            lines.append(f"# TYPE {name}_{metric} {kind}")
+            lines.extend(f"{name}_{metric}{sample}" for sample in samples[metric])
+
+        lines.append(f"# HELP {name}_rate_limit_remaining Last remaining rate-limit quota seen per resource.")
+        lines.append(f"# TYPE {name}_rate_limit_remaining gauge")
+        lines.extend(f'{name}_rate_limit_remaining{{resource="{resource}"}} {value}' for resource, value in remaining)
+        return "\n".join(lines) + "\n"
+
+
+class JSONLinesRecorder(RequestHooks):
+    """
+    Writes every finished request as one JSON line, for offline analysis of individual calls.
+
+    Args:
+    - target (str or text stream): File path appended to, or an open text stream.
+    """
+
+    def __init__(self, target: Union[str, IO[str]]):
+        self._owns_file = isinstance(target, str)
+        self._output = open(target, "a", encoding="utf-8") if self._owns_file else target
+        self._lock = threading.Lock()
+
+    def after_response(self, event: RequestEvent):
+        self._write(event)
+
+    def on_error(self, event: RequestEvent):
+        self._write(event)
+
+    def _write(self, event: RequestEvent):
+        line = json.dumps(event.to_dict(), sort_keys=True) + "\n"
+        with self._lock:
+            self._output.write(line)
+            self._output.flush()
+
+    def close(self):
+        if self._owns_file:
+            self._output.close()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
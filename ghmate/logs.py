@@ -0,0 +1,419 @@
+import hashlib
+import logging
+import mmap
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future, FIRST_COMPLETED, as_completed, wait
+from typing import Optional, Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+DOWNLOADED = "downloaded"
+CACHED = "cached"
+EXPIRED = "expired"
+FAILED = "failed"
+
+ZIP = "zip"
+TEXT = "txt"
+
+DEFAULT_CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(os.path.join("~", ".cache")),
+                                 "ghmate", "logs")
+
+# Bytes of a compressed log read per regex pass; matches spanning two chunks are found because
+# every chunk is cut after its last newline and the remainder carried over.
+SCAN_CHUNK = 4 * 1024 * 1024
+
+
+class LogCache:
+    """
+    Content-addressed store of downloaded log archives.
+
+    Archives are stored once under the sha256 of their content, and a small ref file maps each
+    log key (e.g. "run-123-1" for attempt 1 of run 123) to its archive, so logs shared by several
+    keys are kept once. Files are written to a temporary file and renamed into place, so a cache
+    is safe to share between threads and processes and never holds partial archives.
+
+    Args:
+    - directory (str): Directory of the cache, created on first use. Defaults to ~/.cache/ghmate/logs.
+
+    Usage:
+    cache = LogCache()
+    print(cache.get("run-123-1"))
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR):
+        self.directory = directory
+        self.objects = os.path.join(directory, "objects")
+        self.refs = os.path.join(directory, "refs")
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Path of the archive stored for a key, or None if the key is unknown.
+        """
+        try:
+            with open(self._ref_path(key), "r", encoding="utf-8") as ref_file:
+                digest, kind = ref_file.read().split()
+        except (OSError, ValueError):
+            return None
+        path = self._object_path(digest, kind)
+        return path if os.path.exists(path) else None
+
+    def put(self, key: str, chunks: Iterable[bytes], kind: str) -> str:
+        """
+        Store the archive streamed as chunks under a key and return its path.
+        """
+        os.makedirs(self.objects, exist_ok=True)
+        digest = hashlib.sha256()
+        descriptor, temporary = tempfile.mkstemp(dir=self.objects, suffix=".part")
+        try:
+            with os.fdopen(descriptor, "wb") as part_file:
+                for chunk in chunks:
+                    part_file.write(chunk)
+                    digest.update(chunk)
+            path = self._object_path(digest.hexdigest(), kind)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if os.path.exists(path):
+                os.remove(temporary)
+            else:
+                os.replace(temporary, path)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+
+        os.makedirs(self.refs, exist_ok=True)
+        ref_path = self._ref_path(key)
+        with open(ref_path + ".part", "w", encoding="utf-8") as ref_file:
+            ref_file.write(f"{digest.hexdigest()} {kind}")
+        os.replace(ref_path + ".part", ref_path)
+        return path
+
+    def keys(self) -> List[str]:
+        if not os.path.isdir(self.refs):
+            return []
+        return sorted(name for name in os.listdir(self.refs) if not name.endswith(".part"))
+
+    def size(self) -> int:
+        """
+        Bytes used by the stored archives.
+        """
+        total = 0
+        for root, _, files in os.walk(self.objects):
+            total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+        return total
+
+    def _ref_path(self, key: str) -> str:
+        return os.path.join(self.refs, key.replace("/", "_"))
+
+    def _object_path(self, digest: str, kind: str) -> str:
+        return os.path.join(self.objects, digest[:2], f"{digest[2:]}.{kind}")
+
+
+class LogFile:
+    """
+    Outcome of fetching the logs of one run or job.
+    """
+
+    __slots__ = ("key", "run_id", "job_id", "path", "kind", "status", "error")
+
+    def __init__(self, key: str, run_id: Optional[int] = None, job_id: Optional[int] = None, kind: str = ZIP):
+        self.key = key
+        self.run_id = run_id
+        self.job_id = job_id
+        self.path: Optional[str] = None
+        self.kind = kind
+        self.status = FAILED
+        self.error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status in (DOWNLOADED, CACHED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"LogFile(key={self.key!r}, status={self.status!r})"
+
+
+class LogMatch:
+    """
+    One line of a log matching a search.
+    """
+
+    __slots__ = ("key", "run_id", "job_id", "member", "line_number", "line")
+
+    def __init__(self, key: str, run_id: Optional[int], job_id: Optional[int], member: str,
+                 line_number: int, line: str):
+        self.key = key
+        self.run_id = run_id
+        self.job_id = job_id
+        self.member = member
+        self.line_number = line_number
+        self.line = line
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"LogMatch(key={self.key!r}, member={self.member!r}, line_number={self.line_number})"
+
+
+class LogDownloader:
+    """
+    Streams run and job logs into a LogCache.
+
+    GitHub answers log requests with a redirect to the archive, which is followed and streamed to
+    the cache in chunks. Logs of completed runs never change, so they are only downloaded once;
+    logs of runs still in progress are downloaded again on every request.
+
+    Args:
+    - client (ActionsCommands): Client of the repository.
+    - cache (LogCache): Where the archives are stored.
+    - workers (int): Number of logs downloaded at once.
+    - chunk_size (int): Bytes read from the network at a time.
+    """
+
+    def __init__(self, client: Any, cache: LogCache, workers: int = 8, chunk_size: int = 256 * 1024):
+        self.client = client
+        self.cache = cache
+        self.workers = workers
+        self.chunk_size = chunk_size
+
+    def fetch_run(self, run: Union[int, Any], refresh: bool = False) -> LogFile:
+        """
+        Fetch the log archive of a workflow run, given as an ID or as a run object.
+        Passing a run object pins its attempt and skips the cache while it has not completed.
+        """
+        if isinstance(run, int):
+            run_id, attempt, completed = run, None, True
+        else:
+            run_id, attempt, completed = run["id"], run.get("run_attempt"), run.get("status") == "completed"
+        if attempt:
+            key, endpoint = f"run-{run_id}-{attempt}", f"actions/runs/{run_id}/attempts/{attempt}/logs"
+        else:
+            key, endpoint = f"run-{run_id}", f"actions/runs/{run_id}/logs"
+        return self._fetch(LogFile(key, run_id=run_id, kind=ZIP), endpoint, refresh or not completed)
+
+    def fetch_job(self, job_id: int, refresh: bool = False) -> LogFile:
+        """
+        Fetch the plain-text log of a job.
+        """
+        log = LogFile(f"job-{job_id}", job_id=job_id, kind=TEXT)
+        return self._fetch(log, f"actions/jobs/{job_id}/logs", refresh)
+
+    def fetch_runs(self, runs: Iterable[Union[int, Any]], refresh: bool = False) -> Iterator[LogFile]:
+        """
+        Fetch the logs of many runs in parallel and yield them as they complete.
+        At most twice as many runs as there are workers are in flight, so `runs` is consumed lazily
+        and a long run listing is not paged through before the first log is yielded.
+        """
+        runs = iter(runs)
+        window = self.workers * 2
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ghmate-logs") as executor:
+            pending = set()
+            while True:
+                for run in runs:
+                    pending.add(executor.submit(self.fetch_run, run, refresh))
+                    if len(pending) >= window:
+                        break
+                if not pending:
+                    return
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+    def _fetch(self, log: LogFile, endpoint: str, refresh: bool) -> LogFile:
+        if not refresh:
+            log.path = self.cache.get(log.key)
+            if log.path is not None:
+                log.status = CACHED
+                return log
+
+        try:
+            response = self.client._make_request(method="GET", endpoint=endpoint, stream=True)
+        except Exception as error:
+            log.error = str(error)
+            return log
+        try:
+            if response.status_code in (404, 410):
+                log.status = EXPIRED
+            elif response.status_code != 200:
+                log.error = f"HTTP Status Code: {response.status_code}"
+            else:
+                log.path = self.cache.put(log.key, response.iter_content(chunk_size=self.chunk_size), log.kind)
+                log.status = DOWNLOADED
+        except Exception as error:
+            log.error = str(error)
+            logging.warning(f"Download of logs {log.key} failed: {error}")
+        finally:
+            response.close()
+        return log
+
+
+def scan_file(path: str, kind: str, pattern: str, flags: int = 0,
+              max_matches: int = 1000) -> List[Tuple[str, int, str]]:
+    """
+    Search a log archive for a regular expression without extracting it to disk.
+    Plain-text logs are memory-mapped and searched in place; the members of zip archives are
+    decompressed in chunks. Returns (member, line number, line) tuples, at most max_matches; the
+    member of a plain-text log is empty.
+
+    Run archives hold every job log twice: whole as "N_job.txt" and split into "job/N_step.txt".
+    Only the whole job logs are searched, and the step logs of jobs that have none.
+    """
+    regex = re.compile(pattern.encode("utf-8"), flags | re.MULTILINE)
+    matches: List[Tuple[str, int, str]] = []
+    if kind == TEXT:
+        if os.path.getsize(path) == 0:
+            return matches
+        with open(path, "rb") as log_file, mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            _scan_buffer(data, regex, "", 0, matches, max_matches)
+        return matches
+
+    import zipfile
+
+    with zipfile.ZipFile(path) as archive:
+        for member in _archive_members(archive):
+            if len(matches) >= max_matches:
+                break
+            with archive.open(member) as stream:
+                _scan_stream(stream, regex, member.filename, matches, max_matches)
+    return matches
+
+
+def _archive_members(archive: Any) -> List[Any]:
+    members = [member for member in archive.infolist() if not member.is_dir()]
+    jobs = {member.filename[:-4].partition("_")[2] for member in members
+            if "/" not in member.filename and member.filename.endswith(".txt")}
+    return [member for member in members if "/" not in member.filename or member.filename.split("/", 1)[0] not in jobs]
+
+
+def _scan_stream(stream: Any, regex: "re.Pattern", member: str, matches: List[Tuple[str, int, str]],
+                 max_matches: int):
+    line_offset = 0
+    carry = b""
+    while len(matches) < max_matches:
+        chunk = stream.read(SCAN_CHUNK)
+        if not chunk:
+            if carry:
+                _scan_buffer(carry, regex, member, line_offset, matches, max_matches)
+            return
+        data = carry + chunk
+        cut = data.rfind(b"\n") + 1
+        if cut == 0:
+            carry = data
+            continue
+        line_offset = _scan_buffer(data[:cut], regex, member, line_offset, matches, max_matches)
+        carry = data[cut:]
+
+
+def _scan_buffer(data: Any, regex: "re.Pattern", member: str, line_offset: int,
+                 matches: List[Tuple[str, int, str]], max_matches: int) -> int:
+    """
+    Append the lines of data matching the regex and return the line number after its last line.
+    Lines are only counted up to each match, so buffers without matches cost a single regex pass.
+    """
+    position = 0
+    line_number = line_offset
+    last_line = -1
+    for match in regex.finditer(data):
+        line_number += _count_lines(data, position, match.start())
+        position = match.start()
+        if line_number == last_line:
+            continue
+        last_line = line_number
+        start = data.rfind(b"\n", 0, position) + 1
+        end = data.find(b"\n", position)
+        line = bytes(data[start:end if end != -1 else len(data)]).rstrip(b"\r")
+        matches.append((member, line_number + 1, line.decode("utf-8", "replace")))
+        if len(matches) >= max_matches:
+            break
+    return line_number + _count_lines(data, position, len(data))
+
+
+def _count_lines(data: Any, start: int, end: int) -> int:
+    # mmap has no count(); slicing copies only the bytes between two matches.
+    if isinstance(data, bytes):
+        return data.count(b"\n", start, end)
+    return data[start:end].count(b"\n")
+
+
+class LogSearch:
+    """
+    Downloads the logs of many runs and searches them in parallel.
+
+    Downloads run on a thread pool; every archive is handed to a pool of worker processes as soon
+    as it is in the cache, so searching overlaps with downloading and uses every core. Matches are
+    yielded as each archive is searched.
+
+    Args:
+    - client (ActionsCommands): Client of the repository.
+    - cache (LogCache): Where the archives are stored and reused from.
+    - download_workers (int): Number of logs downloaded at once.
+    - processes (int, optional): Number of search processes. Defaults to the number of CPUs; 0 searches in this process.
+    - max_matches (int): Maximum number of matches reported per archive.
+
+    Usage:
+    search = LogSearch(actions, LogCache(".ghmate-logs"))
+    for match in search.search(actions.iter_workflow_runs(status="failure"), r"Timeout|ECONNRESET", limit=500):
+        print(match.run_id, match.member, match.line_number, match.line)
+    """
+
+    def __init__(self, client: Any, cache: LogCache, download_workers: int = 8, processes: Optional[int] = None,
+                 max_matches: int = 1000):
+        self.downloader = LogDownloader(client, cache, workers=download_workers)
+        self.processes = (os.cpu_count() or 1) if processes is None else processes
+        self.max_matches = max_matches
+        self.failed: List[LogFile] = []
+
+    def search(self, runs: Iterable[Union[int, Any]], pattern: str, ignore_case: bool = False,
+               limit: Optional[int] = None) -> Iterator[LogMatch]:
+        """
+        Search the logs of runs for a regular expression.
+        Args:
+        - runs (iterable): Run IDs or run objects, e.g. from iter_workflow_runs.
+        - pattern (str): Regular expression matched against each line.
+        - ignore_case (bool): Match case-insensitively.
+        - limit (int, optional): Only search the first `limit` runs.
+        Returns:
+        - Iterator[LogMatch]: The matching lines, yielded as each archive is searched.
+        Logs that could not be fetched are collected in `failed`.
+        """
+        flags = re.IGNORECASE if ignore_case else 0
+        re.compile(pattern)
+        runs = _take(runs, limit)
+        if not self.processes:
+            for log in self.downloader.fetch_runs(runs):
+                yield from self._matches(log, scan_file(log.path, log.kind, pattern, flags, self.max_matches)
+                                         if log.ok else None)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.processes) as executor:
+            pending: Dict[Future, LogFile] = {}
+            for log in self.downloader.fetch_runs(runs):
+                if log.ok:
+                    pending[executor.submit(scan_file, log.path, log.kind, pattern, flags, self.max_matches)] = log
+                else:
+                    self.failed.append(log)
+                yield from self._drain(pending, wait=False)
+            yield from self._drain(pending, wait=True)
+
+    def _drain(self, pending: Dict[Future, LogFile], wait: bool) -> Iterator[LogMatch]:
+        done = as_completed(list(pending)) if wait else [future for future in pending if future.done()]
+        for future in done:
+            log = pending.pop(future)
+            yield from self._matches(log, future.result())
+
+    def _matches(self, log: LogFile, found: Optional[List[Tuple[str, int, str]]]) -> Iterator[LogMatch]:
+        if found is None:
+            self.failed.append(log)
+            return
+        for member, line_number, line in found:
+            yield LogMatch(log.key, log.run_id, log.job_id, member, line_number, line)
+
+
+def _take(items: Iterable[Any], limit: Optional[int]) -> Iterator[Any]:
+    for index, item in enumerate(items):
+        if limit is not None and index >= limit:
+            return
+        yield item
@@ -0,0 +1,398 @@
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional, Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+from ghmate.records import Issue, PullRequest, Release, WorkflowRun, dumps, loads
+
+ISSUES = "issues"
+PULLS = "pulls"
+WORKFLOW_RUNS = "workflow_runs"
+RELEASES = "releases"
+RESOURCES = (ISSUES, PULLS, WORKFLOW_RUNS, RELEASES)
+
+Timestamp = Union[str, datetime]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    repo TEXT NOT NULL, id INTEGER NOT NULL, number INTEGER, state TEXT, title TEXT, author TEXT,
+    is_pull_request INTEGER, created_at TEXT, updated_at TEXT, closed_at TEXT, data BLOB,
+    PRIMARY KEY (repo, id));
+CREATE INDEX IF NOT EXISTS issues_state ON issues (repo, state, updated_at);
+CREATE INDEX IF NOT EXISTS issues_created ON issues (repo, created_at);
+
+CREATE TABLE IF NOT EXISTS pulls (
+    repo TEXT NOT NULL, id INTEGER NOT NULL, number INTEGER, state TEXT, title TEXT, author TEXT,
+    draft INTEGER, head_branch TEXT, base_branch TEXT, created_at TEXT, updated_at TEXT, merged_at TEXT, data BLOB,
+    PRIMARY KEY (repo, id));
+CREATE INDEX IF NOT EXISTS pulls_state ON pulls (repo, state, updated_at);
+CREATE INDEX IF NOT EXISTS pulls_branch ON pulls (repo, head_branch);
+CREATE INDEX IF NOT EXISTS pulls_base ON pulls (repo, base_branch);
+CREATE INDEX IF NOT EXISTS pulls_created ON pulls (repo, created_at);
+
+CREATE TABLE IF NOT EXISTS labels (
+    repo TEXT NOT NULL, resource TEXT NOT NULL, item_id INTEGER NOT NULL, label TEXT NOT NULL,
+    PRIMARY KEY (repo, resource, item_id, label));
+CREATE INDEX IF NOT EXISTS labels_label ON labels (repo, resource, label);
+
+CREATE TABLE IF NOT EXISTS workflow_runs (
+    repo TEXT NOT NULL, id INTEGER NOT NULL, workflow_id INTEGER, name TEXT, event TEXT, status TEXT,
+    conclusion TEXT, head_branch TEXT, created_at TEXT, updated_at TEXT, data BLOB,
+    PRIMARY KEY (repo, id));
+CREATE INDEX IF NOT EXISTS workflow_runs_status ON workflow_runs (repo, status, created_at);
+CREATE INDEX IF NOT EXISTS workflow_runs_conclusion ON workflow_runs (repo, conclusion, created_at);
+CREATE INDEX IF NOT EXISTS workflow_runs_branch ON workflow_runs (repo, head_branch, created_at);
+CREATE INDEX IF NOT EXISTS workflow_runs_workflow ON workflow_runs (repo, workflow_id, created_at);
+CREATE INDEX IF NOT EXISTS workflow_runs_created ON workflow_runs (repo, created_at);
+
+CREATE TABLE IF NOT EXISTS releases (
+    repo TEXT NOT NULL, id INTEGER NOT NULL, tag_name TEXT, name TEXT, draft INTEGER, prerelease INTEGER,
+    created_at TEXT, published_at TEXT, data BLOB,
+    PRIMARY KEY (repo, id));
+CREATE INDEX IF NOT EXISTS releases_created ON releases (repo, created_at);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    repo TEXT NOT NULL, resource TEXT NOT NULL, high_water TEXT, synced_at REAL, items INTEGER,
+    PRIMARY KEY (repo, resource));
+"""
+
+
+def format_timestamp(value: Timestamp) -> str:
+    """
+    Normalize a datetime or ISO 8601 string to GitHub's "YYYY-MM-DDTHH:MM:SSZ" form, which sorts as text.
+    """
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+    return value
+
+
+def _login(user: Optional[Dict[str, Any]]) -> Optional[str]:
+    return user.get("login") if user else None
+
+
+class SyncResult:
+    """
+    Outcome of synchronizing one resource of one repository.
+    """
+
+    __slots__ = ("repo", "resource", "fetched", "high_water", "full", "elapsed")
+
+    def __init__(self, repo: str, resource: str, fetched: int, high_water: Optional[str], full: bool,
+                 elapsed: float):
+        self.repo = repo
+        self.resource = resource
+        self.fetched = fetched
+        self.high_water = high_water
+        self.full = full
+        self.elapsed = elapsed
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"SyncResult({self.repo} {self.resource}, fetched={self.fetched}, high_water={self.high_water!r})"
+
+
+class RepositoryMirror:
+    """
+    Local SQLite mirror of the issues, pull requests, workflow runs and releases of repositories.
+
+    `sync` copies what the list endpoints return into the database and remembers a high-water
+    mark per repository and resource, so later syncs only request what changed:
+
+    - issues are listed with `since` set to the last updated_at seen;
+    - pull requests are listed by most recently updated and the listing stops at the mark;
+    - workflow runs are listed with a `created` filter starting at the newest run seen, or at the
+    oldest run that had not completed yet, so runs that finished since the last sync are refreshed
+    (GitHub returns at most 1,000 runs for a filtered listing, so sync before more accumulate);
+    - releases are listed newest first and the listing stops at the newest release seen.
+
+    Queries filter on indexed columns and return the same records as the client listings
+    (Issue, PullRequest, WorkflowRun, Release), rebuilt from the stored JSON, without any request.
+    Deleted items are not detected by incremental syncs; pass full=True to rebuild a resource.
+
+    Args:
+    - path (str): Path of the SQLite database file.
+
+    Usage:
+    mirror = RepositoryMirror("ghmate-mirror.db")
+    mirror.sync(actions_commands)
+    failed = mirror.workflow_runs("owner/repo", conclusion="failure", branch="main")
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        self._connection.commit()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self) -> "RepositoryMirror":
+        return self
+
+    def __exit__(self, *exc_info: Any):
+        self.close()
+
+    # Synchronization
+
+    def sync(self, client: Any, resources: Iterable[str] = RESOURCES, full: bool = False) -> Dict[str, SyncResult]:
+        """
+        Bring the mirror of the client's repository up to date.
+        Args:
+        - client (GitHubClient): Client of the repository to mirror.
+        - resources (iterable of str): Any of "issues", "pulls", "workflow_runs" and "releases".
+        - full (bool): Ignore the high-water marks, drop the stored items and list everything again.
+        Returns:
+        - dict: Maps resource name to its SyncResult.
+        """
+        results = {}
+        for resource in resources:
+            if resource not in RESOURCES:
+                raise ValueError(f"Unsupported resource: {resource}")
+            results[resource] = self._sync_resource(client, resource, full)
+        return results
+
+    def high_water(self, repo: str, resource: str) -> Optional[str]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT high_water FROM sync_state WHERE repo = ? AND resource = ?", (repo, resource)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _sync_resource(self, client: Any, resource: str, full: bool) -> SyncResult:
+        repo = f"{client.owner}/{client.repo}"
+        started = time.monotonic()
+        if full:
+            self.remove(repo, resource)
+        mark = None if full else self.high_water(repo, resource)
+
+        fetched = 0
+        newest = mark
+        batch: List[Dict[str, Any]] = []
+        for item in self._listing(client, repo, resource, mark):
+            batch.append(item)
+            stamp = item["updated_at"] if resource in (ISSUES, PULLS) else item["created_at"]
+            if stamp and (newest is None or stamp > newest):
+                newest = stamp
+            if len(batch) >= 500:
+                fetched += self.upsert(repo, resource, batch)
+                batch = []
+        fetched += self.upsert(repo, resource, batch)
+
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?, ?)",
+                (repo, resource, newest, time.time(), self._count(repo, resource)),
+            )
+            self._connection.commit()
+
+        result = SyncResult(repo, resource, fetched, newest, mark is None, time.monotonic() - started)
+        logging.info(f"Synchronized {resource} of {repo}: {result.to_dict()}")
+        return result
+
+    def _listing(self, client: Any, repo: str, resource: str, mark: Optional[str]) -> Iterator[Dict[str, Any]]:
+        if resource == ISSUES:
+            params = {"state": "all", "sort": "updated", "direction": "asc"}
+            if mark:
+                params["since"] = mark
+            yield from client.paginate("issues", params=params)
+
+        elif resource == PULLS:
+            # No since parameter; read by most recently updated and stop at the mark.
+            params = {"state": "all", "sort": "updated", "direction": "desc"}
+            for pull in client.paginate("pulls", params=params, prefetch=1 if mark else 4):
+                if mark and pull["updated_at"] < mark:
+                    return
+                yield pull
+
+        elif resource == WORKFLOW_RUNS:
+            params = {}
+            start = self._runs_window_start(repo, mark)
+            if start:
+                params["created"] = f">={start}"
+            yield from client.paginate("actions/runs", item_key="workflow_runs", params=params)
+
+        else:
+            for release in client.paginate("releases", prefetch=1 if mark else 4):
+                if mark and release["created_at"] and release["created_at"] < mark:
+                    return
+                yield release
+
+    def _runs_window_start(self, repo: str, mark: Optional[str]) -> Optional[str]:
+        if mark is None:
+            return None
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT MIN(created_at) FROM workflow_runs WHERE repo = ? AND status != 'completed'", (repo,)
+            ).fetchone()
+        oldest_pending = row[0] if row else None
+        return min(mark, oldest_pending) if oldest_pending else mark
+
+    # Storage
+
+    def upsert(self, repo: str, resource: str, items: List[Dict[str, Any]]) -> int:
+        """
+        Insert or replace items of a resource, as returned by the REST API, in one transaction.
+        """
+        if not items:
+            return 0
+        rows = [self._row(repo, resource, item) for item in items]
+        placeholders = ", ".join("?" * len(rows[0]))
+        with self._lock:
+            self._connection.executemany(f"INSERT OR REPLACE INTO {resource} VALUES ({placeholders})", rows)
+            if resource in (ISSUES, PULLS):
+                ids = [(repo, resource, item["id"]) for item in items]
+                self._connection.executemany(
+                    "DELETE FROM labels WHERE repo = ? AND resource = ? AND item_id = ?", ids
+                )
+                self._connection.executemany(
+                    "INSERT OR IGNORE INTO labels VALUES (?, ?, ?, ?)",
+                    [(repo, resource, item["id"], label["name"])
+                     for item in items for label in item.get("labels") or []],
+                )
+            self._connection.commit()
+        return len(rows)
+
+    def apply(self, repo: str, resource: str, item: Dict[str, Any]) -> bool:
+        """
+        Store one item received out of band, e.g. from a webhook, unless the stored copy was updated
+        later. Returns whether the item was stored.
+        """
+        if resource not in RESOURCES:
+            raise ValueError(f"Unsupported resource: {resource}")
+        with self._lock:
+            if resource != RELEASES and item.get("updated_at"):
+                row = self._connection.execute(
+                    f"SELECT updated_at FROM {resource} WHERE repo = ? AND id = ?", (repo, item["id"])
+                ).fetchone()
+                if row is not None and row[0] and row[0] > item["updated_at"]:
+                    return False
+            self.upsert(repo, resource, [item])
+        return True
+
+    def remove(self, repo: str, resource: str, ids: Optional[Iterable[int]] = None):
+        """
+        Remove the given items of a resource, or all of them and the high-water mark if no ids are given.
+        """
+        if resource not in RESOURCES:
+            raise ValueError(f"Unsupported resource: {resource}")
+        with self._lock:
+            if ids is None:
+                self._connection.execute(f"DELETE FROM {resource} WHERE repo = ?", (repo,))
+                self._connection.execute("DELETE FROM labels WHERE repo = ? AND resource = ?", (repo, resource))
+                self._connection.execute(
+                    "DELETE FROM sync_state WHERE repo = ? AND resource = ?", (repo, resource)
+                )
+            else:
+                keys = [(repo, item_id) for item_id in ids]
+                self._connection.executemany(f"DELETE FROM {resource} WHERE repo = ? AND id = ?", keys)
+                self._connection.executemany(
+                    "DELETE FROM labels WHERE repo = ? AND resource = ? AND item_id = ?",
+                    [(repo, resource, item_id) for _, item_id in keys],
+                )
+            self._connection.commit()
+
+    def _count(self, repo: str, resource: str) -> int:
+        return self._connection.execute(f"SELECT COUNT(*) FROM {resource} WHERE repo = ?", (repo,)).fetchone()[0]
+
+    @staticmethod
+    def _row(repo: str, resource: str, item: Dict[str, Any]) -> Tuple[Any, ...]:
+        data = sqlite3.Binary(dumps(item))
+        if resource == ISSUES:
+            return (repo, item["id"], item.get("number"), item.get("state"), item.get("title"),
+                    _login(item.get("user")), int("pull_request" in item), item.get("created_at"),
+                    item.get("updated_at"), item.get("closed_at"), data)
+        if resource == PULLS:
+            return (repo, item["id"], item.get("number"), item.get("state"), item.get("title"),
+                    _login(item.get("user")), int(bool(item.get("draft"))), (item.get("head") or {}).get("ref"),
+                    (item.get("base") or {}).get("ref"), item.get("created_at"), item.get("updated_at"),
+                    item.get("merged_at"), data)
+        if resource == WORKFLOW_RUNS:
+            return (repo, item["id"], item.get("workflow_id"), item.get("name"), item.get("event"),
+                    item.get("status"), item.get("conclusion"), item.get("head_branch"), item.get("created_at"),
+                    item.get("updated_at"), data)
+        return (repo, item["id"], item.get("tag_name"), item.get("name"), int(bool(item.get("draft"))),
+                int(bool(item.get("prerelease"))), item.get("created_at"), item.get("published_at"), data)
+
+    # Queries
+
+    def issues(self, repo: str, state: Optional[str] = None, label: Optional[str] = None,
+               author: Optional[str] = None, since: Optional[Timestamp] = None, until: Optional[Timestamp] = None,
+               include_pull_requests: bool = False, limit: Optional[int] = None) -> List[Issue]:
+        """
+        Issues of a repository, most recently updated first.
+        `since` and `until` bound the updated_at timestamp.
+        """
+        conditions = {"state = ?": state, "author = ?": author}
+        if not include_pull_requests:
+            conditions["is_pull_request = ?"] = 0
+        return self._select(Issue, ISSUES, repo, conditions, label, "updated_at", since, until, limit)
+
+    def pulls(self, repo: str, state: Optional[str] = None, label: Optional[str] = None,
+              branch: Optional[str] = None, base: Optional[str] = None, author: Optional[str] = None,
+              since: Optional[Timestamp] = None, until: Optional[Timestamp] = None,
+              limit: Optional[int] = None) -> List[PullRequest]:
+        """
+        Pull requests of a repository, most recently updated first.
+        `branch` matches the head branch; `since` and `until` bound the updated_at timestamp.
+        """
+        conditions = {"state = ?": state, "head_branch = ?": branch, "base_branch = ?": base, "author = ?": author}
+        return self._select(PullRequest, PULLS, repo, conditions, label, "updated_at", since, until, limit)
+
+    def workflow_runs(self, repo: str, status: Optional[str] = None, conclusion: Optional[str] = None,
+                      branch: Optional[str] = None, workflow_id: Optional[int] = None, event: Optional[str] = None,
+                      since: Optional[Timestamp] = None, until: Optional[Timestamp] = None,
+                      limit: Optional[int] = None) -> List[WorkflowRun]:
+        """
+        Workflow runs of a repository, newest first. `since` and `until` bound the created_at timestamp.
+        """
+        conditions = {"status = ?": status, "conclusion = ?": conclusion, "head_branch = ?": branch,
+                      "workflow_id = ?": workflow_id, "event = ?": event}
+        return self._select(WorkflowRun, WORKFLOW_RUNS, repo, conditions, None, "created_at", since, until, limit)
+
+    def releases(self, repo: str, prerelease: Optional[bool] = None, draft: Optional[bool] = None,
+                 since: Optional[Timestamp] = None, until: Optional[Timestamp] = None,
+                 limit: Optional[int] = None) -> List[Release]:
+        """
+        Releases of a repository, newest first. `since` and `until` bound the created_at timestamp.
+        """
+        conditions = {"prerelease = ?": None if prerelease is None else int(prerelease),
+                      "draft = ?": None if draft is None else int(draft)}
+        return self._select(Release, RELEASES, repo, conditions, None, "created_at", since, until, limit)
+
+    def _select(self, record: type, table: str, repo: str, conditions: Dict[str, Any], label: Optional[str],
+                date_column: str, since: Optional[Timestamp], until: Optional[Timestamp],
+                limit: Optional[int]) -> list:
+        clauses = ["repo = ?"]
+        values: List[Any] = [repo]
+        for clause, value in conditions.items():
+            if value is not None:
+                clauses.append(clause)
+                values.append(value)
+        if since is not None:
+            clauses.append(f"{date_column} >= ?")
+            values.append(format_timestamp(since))
+        if until is not None:
+            clauses.append(f"{date_column} < ?")
+            values.append(format_timestamp(until))
+        if label is not None:
+            clauses.append("id IN (SELECT item_id FROM labels WHERE repo = ? AND resource = ? AND label = ?)")
+            values.extend((repo, table, label))
+
+        sql = f"SELECT data FROM {table} WHERE {' AND '.join(clauses)} ORDER BY {date_column} DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            values.append(limit)
+        with self._lock:
+            rows = self._connection.execute(sql, values).fetchall()
+        return [record.from_dict(loads(row[0])) for row in rows]
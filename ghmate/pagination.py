@@ -0,0 +1,145 @@
+import math
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import TYPE_CHECKING, Optional, Dict, Any, Iterator, List, Tuple, Deque
+from urllib.parse import urlsplit, parse_qs
+
+if TYPE_CHECKING:  # pragma: no cover
+    from requests import Response
+
+from ghmate.records import loads
+
+_LINK_PATTERN = re.compile(r'<([^>]+)>\s*;\s*rel="([^"]+)"')
+
+
+def parse_link_header(value: Optional[str]) -> Dict[str, str]:
+    """
+    Parse an RFC 8288 Link header into a mapping of rel to URL.
+    """
+    if not value:
+        return {}
+    return {rel: url for url, rel in _LINK_PATTERN.findall(value)}
+
+
+def page_number(url: str) -> Optional[int]:
+    """
+    Return the page query parameter of a pagination URL, if any.
+    """
+    pages = parse_qs(urlsplit(url).query).get("page")
+    if not pages:
+        return None
+    try:
+        return int(pages[0])
+    except ValueError:
+        return None
+
+
+class Paginator:
+    """
+    Lazy iterator over every item of a GitHub list endpoint.
+
+    Pages are requested with `per_page` items and followed through the `Link: rel="next"`
+    header. Once the last page is known, from `rel="last"` or `total_count`, the remaining
+    pages are fetched concurrently, at most `prefetch` pages ahead of the consumer, and their
+    items are still yielded in order. Only the pages inside that window are held in memory.
+
+    Args:
+    - client (GitHubClient): Client used to send the requests.
+    - endpoint (str): Repository-relative endpoint or absolute URL of the list endpoint.
+    - item_key (str, optional): Key of the item list for endpoints that wrap it in an object,
+    such as "workflow_runs". Endpoints returning a bare JSON array need no key.
+    - params (dict, optional): Extra query parameters sent with every page.
+    - per_page (int): Number of items requested per page. GitHub allows at most 100.
+    - prefetch (int): Number of pages fetched concurrently once the page count is known.
+    Set to 1 to follow the next links one page at a time.
+    - record (type, optional): Record class, such as WorkflowRun, the items are decoded into instead of dicts.
+    - keep_extra (bool): Keep the fields a record does not declare, as compact JSON. Ignored without a record.
+
+    Usage:
+    for run in client.paginate("actions/runs", item_key="workflow_runs", params={"status": "failure"}):
+        print(run["id"])
+    """
+
+    def __init__(self, client: Any, endpoint: str, item_key: Optional[str] = None,
+                 params: Optional[Dict[str, Any]] = None, per_page: int = 100, prefetch: int = 4,
+                 record: Optional[type] = None, keep_extra: bool = True):
+        self.client = client
+        self.endpoint = endpoint
+        self.item_key = item_key
+        self.params = dict(params or {})
+        self.per_page = per_page
+        self.prefetch = max(1, prefetch)
+        self.record = record
+        self.keep_extra = keep_extra
+        self.total_count: Optional[int] = None
+
+    def __iter__(self) -> Iterator[Any]:
+        params = dict(self.params, per_page=self.per_page)
+        response = self._get(self.endpoint, params)
+        items, self.total_count = self._decode(response)
+        yield from items
+
+        links = parse_link_header(response.headers.get("Link"))
+        if "next" not in links or not items:
+            return
+
+        last_page = page_number(links["last"]) if "last" in links else None
+        if last_page is None and self.total_count is not None:
+            last_page = math.ceil(self.total_count / self.per_page)
+
+        if last_page is not None and self.prefetch > 1:
+            yield from self._fetch_pages(range(2, last_page + 1), params)
+        else:
+            yield from self._follow(links["next"])
+
+    def _get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> "Response":
+        response = self.client._make_request(method="GET", endpoint=endpoint, params=params)
+        if response.status_code != 200:
+            raise Exception(f"Failed to list {self.endpoint}. HTTP Status Code: {response.status_code}")
+        return response
+
+    def _decode(self, response: "Response") -> Tuple[List[Any], Optional[int]]:
+        data = loads(response.content)
+        total_count = None
+        if self.item_key is not None:
+            data, total_count = data.get(self.item_key, []), data.get("total_count")
+        if self.record is not None:
+            data = [self.record.from_dict(item, keep_extra=self.keep_extra) for item in data]
+        return data, total_count
+
+    def _follow(self, url: Optional[str]) -> Iterator[Any]:
+        while url:
+            response = self._get(url)
+            items, _ = self._decode(response)
+            yield from items
+            url = parse_link_header(response.headers.get("Link")).get("next") if items else None
+
+    def _fetch_page(self, page: int, params: Dict[str, Any]) -> List[Any]:
+        response = self._get(self.endpoint, dict(params, page=page))
+        items, _ = self._decode(response)
+        return items
+
+    def _fetch_pages(self, pages: range, params: Dict[str, Any]) -> Iterator[Any]:
+        executor = ThreadPoolExecutor(max_workers=self.prefetch, thread_name_prefix="ghmate-page")
+        pending: Deque[Future] = deque()
+        remaining = iter(pages)
+        try:
+            for page in remaining:
+                pending.append(executor.submit(self._fetch_page, page, params))
+                if len(pending) >= self.prefetch:
+                    break
+
+            while pending:
+                items = pending.popleft().result()
+                if not items:
+                    # The listing shrank since the page count was taken; nothing more to read.
+                    return
+                page = next(remaining, None)
+                if page is not None:
+                    pending.append(executor.submit(self._fetch_page, page, params))
+                yield from items
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
@@ -0,0 +1,360 @@
+import hashlib
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Optional, Deque, Dict, Iterable, Tuple, Mapping
+
+if TYPE_CHECKING:  # pragma: no cover
+    from requests import Response
+
+CORE_RESOURCE = "core"
+SEARCH_RESOURCE = "search"
+CODE_SEARCH_RESOURCE = "code_search"
+GRAPHQL_RESOURCE = "graphql"
+
+# Secondary limits on requests that create content (issues, comments, releases, ...).
+CONTENT_PER_MINUTE = 80
+CONTENT_PER_HOUR = 500
+
+# GitHub asks clients to wait at least a minute after a secondary rate limit without Retry-After.
+SECONDARY_LIMIT_BACKOFF = 60.0
+MAX_BACKOFF = 900.0
+
+
+def resource_for_url(url: str) -> str:
+    """
+    Return the rate-limit resource bucket a request URL is counted against.
+    """
+    if url.rstrip("/").endswith("/graphql"):
+        return GRAPHQL_RESOURCE
+    if "/search/code" in url:
+        return CODE_SEARCH_RESOURCE
+    if "/search/" in url:
+        return SEARCH_RESOURCE
+    return CORE_RESOURCE
+
+
+def token_key(token: str) -> str:
+    """
+    Identify a token in the scheduler without keeping the secret itself as a key.
+    """
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+
+
+class RateLimitBudget:
+    """
+    Snapshot of the quota left in one resource bucket for one token.
+    """
+
+    __slots__ = ("resource", "limit", "remaining", "reset_at", "paused_until")
+
+    def __init__(self, resource: str, limit: Optional[int], remaining: Optional[int],
+                 reset_at: Optional[float], paused_until: float):
+        self.resource = resource
+        self.limit = limit
+        self.remaining = remaining
+        self.reset_at = reset_at
+        self.paused_until = paused_until
+
+    @property
+    def seconds_until_reset(self) -> Optional[float]:
+        if self.reset_at is None:
+            return None
+        return max(0.0, self.reset_at - time.time())
+
+    def __repr__(self) -> str:
+        return (f"RateLimitBudget(resource={self.resource!r}, limit={self.limit}, "
+                f"remaining={self.remaining}, reset_at={self.reset_at})")
+
+
+class _Bucket:
+    def __init__(self, burst: int):
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.tokens = float(burst)
+        self.refilled_at = time.time()
+        self.paused_until = 0.0
+        self.secondary_hits = 0
+
+    def delay(self, now: float, burst: int, reserve: int, pace_below: float) -> float:
+        """
+        Seconds to wait before the next request may be sent; zero if it may go now.
+        """
+        if self.paused_until > now:
+            return self.paused_until - now
+        if self.limit is None or self.remaining is None or self.reset_at is None:
+            return 0.0
+        if self.reset_at <= now:
+            # The window has rolled over; the next response will report the fresh quota.
+            return 0.0
+
+        available = self.remaining - reserve
+        if available <= 0:
+            return self.reset_at - now + 1.0
+        if self.remaining > self.limit * pace_below:
+            return 0.0
+
+        # Spread what is left of the quota evenly over the rest of the window.
+        rate = available / (self.reset_at - now)
+        self.tokens = min(float(burst), self.tokens + (now - self.refilled_at) * rate)
+        self.refilled_at = now
+        if self.tokens >= 1.0:
+            return 0.0
+        return (1.0 - self.tokens) / rate
+
+    def consume(self):
+        self.tokens -= 1.0
+        if self.remaining is not None:
+            self.remaining -= 1
+
+
+class RateLimiter:
+    """
+    Central scheduler that keeps requests inside GitHub's rate limits.
+
+    Quota is tracked per token and per resource bucket (core, search, code_search, graphql)
+    from the X-RateLimit-* response headers. While plenty of quota is left requests go out
+    immediately; below `pace_below` of the limit the remaining quota is spread over the rest
+    of the reset window with a token bucket. Primary and secondary rate-limit responses pause
+    the bucket until Retry-After or the reset time. Waiting threads block on a condition
+    variable instead of polling.
+
+    Args:
+    - burst (int): Maximum number of requests that may be sent back to back while pacing.
+    - reserve (int): Number of requests per window that are never used.
+    - pace_below (float): Fraction of the limit under which pacing starts.
+    - max_retries (int): Number of times a rate-limited request is retried after waiting.
+
+    Usage:
+    limiter = RateLimiter(reserve=100)
+    client = GitHubClient(owner="owner", repo="repo", token="your_token", rate_limiter=limiter)
+    print(limiter.budget(client.token, "core"))
+    """
+
+    _shared: Optional["RateLimiter"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, burst: int = 20, reserve: int = 0, pace_below: float = 0.5, max_retries: int = 3):
+        self.burst = burst
+        self.reserve = reserve
+        self.pace_below = pace_below
+        self.max_retries = max_retries
+        self._buckets: Dict[Tuple[str, str], _Bucket] = {}
+        self._condition = threading.Condition()
+
+    @classmethod
+    def shared(cls) -> "RateLimiter":
+        """
+        Return the process-wide scheduler used by clients that are not given their own.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def _bucket(self, token: str, resource: str) -> _Bucket:
+        key = (token_key(token), resource)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = _Bucket(self.burst)
+            self._buckets[key] = bucket
+        return bucket
+
+    def acquire(self, token: str, resource: str = CORE_RESOURCE) -> float:
+        """
+        Block until a request may be sent for the token and resource. Returns the seconds waited.
+        """
+        started = time.monotonic()
+        with self._condition:
+            while True:
+                bucket = self._bucket(token, resource)
+                wait = bucket.delay(time.time(), self.burst, self.reserve, self.pace_below)
+                if wait <= 0:
+                    bucket.consume()
+                    return time.monotonic() - started
+                self._condition.wait(timeout=wait)
+
+    def try_acquire(self, token: str, resource: str = CORE_RESOURCE) -> float:
+        """
+        Take quota for one request without blocking.
+        Returns zero if the request may be sent now, otherwise the seconds to wait before trying again.
+        """
+        with self._condition:
+            bucket = self._bucket(token, resource)
+            wait = bucket.delay(time.time(), self.burst, self.reserve, self.pace_below)
+            if wait <= 0:
+                bucket.consume()
+                return 0.0
+            return wait
+
+    def update(self, token: str, resource: str, headers: Mapping[str, str]):
+        """
+        Record the quota reported by a response's X-RateLimit-* headers.
+        """
+        limit = headers.get("X-RateLimit-Limit")
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+
+        resource = headers.get("X-RateLimit-Resource", resource)
+        with self._condition:
+            bucket = self._bucket(token, resource)
+            if limit is not None:
+                bucket.limit = int(limit)
+            bucket.remaining = int(remaining)
+            bucket.reset_at = float(reset)
+            self._condition.notify_all()
+
+    def pause(self, token: str, resource: str, seconds: float):
+        """
+        Hold back every request for the token and resource for the given number of seconds.
+        """
+        with self._condition:
+            bucket = self._bucket(token, resource)
+            bucket.paused_until = max(bucket.paused_until, time.time() + seconds)
+            self._condition.notify_all()
+
+    def retry_delay(self, token: str, resource: str, response: "Response") -> Optional[float]:
+        """
+        Return how long to wait before retrying a rate-limited response, or None if it was not rate limited.
+        Secondary limits without Retry-After back off exponentially from one minute.
+        """
+        if response.status_code not in (403, 429):
+            return None
+
+        retry_after = response.headers.get("Retry-After")
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset = response.headers.get("X-RateLimit-Reset")
+
+        with self._condition:
+            bucket = self._bucket(token, resource)
+            if retry_after is not None:
+                bucket.secondary_hits += 1
+                return max(0.0, float(retry_after))
+            if remaining == "0" and reset is not None:
+                return max(0.0, float(reset) - time.time()) + 1.0
+            if response.status_code == 429 or _is_secondary_limit(response):
+                delay = min(MAX_BACKOFF, SECONDARY_LIMIT_BACKOFF * 2 ** bucket.secondary_hits)
+                bucket.secondary_hits += 1
+                return delay
+        return None
+
+    def reset_backoff(self, token: str, resource: str):
+        """
+        Clear the secondary-limit backoff after a request went through.
+        """
+        with self._condition:
+            self._bucket(token, resource).secondary_hits = 0
+
+    def budget(self, token: str, resource: str = CORE_RESOURCE) -> RateLimitBudget:
+        """
+        Return the currently known quota for the token and resource.
+        """
+        with self._condition:
+            bucket = self._bucket(token, resource)
+            return RateLimitBudget(resource, bucket.limit, bucket.remaining, bucket.reset_at, bucket.paused_until)
+
+
+class ContentPacer:
+    """
+    Paces requests that create content to stay inside GitHub's content-creation secondary limits.
+
+    Those limits are not reported in response headers, so the pacer keeps the send times of recent
+    writes and lets a write through as soon as it fits in every window: by default 80 per minute and
+    500 per hour, with an optional minimum interval between writes. Send times of earlier writes,
+    e.g. from an import journal, can be loaded so a restarted process does not burst past a window.
+
+    Args:
+    - per_minute (int): Writes allowed in any 60 seconds.
+    - per_hour (int): Writes allowed in any hour.
+    - min_interval (float): Seconds between two writes.
+
+    Usage:
+    pacer = ContentPacer(per_hour=400)
+    pacer.wait()
+    client.issue('create', title, body)
+    """
+
+    def __init__(self, per_minute: int = CONTENT_PER_MINUTE, per_hour: int = CONTENT_PER_HOUR,
+                 min_interval: float = 0.0):
+        self.windows = ((60.0, per_minute), (3600.0, per_hour))
+        self.min_interval = min_interval
+        self._sent: Deque[float] = deque()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def seed(self, sent_at: Iterable[float]):
+        """
+        Record writes made earlier, as wall-clock timestamps. They are merged with the writes
+        already recorded, which the windows expect in order.
+        """
+        now = time.time()
+        new = [stamp for stamp in sent_at if now - stamp < 3600.0]
+        with self._lock:
+            self._sent = deque(sorted([*self._sent, *new]))
+
+    def delay(self) -> float:
+        """
+        Seconds until the next write may be sent.
+        """
+        with self._lock:
+            return self._delay(time.time())
+
+    def wait(self) -> float:
+        """
+        Block until a write may be sent and record it. Returns the seconds waited.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.time()
+                delay = self._delay(now)
+                if delay <= 0:
+                    self._sent.append(now)
+                    return waited
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float):
+        """
+        Hold back writes, e.g. after GitHub reported a secondary limit anyway.
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.time() + seconds)
+
+    def _delay(self, now: float) -> float:
+        while self._sent and now - self._sent[0] >= 3600.0:
+            self._sent.popleft()
+        delay = self._paused_until - now
+        if self._sent:
+            delay = max(delay, self._sent[-1] + self.min_interval - now)
+        for window, allowed in self.windows:
+            if len(self._sent) >= allowed:
+                # The write `allowed` places back has to leave the window first.
+                delay = max(delay, self._sent[-allowed] + window - now)
+        return delay
+
+
+def is_rate_limited(response: "Response") -> bool:
+    """
+    Return True if a response rejected the request for a primary or secondary rate limit, as
+    opposed to a 403 for missing permissions or a rule of the endpoint.
+    """
+    if response.status_code == 429:
+        return True
+    if response.status_code != 403:
+        return False
+    return (response.headers.get("Retry-After") is not None
+            or response.headers.get("X-RateLimit-Remaining") == "0"
+            or _is_secondary_limit(response))
+
+
+def _is_secondary_limit(response: "Response") -> bool:
+    try:
+        message = response.json().get("message", "")
+    except (ValueError, AttributeError):
+        return False
+    message = message.lower()
+    return "secondary rate limit" in message or "abuse" in message
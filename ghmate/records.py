@@ -0,0 +1,181 @@
+import json
+import sys
+from typing import Optional, Any, Dict, FrozenSet, Iterable, Iterator, List, Tuple, Type, TypeVar, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+R = TypeVar("R", bound="Record")
+
+_MISSING = object()
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Decode JSON with orjson when it is installed, falling back to the standard library.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Encode JSON compactly to bytes with orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+class Record:
+    """
+    Compact, read-only view of one object returned by the GitHub API.
+
+    The fields listed in FIELDS are stored in slots and read as attributes. Every other key,
+    including nested objects such as the repository or the actor, is kept as one compact JSON
+    blob and only decoded when it is asked for. Short strings that repeat across many objects,
+    like statuses and branch names, are interned. A record also answers `record["key"]` and
+    `record.get("key")` for any key of the original object, so code written against the plain
+    dicts keeps working.
+
+    Subclasses declare FIELDS (and their slots) and may list INTERNED fields.
+    """
+
+    __slots__ = ("_extra",)
+
+    FIELDS: Tuple[str, ...] = ()
+    INTERNED: FrozenSet[str] = frozenset()
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._FIELD_SET = frozenset(cls.FIELDS)
+
+    @classmethod
+    def from_dict(cls: Type[R], data: Dict[str, Any], keep_extra: bool = True) -> R:
+        """
+        Build a record from a decoded object. With keep_extra=False only FIELDS are kept.
+        """
+        record = cls.__new__(cls)
+        for name in cls.FIELDS:
+            value = data.get(name)
+            if name in cls.INTERNED and type(value) is str:
+                value = sys.intern(value)
+            object.__setattr__(record, name, value)
+
+        extra = None
+        if keep_extra:
+            rest = {key: value for key, value in data.items() if key not in cls._FIELD_SET}
+            extra = dumps(rest) if rest else None
+        object.__setattr__(record, "_extra", extra)
+        return record
+
+    @classmethod
+    def from_json(cls: Type[R], content: Union[bytes, str], item_key: Optional[str] = None,
+                  keep_extra: bool = True) -> List[R]:
+        """
+        Decode a list response body, optionally wrapped in an object under item_key, into records.
+        """
+        data = loads(content)
+        if item_key is not None:
+            data = data.get(item_key, [])
+        return [cls.from_dict(item, keep_extra=keep_extra) for item in data]
+
+    @property
+    def extra(self) -> Dict[str, Any]:
+        """
+        The keys outside FIELDS, decoded on every access. Empty if the record was built without them.
+        """
+        return loads(self._extra) if self._extra is not None else {}
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"{type(self).__name__} records are read-only")
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._FIELD_SET:
+            return getattr(self, key)
+        return self.extra[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._FIELD_SET or key in self.extra
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._FIELD_SET:
+            return getattr(self, key)
+        value = self.extra.get(key, _MISSING)
+        return default if value is _MISSING else value
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = self.extra
+        data.update((name, getattr(self, name)) for name in self.FIELDS)
+        return data
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.FIELDS + ("_extra",))
+
+    def __hash__(self) -> int:
+        return hash((type(self), getattr(self, "id", None)))
+
+    def __reduce__(self) -> Any:
+        return _rebuild, (type(self), tuple(getattr(self, name) for name in self.FIELDS), self._extra)
+
+    def __repr__(self) -> str:
+        key = "number" if "number" in self._FIELD_SET else "id"
+        return f"{type(self).__name__}({key}={getattr(self, key)!r})"
+
+
+def _rebuild(cls: Type[R], values: Tuple[Any, ...], extra: Optional[bytes]) -> R:
+    record = cls.__new__(cls)
+    for name, value in zip(cls.FIELDS, values):
+        object.__setattr__(record, name, value)
+    object.__setattr__(record, "_extra", extra)
+    return record
+
+
+class WorkflowRun(Record):
+    FIELDS = ("id", "name", "workflow_id", "run_number", "run_attempt", "event", "status", "conclusion",
+              "head_branch", "head_sha", "created_at", "updated_at", "run_started_at", "html_url")
+    INTERNED = frozenset(("name", "event", "status", "conclusion", "head_branch"))
+    __slots__ = FIELDS
+
+
+class Artifact(Record):
+    FIELDS = ("id", "name", "size_in_bytes", "archive_download_url", "expired", "digest",
+              "created_at", "updated_at", "expires_at")
+    INTERNED = frozenset(("name",))
+    __slots__ = FIELDS
+
+
+class ActionsCacheEntry(Record):
+    FIELDS = ("id", "key", "ref", "version", "size_in_bytes", "created_at", "last_accessed_at")
+    INTERNED = frozenset(("ref",))
+    __slots__ = FIELDS
+
+
+class Issue(Record):
+    FIELDS = ("id", "number", "title", "state", "comments", "created_at", "updated_at", "closed_at", "html_url")
+    INTERNED = frozenset(("state",))
+    __slots__ = FIELDS
+
+
+class PullRequest(Record):
+    FIELDS = ("id", "number", "title", "state", "draft", "created_at", "updated_at", "closed_at", "merged_at",
+              "html_url")
+    INTERNED = frozenset(("state",))
+    __slots__ = FIELDS
+
+
+class Release(Record):
+    FIELDS = ("id", "tag_name", "name", "target_commitish", "draft", "prerelease", "created_at", "published_at",
+              "html_url")
+    INTERNED = frozenset(("target_commitish",))
+    __slots__ = FIELDS
+
+
+def to_records(record: Type[R], items: Iterable[Dict[str, Any]], keep_extra: bool = True) -> Iterator[R]:
+    for item in items:
+        yield record.from_dict(item, keep_extra=keep_extra)
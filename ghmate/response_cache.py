@@ -0,0 +1,267 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional, Dict, Any
+
+if TYPE_CHECKING:  # pragma: no cover
+    from requests import Response
+
+# Headers that describe the wire encoding of the original body rather than the cached, decoded content.
+_DROPPED_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+class CacheEntry:
+    """
+    A cached GET response along with the validators needed to revalidate it.
+    """
+
+    __slots__ = ("etag", "last_modified", "status_code", "headers", "content")
+
+    def __init__(self, etag: Optional[str], last_modified: Optional[str], status_code: int,
+                 headers: Dict[str, str], content: bytes):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+    @classmethod
+    def from_response(cls, response: "Response") -> "CacheEntry":
+        headers = {
+            name: value for name, value in response.headers.items()
+            if name.lower() not in _DROPPED_HEADERS
+        }
+        return cls(
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            status_code=response.status_code,
+            headers=headers,
+            content=response.content,
+        )
+
+    def to_response(self, url: str, revalidation: Optional["Response"] = None) -> "Response":
+        """
+        Rebuild a response from the cached entry, of the same type as the revalidation response.
+        Rate limit headers from the 304 revalidation response, if any, replace the cached ones.
+        """
+        from ghmate.transport import HTTPResponse
+
+        refreshed = {}
+        if revalidation is not None:
+            refreshed = {name: value for name, value in revalidation.headers.items()
+                         if name.lower().startswith("x-ratelimit") or name.lower() == "date"}
+
+        if isinstance(revalidation, HTTPResponse):
+            from http.client import HTTPMessage
+
+            message = HTTPMessage()
+            for name, value in self.headers.items():
+                if name not in refreshed:
+                    message[name] = value
+            for name, value in refreshed.items():
+                del message[name]
+                message[name] = value
+            response = HTTPResponse(self.status_code, "OK", message, url, content=self.content)
+            response.from_cache = True
+            return response
+
+        from requests import Response
+        from requests.structures import CaseInsensitiveDict
+
+        headers = CaseInsensitiveDict(self.headers)
+        headers.update(refreshed)
+
+        response = Response()
+        response.status_code = self.status_code
+        response.reason = "OK"
+        response.headers = headers
+        response.url = url
+        response._content = self.content
+        response.encoding = "utf-8"
+        if revalidation is not None:
+            response.request = revalidation.request
+            response.elapsed = revalidation.elapsed
+        response.from_cache = True
+        return response
+
+
+class SQLiteCacheStore:
+    """
+    Persistent second tier for ResponseCache, so cached validators survive process restarts.
+
+    Args:
+    - path (str): Path of the SQLite database file.
+    - max_entries (int): Maximum number of entries kept on disk; least recently used entries are pruned.
+    """
+
+    def __init__(self, path: str, max_entries: int = 10000):
+        self.path = path
+        self.max_entries = max_entries
+        # sqlite3 is only loaded by processes that keep a persistent cache.
+        import sqlite3
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " status_code INTEGER,"
+            " headers TEXT,"
+            " content BLOB,"
+            " accessed_at REAL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self._connection.commit()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT etag, last_modified, status_code, headers, content FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._connection.commit()
+        etag, last_modified, status_code, headers, content = row
+        return CacheEntry(etag, last_modified, status_code, json.loads(headers), bytes(content))
+
+    def put(self, key: str, entry: CacheEntry):
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, entry.etag, entry.last_modified, entry.status_code,
+                 json.dumps(entry.headers), entry.content, time.time()),
+            )
+            self._connection.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._connection.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._connection.commit()
+
+    def clear(self):
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+            self._connection.commit()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class ResponseCache:
+    """
+    Conditional-request cache for GET responses.
+
+    Responses carrying an ETag or Last-Modified header are kept in memory; later requests for
+    the same resource send If-None-Match/If-Modified-Since and a 304 reply is served from the
+    cache. GitHub does not count 304 replies against the rate limit.
+
+    Args:
+    - max_entries (int): Maximum number of responses kept in memory.
+    - max_bytes (int): Maximum total size of response bodies kept in memory.
+    - store (SQLiteCacheStore, optional): Persistent tier consulted on memory misses.
+
+    Usage:
+    cache = ResponseCache(max_entries=512, store=SQLiteCacheStore("ghmate-cache.db"))
+    actions = ActionsCommands(owner="owner", repo="repo", token="your_token", cache=cache)
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024,
+                 store: Optional[SQLiteCacheStore] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict[str, Any]], headers: Dict[str, str]) -> str:
+        """
+        Build a cache key from the URL, query parameters and the headers that change the response.
+        """
+        parts = [
+            url,
+            json.dumps(sorted((params or {}).items()), default=str),
+            headers.get("Authorization", ""),
+            headers.get("Accept", ""),
+        ]
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        return self._bytes
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        if self.store is not None:
+            entry = self.store.get(key)
+            if entry is not None:
+                self._insert(key, entry)
+        return entry
+
+    def put(self, key: str, entry: CacheEntry):
+        if entry.size > self.max_bytes:
+            return
+        self._insert(key, entry)
+        if self.store is not None:
+            self.store.put(key, entry)
+
+    def invalidate(self, key: str):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry.size
+        if self.store is not None:
+            self.store.delete(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if self.store is not None:
+            self.store.clear()
+
+    def record(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _insert(self, key: str, entry: CacheEntry):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._entries[key] = entry
+            self._bytes += entry.size
+
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
@@ -0,0 +1,271 @@
+import logging
+import random
+import sys
+import threading
+import time
+from typing import Optional, Any, Callable, Dict, Iterable, List, Tuple
+from urllib.parse import urlsplit
+
+CONNECTION_ERROR = "connection_error"
+TIMEOUT = "timeout"
+SERVER_ERROR = "server_error"
+
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of sending a request while the circuit breaker of its host is open.
+    """
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"Circuit breaker for {host} is open; not sending requests for {retry_in:.1f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class TransportError(OSError):
+    """
+    Raised by StdlibTransport when a request fails before a response arrived.
+
+    Args:
+    - message (str): What went wrong.
+    - kind (str): CONNECTION_ERROR or TIMEOUT.
+    - sent (bool): Whether the request may have reached the server.
+    """
+
+    def __init__(self, message: str, kind: str = CONNECTION_ERROR, sent: bool = True):
+        super().__init__(message)
+        self.kind = kind
+        self.sent = sent
+
+
+def is_transport_error(error: Exception) -> bool:
+    """
+    Return True if the exception was raised by a transport while sending a request.
+    """
+    if isinstance(error, TransportError):
+        return True
+    # requests is only loaded by Transport; if it was never imported, it raised nothing.
+    requests = sys.modules.get("requests")
+    return requests is not None and isinstance(error, requests.exceptions.RequestException)
+
+
+def classify_error(error: Exception) -> Tuple[str, bool]:
+    """
+    Classify a transport exception. Returns the failure kind and whether the request may have
+    reached the server; requests that were never sent can be retried whatever their method.
+    """
+    if isinstance(error, TransportError):
+        return error.kind, error.sent
+
+    import requests
+    from urllib3.exceptions import NewConnectionError
+
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return TIMEOUT, False
+    if isinstance(error, requests.exceptions.Timeout):
+        return TIMEOUT, True
+    if isinstance(error, requests.exceptions.ConnectionError):
+        reason = getattr(error.args[0], "reason", None) if error.args else None
+        return CONNECTION_ERROR, not isinstance(reason, NewConnectionError)
+    return CONNECTION_ERROR, True
+
+
+class RetryPolicy:
+    """
+    Decides which failed requests are retried and how long to wait in between.
+
+    Connection errors, timeouts and 5xx responses are retried with capped exponential backoff
+    and full jitter, honouring Retry-After when the server sends it. Only idempotent methods
+    are retried once a request may have reached the server; a POST is only retried if the
+    connection could not be established at all. Rate-limit responses (403 secondary limits
+    and 429) are handled by the RateLimiter. Counters of retries per failure kind and of
+    requests that ran out of attempts are kept for monitoring.
+
+    Args:
+    - max_attempts (int): Total attempts per request, including the first one.
+    - backoff_base (float): Seconds of the first backoff step, doubled for every attempt.
+    - backoff_cap (float): Upper bound in seconds of a single backoff.
+    - retry_statuses (iterable of int): Response statuses treated as transient server errors.
+    - jitter (bool): Randomize each backoff between zero and its cap, so clients do not retry in lockstep.
+
+    Usage:
+    policy = RetryPolicy(max_attempts=5, backoff_cap=10)
+    client = GitHubClient(owner="owner", repo="repo", token="your_token", retry_policy=policy)
+    """
+
+    def __init__(self, max_attempts: int = 4, backoff_base: float = 0.5, backoff_cap: float = 30.0,
+                 retry_statuses: Iterable[int] = (500, 502, 503, 504), jitter: bool = True):
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.retry_statuses = frozenset(retry_statuses)
+        self.jitter = jitter
+        self.retries: Dict[str, int] = {CONNECTION_ERROR: 0, TIMEOUT: 0, SERVER_ERROR: 0}
+        self.exhausted = 0
+        self._lock = threading.Lock()
+
+    def is_retryable_status(self, status_code: int) -> bool:
+        return status_code in self.retry_statuses
+
+    def should_retry(self, method: str, attempt: int, kind: str, sent: bool = True,
+                     idempotent: Optional[bool] = None) -> bool:
+        """
+        Whether a request that failed on its `attempt`-th try (counting from 1) should be sent again.
+        """
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        if sent and not idempotent:
+            return False
+        if attempt >= self.max_attempts:
+            with self._lock:
+                self.exhausted += 1
+            return False
+        with self._lock:
+            self.retries[kind] = self.retries.get(kind, 0) + 1
+        return True
+
+    def backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Seconds to wait before the attempt after the `attempt`-th one.
+        """
+        if retry_after is not None:
+            try:
+                return min(self.backoff_cap, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+        ceiling = min(self.backoff_cap, self.backoff_base * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling) if self.jitter else ceiling
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"retries": dict(self.retries), "exhausted": self.exhausted}
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker that stops sending requests while GitHub is failing.
+
+    After `failure_threshold` consecutive connection errors or 5xx responses the circuit opens
+    and requests fail immediately with CircuitOpenError instead of waiting on timeouts. After
+    `recovery_timeout` seconds the circuit is half open and lets a single probe request through;
+    its success closes the circuit, its failure opens it again. State changes are logged and
+    passed to the registered listeners.
+
+    Args:
+    - host (str): Host the breaker protects; only used in messages.
+    - failure_threshold (int): Consecutive failures that open the circuit.
+    - recovery_timeout (float): Seconds the circuit stays open before a probe is allowed.
+
+    Usage:
+    breaker = CircuitBreaker.shared("https://api.github.com")
+    breaker.add_listener(lambda breaker, old, new: print(breaker.host, old, "->", new))
+    """
+
+    _shared: Dict[Tuple[str, str], "CircuitBreaker"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, host: str = "", failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+        self._probing = False
+        self._listeners: List[Callable[["CircuitBreaker", str, str], None]] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, api_url: str, **options: Any) -> "CircuitBreaker":
+        """
+        Return the process-wide breaker for the host of `api_url`, creating it on first use.
+        """
+        parts = urlsplit(api_url)
+        key = (parts.scheme, parts.netloc)
+        with cls._shared_lock:
+            breaker = cls._shared.get(key)
+            if breaker is None:
+                breaker = cls(host=parts.netloc, **options)
+                cls._shared[key] = breaker
+            return breaker
+
+    def add_listener(self, listener: Callable[["CircuitBreaker", str, str], None]):
+        self._listeners.append(listener)
+
+    def before_request(self):
+        """
+        Raise CircuitOpenError if no request may be sent now.
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            now = time.monotonic()
+            if self.state == OPEN:
+                retry_in = self.opened_at + self.recovery_timeout - now
+                if retry_in > 0:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.host, retry_in)
+                transition = self._set_state(HALF_OPEN)
+            else:
+                transition = None
+            if self._probing:
+                self.rejected += 1
+                raise CircuitOpenError(self.host, 0.0)
+            self._probing = True
+        self._notify(transition)
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            transition = self._set_state(CLOSED) if self.state != CLOSED else None
+        self._notify(transition)
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            transition = None
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+                self.opened_at = time.monotonic()
+                self.times_opened += 1
+                transition = self._set_state(OPEN)
+        self._notify(transition)
+
+    def release(self):
+        """
+        Give back a half-open probe slot without recording an outcome, e.g. after a rate-limit response.
+        """
+        with self._lock:
+            self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"host": self.host, "state": self.state, "failures": self.failures,
+                    "times_opened": self.times_opened, "rejected": self.rejected}
+
+    def _set_state(self, state: str) -> Tuple[str, str]:
+        previous, self.state = self.state, state
+        return previous, state
+
+    def _notify(self, transition: Optional[Tuple[str, str]]):
+        if transition is None:
+            return
+        previous, state = transition
+        if state == OPEN:
+            logging.warning(f"Circuit breaker for {self.host} opened after {self.failures} consecutive failures")
+        else:
+            logging.info(f"Circuit breaker for {self.host} changed from {previous} to {state}")
+        for listener in self._listeners:
+            try:
+                listener(self, previous, state)
+            except Exception:
+                logging.exception(f"Circuit breaker listener {listener!r} failed")
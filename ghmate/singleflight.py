@@ -0,0 +1,161 @@
+import copy
+import json
+import threading
+import time
+from typing import Optional, Any, Callable, Dict, Hashable, Tuple
+
+# Number of tracked keys above which expired reusable results are swept out.
+_SWEEP_SIZE = 1024
+
+
+def _successful(value: Any) -> bool:
+    return getattr(value, "status_code", 200) < 400
+
+
+class _Call:
+    __slots__ = ("done", "value", "error", "waiters", "expires_at")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+        self.expires_at = 0.0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls so that only one of them runs.
+
+    The first caller of a key runs the function; callers arriving while it is in flight wait for
+    it and receive the same result, or the same exception. With a reuse window, a successful
+    result is also handed to callers arriving up to `reuse_window` seconds after it completed.
+    Results handed to several callers are the same object; see copy_response for responses.
+
+    GitHubClient uses it, when coalescing is enabled, for identical GET requests, keyed by the URL,
+    query parameters and headers, which include the token.
+
+    Args:
+    - reuse_window (float): Seconds a completed result is reused for. 0 only coalesces calls in flight.
+    - reusable (callable, optional): Decides whether a completed result may be reused. By default
+    results with a status_code of 400 or more (e.g. error responses) are not.
+
+    Usage:
+    flight = SingleFlight(reuse_window=0.5)
+    client = GitHubClient(owner="owner", repo="repo", token="your_token", singleflight=flight)
+    """
+
+    _shared: Optional["SingleFlight"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, reuse_window: float = 0.0, reusable: Optional[Callable[[Any], bool]] = None):
+        self.reuse_window = reuse_window
+        self.reusable = reusable or _successful
+        self.calls = 0
+        self.executed = 0
+        self.coalesced = 0
+        self.reused = 0
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "SingleFlight":
+        """
+        Return the process-wide instance, creating it on first use.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def do(self, key: Hashable, function: Callable[[], Any],
+           on_share: Optional[Callable[[Any], None]] = None) -> Tuple[Any, bool]:
+        """
+        Run `function` unless an identical call is in flight or reusable, and return its result.
+        Args:
+        - key (hashable): Identifies identical calls.
+        - function (callable): Computes the result.
+        - on_share (callable, optional): Called with the result before it is handed to other callers,
+        e.g. to make it safe to share.
+        Returns:
+        - Tuple: The result, and whether it came from another caller's call.
+        """
+        leader = False
+        with self._lock:
+            self.calls += 1
+            now = time.monotonic()
+            call = self._calls.get(key)
+            if call is not None and call.done.is_set() and call.expires_at <= now:
+                del self._calls[key]
+                call = None
+            if call is None:
+                if len(self._calls) >= _SWEEP_SIZE:
+                    self._sweep(now)
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+                leader = True
+            elif call.done.is_set():
+                self.reused += 1
+            else:
+                self.coalesced += 1
+                call.waiters += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        try:
+            call.value = function()
+        except BaseException as error:
+            call.error = error
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+            raise
+
+        reuse = self.reuse_window > 0 and self.reusable(call.value)
+        with self._lock:
+            if reuse:
+                call.expires_at = time.monotonic() + self.reuse_window
+            else:
+                self._calls.pop(key, None)
+            shared = call.waiters > 0 or reuse
+        try:
+            if shared and on_share is not None:
+                on_share(call.value)
+        finally:
+            call.done.set()
+        return call.value, False
+
+    def _sweep(self, now: float):
+        # Drop reusable results past their window whose keys were not asked for again.
+        expired = [key for key, call in self._calls.items() if call.done.is_set() and call.expires_at <= now]
+        for key in expired:
+            del self._calls[key]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"calls": self.calls, "executed": self.executed, "coalesced": self.coalesced,
+                    "reused": self.reused, "in_flight": sum(1 for call in self._calls.values()
+                                                            if not call.done.is_set())}
+
+
+def request_key(method: str, url: str, params: Optional[Dict[str, Any]], headers: Dict[str, str]) -> Hashable:
+    """
+    Key of a request for SingleFlight: the method, URL, query parameters and every header.
+    """
+    return (method, url, json.dumps(sorted((params or {}).items()), default=str), tuple(sorted(headers.items())))
+
+
+def copy_response(response: Any) -> Any:
+    """
+    Copy a response handed to several callers, so each can use and change its own. The body bytes
+    are shared, being immutable; the headers are copied and each copy decodes its own JSON.
+    """
+    duplicate = object.__new__(type(response))
+    duplicate.__dict__.update(response.__dict__)
+    duplicate.headers = copy.copy(response.headers)
+    return duplicate
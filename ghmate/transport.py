@@ -0,0 +1,367 @@
+import threading
+from typing import TYPE_CHECKING, Optional, Dict, Any, Tuple
+from urllib.parse import urlsplit
+
+from ghmate.retry import TransportError, IDEMPOTENT_METHODS, TIMEOUT
+
+if TYPE_CHECKING:  # pragma: no cover
+    from requests import Response
+
+DEFAULT_API_URL = "https://api.github.com"
+
+
+class Transport:
+    """
+    Pooled, keep-alive HTTP transport used by GitHubClient to talk to the GitHub API.
+
+    Wraps a single requests.Session mounted with a connection-pooling adapter, so TCP and
+    TLS connections are reused across calls instead of being opened for every request.
+    A transport can be shared by any number of clients and threads.
+
+    Args:
+    - pool_connections (int): Number of per-host connection pools to keep.
+    - pool_maxsize (int): Maximum number of idle connections kept alive per host.
+    - pool_block (bool): Wait for a free connection instead of opening extra ones when the pool is full.
+    - connect_timeout (float): Seconds to wait for a connection to be established.
+    - read_timeout (float): Seconds to wait between bytes received from the server.
+
+    Usage:
+    transport = Transport(pool_maxsize=64, read_timeout=60)
+    client = GitHubClient(owner="owner", repo="repo", token="your_token", transport=transport)
+    """
+
+    _shared: Dict[Tuple[str, str], "Transport"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        pool_connections: int = 4,
+        pool_maxsize: int = 32,
+        pool_block: bool = False,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 30.0,
+    ):
+        # Imported here rather than at module level: loading requests takes longer than the rest of
+        # ghmate together, and processes that never send a request should not pay for it.
+        from http.cookiejar import DefaultCookiePolicy
+
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+
+        # The API is stateless; refusing cookies keeps the shared session free of cross-thread state.
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        self.session.headers.update({
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        })
+
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            max_retries=0,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        json: Optional[Any] = None,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Any] = None,
+        stream: bool = False,
+        timeout: Optional[Any] = None,
+    ) -> "Response":
+        """
+        Send a request over the pooled session and return the response.
+        """
+        return self.session.request(
+            method,
+            url,
+            headers=headers,
+            json=json,
+            params=params,
+            data=data,
+            stream=stream,
+            timeout=timeout or self.timeout,
+        )
+
+    def close(self):
+        self.session.close()
+
+    @classmethod
+    def shared(cls, api_url: str = DEFAULT_API_URL, **options: Any) -> "Transport":
+        """
+        Return the process-wide transport for the host of `api_url`, creating it on first use.
+        Options are only applied when the transport is created.
+        """
+        parts = urlsplit(api_url)
+        key = (parts.scheme, parts.netloc)
+
+        with cls._shared_lock:
+            transport = cls._shared.get(key)
+            if transport is None:
+                transport = cls(**options)
+                cls._shared[key] = transport
+            return transport
+
+
+class HTTPResponse:
+    """
+    Response of a StdlibTransport, with the parts of requests.Response the clients use:
+    status_code, reason, headers, url, content, text, json(), iter_content() and close().
+    Header lookups are case-insensitive.
+    """
+
+    def __init__(self, status_code: int, reason: str, headers: Any, url: str, raw: Any = None,
+                 content: Optional[bytes] = None, on_close: Optional[Any] = None):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.url = url
+        self._raw = raw
+        self._content = content
+        self._on_close = on_close
+        # Whether the body was read to the end, so the connection can carry another request.
+        self._drained = raw is None
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def content(self) -> bytes:
+        if self._content is None:
+            self._content = b"".join(self.iter_content(64 * 1024))
+        return self._content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self, **kwargs: Any) -> Any:
+        import json
+
+        return json.loads(self.content, **kwargs)
+
+    def iter_content(self, chunk_size: int = 64 * 1024) -> Any:
+        if self._content is not None:
+            for start in range(0, len(self._content), chunk_size):
+                yield self._content[start:start + chunk_size]
+            return
+        decoder = _decoder(self.headers.get("Content-Encoding"))
+        try:
+            while True:
+                chunk = self._raw.read(chunk_size)
+                if not chunk:
+                    self._drained = True
+                    break
+                chunk = decoder.decompress(chunk) if decoder else chunk
+                if chunk:
+                    yield chunk
+            if decoder:
+                tail = decoder.flush()
+                if tail:
+                    yield tail
+        finally:
+            self.close()
+
+    def close(self):
+        if self._raw is not None:
+            self._raw.close()
+            self._raw = None
+        if self._on_close is not None:
+            self._on_close(self._drained)
+            self._on_close = None
+
+
+def _decoder(encoding: Optional[str]) -> Any:
+    import zlib
+
+    encoding = (encoding or "").lower()
+    if encoding == "gzip":
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        return zlib.decompressobj()
+    return None
+
+
+class StdlibTransport:
+    """
+    Keep-alive HTTP transport built on http.client, with the same interface as Transport.
+
+    It loads in a fraction of the time requests takes to import, which matters to short-lived
+    processes such as the command line interface, and keeps one connection per host and thread.
+    Redirects of GET and HEAD requests are followed; the Authorization header is dropped when a
+    redirect leaves the host, as requests does. Failures are raised as retry.TransportError.
+
+    Args:
+    - connect_timeout (float): Seconds to wait for a connection to be established.
+    - read_timeout (float): Seconds to wait between bytes received from the server.
+    - max_redirects (int): Number of redirects followed before giving up.
+
+    Usage:
+    client = GitHubClient(owner="owner", repo="repo", token="your_token", transport=StdlibTransport())
+    """
+
+    _shared: Dict[Tuple[str, str], "StdlibTransport"] = {}
+    _shared_lock = threading.Lock()
+
+    REDIRECTS = (301, 302, 303, 307, 308)
+
+    def __init__(self, connect_timeout: float = 10.0, read_timeout: float = 30.0, max_redirects: int = 5):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_redirects = max_redirects
+        self._local = threading.local()
+
+    @classmethod
+    def shared(cls, api_url: str = DEFAULT_API_URL, **options: Any) -> "StdlibTransport":
+        """
+        Return the process-wide stdlib transport for the host of `api_url`, creating it on first use.
+        """
+        parts = urlsplit(api_url)
+        key = (parts.scheme, parts.netloc)
+        with cls._shared_lock:
+            transport = cls._shared.get(key)
+            if transport is None:
+                transport = cls._shared[key] = cls(**options)
+            return transport
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        json: Optional[Any] = None,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Any] = None,
+        stream: bool = False,
+        timeout: Optional[Any] = None,
+    ) -> HTTPResponse:
+        """
+        Send a request over a kept-alive connection and return the response.
+        """
+        from urllib.parse import urlencode, urljoin
+
+        headers = dict(headers or {})
+        headers.setdefault("Accept-Encoding", "gzip, deflate")
+        body = None
+        if json is not None:
+            import json as json_module
+
+            body = json_module.dumps(json).encode("utf-8")
+            headers.setdefault("Content-Type", "application/json")
+        elif isinstance(data, dict):
+            body = urlencode(data).encode("utf-8")
+            headers.setdefault("Content-Type", "application/x-www-form-urlencoded")
+        elif data is not None:
+            body = data.encode("utf-8") if isinstance(data, str) else data
+
+        if params:
+            query = urlencode([(key, value) for key, value in params.items() if value is not None], doseq=True)
+            if query:
+                url = f"{url}{'&' if urlsplit(url).query else '?'}{query}"
+
+        timeout = timeout or self.timeout
+        for _ in range(self.max_redirects + 1):
+            response = self._send(method, url, headers, body, stream, timeout)
+            location = response.headers.get("Location")
+            if response.status_code not in self.REDIRECTS or not location or method not in ("GET", "HEAD"):
+                return response
+            # Read the short redirect body so its connection can be reused.
+            _ = response.content
+            target = urljoin(url, location)
+            if urlsplit(target).netloc != urlsplit(url).netloc:
+                headers = {name: value for name, value in headers.items() if name.lower() != "authorization"}
+            url = target
+        raise TransportError(f"Exceeded {self.max_redirects} redirects for {url}", sent=True)
+
+    def _send(self, method: str, url: str, headers: Dict[str, str], body: Optional[bytes], stream: bool,
+              timeout: Any) -> HTTPResponse:
+        import http.client
+        import socket
+
+        connect_timeout, read_timeout = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        parts = urlsplit(url)
+        target = f"{parts.path or '/'}{'?' + parts.query if parts.query else ''}"
+        key = (parts.scheme, parts.netloc)
+        pool = self._connections()
+
+        # A kept-alive connection may have been closed by the server; the request is sent again
+        # on a new one only if it is idempotent or could not be written at all, so a POST the
+        # server may have processed is never sent twice.
+        for reused in (True, False):
+            connection = pool.pop(key, None) if reused else None
+            if connection is None:
+                reused = False
+                connection = self._connect(parts.scheme, parts.netloc, connect_timeout)
+            written = False
+            try:
+                connection.sock.settimeout(read_timeout)
+                connection.request(method, target, body=body, headers=headers)
+                written = True
+                raw = connection.getresponse()
+                break
+            except socket.timeout as error:
+                connection.close()
+                raise TransportError(f"Read timed out: {url}: {error}", kind=TIMEOUT, sent=True)
+            except (OSError, http.client.HTTPException) as error:
+                connection.close()
+                if not reused or (written and method.upper() not in IDEMPOTENT_METHODS):
+                    raise TransportError(f"Connection failed: {url}: {error}", sent=written)
+
+        def release(drained: bool):
+            # Unread body bytes would be taken for the next response; such connections are closed.
+            if drained and not raw.will_close:
+                pool[key] = connection
+            else:
+                connection.close()
+
+        response = HTTPResponse(raw.status, raw.reason, raw.headers, url, raw=raw, on_close=release)
+        if not stream:
+            try:
+                response._content = response.content
+            except socket.timeout as error:
+                raise TransportError(f"Read timed out: {url}: {error}", kind=TIMEOUT, sent=True)
+            except (OSError, http.client.HTTPException) as error:
+                raise TransportError(f"Connection failed while reading {url}: {error}", sent=True)
+        return response
+
+    def _connect(self, scheme: str, netloc: str, connect_timeout: float) -> Any:
+        import http.client
+        import socket
+
+        if scheme == "https":
+            import ssl
+
+            connection = http.client.HTTPSConnection(netloc, timeout=connect_timeout,
+                                                     context=ssl.create_default_context())
+        else:
+            connection = http.client.HTTPConnection(netloc, timeout=connect_timeout)
+        try:
+            connection.connect()
+        except socket.timeout as error:
+            raise TransportError(f"Connect to {netloc} timed out: {error}", kind=TIMEOUT, sent=False)
+        except OSError as error:
+            raise TransportError(f"Could not connect to {netloc}: {error}", sent=False)
+        return connection
+
+    def _connections(self) -> Dict[Tuple[str, str], Any]:
+        connections = getattr(self._local, "connections", None)
+        if connections is None:
+            connections = self._local.connections = {}
+        return connections
+
+    def close(self):
+        """
+        Close the idle connections of the calling thread.
+        """
+        for connection in self._connections().values():
+            connection.close()
+        self._connections().clear()
@@ -0,0 +1,360 @@
+import hashlib
+import hmac
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Optional, Any, Callable, Dict, Iterable, List, Tuple, Union
+from urllib.parse import parse_qs
+
+from ghmate.mirror import ISSUES, PULLS, RELEASES, WORKFLOW_RUNS
+
+APPLIED = "applied"
+REMOVED = "removed"
+STALE = "stale"
+IGNORED = "ignored"
+DUPLICATE = "duplicate"
+
+SIGNATURE_HEADER = "X-Hub-Signature-256"
+EVENT_HEADER = "X-GitHub-Event"
+DELIVERY_HEADER = "X-GitHub-Delivery"
+
+# GitHub caps webhook payloads at 25 MB.
+MAX_BODY_SIZE = 25 * 1024 * 1024
+
+# Event name -> (payload key of the object, mirror resource).
+EVENT_RESOURCES: Dict[str, Tuple[str, str]] = {
+    "issues": ("issue", ISSUES),
+    "pull_request": ("pull_request", PULLS),
+    "release": ("release", RELEASES),
+    "workflow_run": ("workflow_run", WORKFLOW_RUNS),
+}
+_REMOVING_ACTIONS = frozenset(("deleted", "transferred"))
+
+
+def sign(secret: str, body: bytes) -> str:
+    """
+    The X-Hub-Signature-256 value GitHub sends for a body signed with the webhook secret.
+    """
+    return "sha256=" + hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+
+def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    """
+    Check an X-Hub-Signature-256 header against the body in constant time.
+    """
+    if not signature or not signature.startswith("sha256="):
+        return False
+    return hmac.compare_digest(sign(secret, body), signature)
+
+
+class WebhookEvent:
+    """
+    One webhook delivery: the event name, the delivery ID and the decoded payload.
+    """
+
+    __slots__ = ("name", "delivery", "payload", "received_at")
+
+    def __init__(self, name: str, payload: Dict[str, Any], delivery: Optional[str] = None,
+                 received_at: Optional[float] = None):
+        self.name = name
+        self.payload = payload
+        self.delivery = delivery or str(uuid.uuid4())
+        self.received_at = received_at if received_at is not None else time.time()
+
+    @property
+    def action(self) -> Optional[str]:
+        return self.payload.get("action")
+
+    @property
+    def repo(self) -> Optional[str]:
+        return (self.payload.get("repository") or {}).get("full_name")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"event": self.name, "delivery": self.delivery, "received_at": self.received_at,
+                "payload": self.payload}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WebhookEvent":
+        return cls(data["event"], data["payload"], data.get("delivery"), data.get("received_at"))
+
+    def __repr__(self) -> str:
+        return f"WebhookEvent(name={self.name!r}, action={self.action!r}, delivery={self.delivery!r})"
+
+
+class WebhookProcessor:
+    """
+    Applies webhook events to a RepositoryMirror and passes them on to listeners.
+
+    `issues`, `pull_request`, `release` and `workflow_run` events upsert the object they carry into
+    the mirror, or remove it when it was deleted or transferred, so queries on the mirror stay
+    current without syncing. An event older than the stored copy (webhooks can arrive out of
+    order) is ignored. Deliveries are deduplicated by their delivery ID, so redeliveries and
+    replays are harmless. Other events are only passed to the listeners.
+
+    Args:
+    - mirror (RepositoryMirror, optional): Local store the events are applied to.
+    - listeners (iterable of callable): Called with every new event and the outcome of applying it.
+    - remember (int): Number of delivery IDs remembered for deduplication.
+
+    Usage:
+    processor = WebhookProcessor(RepositoryMirror("ghmate-mirror.db"))
+    processor.add_listener(lambda event, outcome: print(event, outcome))
+    """
+
+    def __init__(self, mirror: Optional[Any] = None,
+                 listeners: Iterable[Callable[[WebhookEvent, str], None]] = (), remember: int = 10000):
+        self.mirror = mirror
+        self.listeners = list(listeners)
+        self.remember = remember
+        self.counts: Dict[str, int] = {APPLIED: 0, REMOVED: 0, STALE: 0, IGNORED: 0, DUPLICATE: 0}
+        self._deliveries: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add_listener(self, listener: Callable[[WebhookEvent, str], None]):
+        self.listeners.append(listener)
+
+    def process(self, event: WebhookEvent) -> str:
+        """
+        Apply one event and return the outcome: applied, removed, stale, ignored or duplicate.
+        """
+        with self._lock:
+            if event.delivery in self._deliveries:
+                self.counts[DUPLICATE] += 1
+                return DUPLICATE
+            self._deliveries[event.delivery] = None
+            while len(self._deliveries) > self.remember:
+                self._deliveries.popitem(last=False)
+
+        try:
+            outcome = self._apply(event)
+        except Exception:
+            # Forget the delivery so GitHub's redelivery of the event is applied rather than dropped.
+            with self._lock:
+                self._deliveries.pop(event.delivery, None)
+            raise
+        with self._lock:
+            self.counts[outcome] += 1
+        for listener in self.listeners:
+            try:
+                listener(event, outcome)
+            except Exception:
+                logging.exception(f"Webhook listener {listener!r} failed on {event!r}")
+        return outcome
+
+    def _apply(self, event: WebhookEvent) -> str:
+        target = EVENT_RESOURCES.get(event.name)
+        item = event.payload.get(target[0]) if target else None
+        if self.mirror is None or not item or not event.repo:
+            return IGNORED
+        resource = target[1]
+        if event.action in _REMOVING_ACTIONS:
+            self.mirror.remove(event.repo, resource, [item["id"]])
+            return REMOVED
+        return APPLIED if self.mirror.apply(event.repo, resource, item) else STALE
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
+
+
+class WebhookReceiver:
+    """
+    Small HTTP server receiving GitHub webhooks, built on the standard library.
+
+    Every delivery is checked against the X-Hub-Signature-256 header before its payload is
+    decoded; unsigned or wrongly signed requests are refused with 401. Verified events are handed
+    to the processor and answered with 202. Both JSON and form-encoded deliveries are accepted.
+    Verified deliveries can also be appended to a JSON lines file for later replay.
+
+    Args:
+    - processor (WebhookProcessor): Applies the received events.
+    - secret (str): The webhook secret configured on GitHub.
+    - host (str): Address to listen on.
+    - port (int): Port to listen on; 0 picks a free port.
+    - path (str): URL path deliveries are posted to.
+    - record (str, optional): Path of a JSON lines file verified deliveries are appended to.
+
+    Usage:
+    with WebhookReceiver(processor, secret="webhook-secret", host="0.0.0.0", port=8080) as receiver:
+        receiver.serve_forever()
+    """
+
+    def __init__(self, processor: WebhookProcessor, secret: str, host: str = "127.0.0.1", port: int = 0,
+                 path: str = "/", record: Optional[str] = None):
+        if not secret:
+            raise ValueError("A webhook secret is required to verify deliveries.")
+        self.processor = processor
+        self.secret = secret
+        self.host = host
+        self.port = port
+        self.path = path
+        self.record = record
+        self.rejected = 0
+        self._record_lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{self.path}"
+
+    def start(self) -> "WebhookReceiver":
+        """
+        Start serving on a background thread.
+        """
+        self._bind()
+        self._thread = threading.Thread(target=self._server.serve_forever, name="ghmate-webhooks", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """
+        Serve on the calling thread until interrupted.
+        """
+        if self._thread is not None:
+            self._thread.join()
+            return
+        self._bind()
+        try:
+            self._server.serve_forever()
+        finally:
+            self.stop()
+
+    def stop(self):
+        if self._server is not None:
+            if self._thread is not None:
+                self._server.shutdown()
+                self._thread = None
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "WebhookReceiver":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any):
+        self.stop()
+
+    def handle(self, headers: Any, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        """
+        Verify and process one delivery; returns the HTTP status and the JSON reply.
+        """
+        if not verify_signature(self.secret, body, headers.get(SIGNATURE_HEADER)):
+            self.rejected += 1
+            logging.warning(f"Refused webhook delivery {headers.get(DELIVERY_HEADER)} with an invalid signature")
+            return 401, {"message": "Invalid signature"}
+        try:
+            payload = _decode_body(body, headers.get("Content-Type") or "")
+        except ValueError:
+            return 400, {"message": "Invalid payload"}
+
+        name = headers.get(EVENT_HEADER) or ""
+        if name == "ping":
+            return 200, {"message": "pong"}
+        event = WebhookEvent(name, payload, headers.get(DELIVERY_HEADER))
+        if self.record:
+            with self._record_lock, open(self.record, "a", encoding="utf-8") as record_file:
+                record_file.write(json.dumps(event.to_dict()) + "\n")
+        return 202, {"status": self.processor.process(event)}
+
+    def _bind(self):
+        receiver = self
+
+        class Handler(_Handler):
+            owner = receiver
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    owner: WebhookReceiver
+
+    def log_message(self, format: str, *args: Any):
+        logging.debug(f"Webhook receiver: {format % args}")
+
+    def do_POST(self):
+        if self.path.split("?")[0] != self.owner.path:
+            self._reply(404, {"message": "Not Found"})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_SIZE:
+            self.close_connection = True
+            self._reply(413, {"message": "Payload too large"})
+            return
+        status, reply = self.owner.handle(self.headers, self.rfile.read(length))
+        self._reply(status, reply)
+
+    def _reply(self, status: int, payload: Dict[str, Any]):
+        content = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+def _decode_body(body: bytes, content_type: str) -> Dict[str, Any]:
+    if content_type.startswith("application/x-www-form-urlencoded"):
+        values = parse_qs(body.decode("utf-8")).get("payload")
+        if not values:
+            raise ValueError("Missing payload field")
+        body = values[0].encode("utf-8")
+    payload = json.loads(body)
+    if not isinstance(payload, dict):
+        raise ValueError("Payload is not an object")
+    return payload
+
+
+def load_events(path: str) -> List[WebhookEvent]:
+    """
+    Read deliveries recorded by a WebhookReceiver from a JSON lines file.
+    """
+    with open(path, "r", encoding="utf-8") as record_file:
+        return [WebhookEvent.from_dict(json.loads(line)) for line in record_file if line.strip()]
+
+
+def replay(processor: WebhookProcessor, events: Union[str, Iterable[Union[WebhookEvent, Dict[str, Any]]]]
+           ) -> Dict[str, int]:
+    """
+    Apply recorded events in order, without a server. Returns the number of events per outcome.
+    Args:
+    - processor (WebhookProcessor): Applies the events.
+    - events (str or iterable): A JSON lines file written by WebhookReceiver, or events or their dicts.
+    """
+    if isinstance(events, str):
+        events = load_events(events)
+    outcomes: Dict[str, int] = {}
+    for event in events:
+        if isinstance(event, dict):
+            event = WebhookEvent.from_dict(event)
+        outcome = processor.process(event)
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    return outcomes
+
+
+def deliver(url: str, secret: str, event: WebhookEvent, timeout: float = 10.0) -> Tuple[int, Dict[str, Any]]:
+    """
+    Post an event to a receiver the way GitHub does, signed with the secret; useful to replay
+    recorded deliveries against a running receiver. Returns the status and the decoded reply.
+    """
+    from urllib.error import HTTPError
+    from urllib.request import Request, urlopen
+
+    body = json.dumps(event.payload).encode("utf-8")
+    request = Request(url, data=body, method="POST", headers={
+        "Content-Type": "application/json",
+        EVENT_HEADER: event.name,
+        DELIVERY_HEADER: event.delivery,
+        SIGNATURE_HEADER: sign(secret, body),
+    })
+    try:
+        with urlopen(request, timeout=timeout) as response:
+            return response.status, json.loads(response.read() or b"{}")
+    except HTTPError as error:
+        return error.code, json.loads(error.read() or b"{}")
@@ -1,25 +1,54 @@
+import argparse
+import glob
+import hashlib
 import json
 import os
 import re
 import shutil
 import subprocess
+import time
 import requests
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Dict, List
 import fnmatch
 
 from dotenv import load_dotenv
 
 
+RELEASE_BRANCHES = ["main", "develop", "master"]
+TOOLING = ["python-dotenv", "wheel", "build", "twine"]
+OUTPUT_DIR = "package"
+
+# Files outside the package directory that end up in the distribution metadata.
+METADATA_FILES = ["setup.py", "setup.cfg", "pyproject.toml", "MANIFEST.in", "README.md", "LICENSE"]
+SKIPPED_DIRECTORIES = {"__pycache__", ".pytest_cache", ".mypy_cache"}
+
+
 class Deployer:
-    def __init__(self, log_dir: Optional[str] = "bin/log", log_name: Optional[str] = "deployment-log"):
+    """
+    Builds the package and uploads it to TestPyPI, or to PyPI from a release branch.
+
+    In incremental mode the package sources and setup metadata are hashed, and the result is kept
+    in a manifest next to the logs. A build is skipped when the outputs in the package directory
+    were built from the same sources, and the whole deployment is skipped when the same sources
+    (ignoring the version, which every deployment bumps) were already uploaded to the repository.
+    Every step's duration is recorded under "steps" in the JSON deployment log.
+    """
+
+    def __init__(self, log_dir: Optional[str] = "bin/log", log_name: Optional[str] = "deployment-log",
+                 incremental: bool = False, manifest_path: Optional[str] = "bin/build-manifest.json"):
         self.log_dir = log_dir
         self.log_name = log_name
+        self.incremental = incremental
+        self.manifest_path = manifest_path
         self.timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         self.log_file_path = os.path.join(self.log_dir, f"{self.log_name}_{self.timestamp}.json")
-        self.log_data = {"timestamp": self.timestamp, "logs": []}
+        self.log_data = {"timestamp": self.timestamp, "incremental": incremental, "steps": [], "logs": []}
         self.root_dir = self.get_git_root()
-        self.clean_build_and_cache_directories(root_directory=self.root_dir)
+        self._branch: Optional[str] = None
+        self._config: Optional[tuple] = None
+        self._token: Optional[str] = None
 
     @staticmethod
     def get_git_root():
@@ -38,12 +67,15 @@ class Deployer:
         ]
         files_to_clean = ["*.tar.gz", "*.whl"]
 
-        for dirpath, dirnames, filenames in os.walk(root_directory, topdown=False):
-            for dirname in dirnames:
+        for dirpath, dirnames, filenames in os.walk(root_directory, topdown=True):
+            # Never descend into version control or virtual environments, nor into removed directories.
+            dirnames[:] = [name for name in dirnames if name not in (".git", ".venv", "venv")]
+            for dirname in list(dirnames):
                 if dirname in directories_to_clean:
                     full_path = os.path.join(dirpath, dirname)
                     try:
                         shutil.rmtree(full_path)
+                        dirnames.remove(dirname)
                         print(f"Removed directory: {full_path}")
                     except Exception as e:
                         print(f"Error removing directory {full_path}. Reason: {str(e)}")
@@ -64,9 +96,8 @@ class Deployer:
 
     def mask_sensitive_info(self, string):
         """Mask sensitive information in a string."""
-        if isinstance(string, str):
-            token = self.configure()[1]
-            return string.replace(token, '***')
+        if isinstance(string, str) and self._token:
+            return string.replace(self._token, '***')
         return string
 
     @staticmethod
@@ -84,6 +115,24 @@ class Deployer:
         }
         self.log_data["logs"].append(log_entry)
 
+    @contextmanager
+    def step(self, name: str):
+        """Time a deployment step and record it in the log."""
+        entry = {"step": name, "status": "ran"}
+        started = time.perf_counter()
+        try:
+            yield entry
+        except BaseException:
+            entry["status"] = "failed"
+            raise
+        finally:
+            entry["seconds"] = round(time.perf_counter() - started, 3)
+            self.log_data["steps"].append(entry)
+            print(f"{name}: {entry['status']} in {entry['seconds']}s")
+            if entry["status"] == "failed":
+                # handle_exit wrote the log before the step ended; write it again with its timing.
+                self.write_log_to_file()
+
     def execute_and_log(self, command):
         """Execute a command and log its output."""
         masked_command = [str(part) for part in command]
@@ -94,12 +143,15 @@ class Deployer:
             masked_command[password_index] = "***"
 
         print(f"Executing: {' '.join(masked_command)}")
+        started = time.perf_counter()
         result = self.execute_command(command)
         self.log_command(masked_command, result)
+        self.log_data["logs"][-1]["seconds"] = round(time.perf_counter() - started, 3)
 
         return result.returncode
 
     def write_log_to_file(self):
+        self.create_log_directory()
         with open(self.log_file_path, "w") as log_file:
             log_file.write(json.dumps(self.log_data, indent=4))
 
@@ -109,17 +161,16 @@ class Deployer:
         exit(code)
 
     def install_dependencies(self):
-        dependencies = ["python-dotenv", "wheel", "build", "twine"]
-        for dep in dependencies:
-            return_code = self.execute_and_log(["pip", "install", dep])
-            if return_code != 0:
-                self.handle_exit(
-                    message=f"Failed to install {dep}. Check the log file for details.",
-                    code=return_code
-                )
+        # One pip run resolves all the tooling together instead of starting pip once per package.
+        return_code = self.execute_and_log(["pip", "install", *TOOLING])
+        if return_code != 0:
+            self.handle_exit(
+                message=f"Failed to install {', '.join(TOOLING)}. Check the log file for details.",
+                code=return_code
+            )
 
     def build_project(self):
-        return_code = self.execute_and_log(["python", "-m", "build", "--outdir", "package"])
+        return_code = self.execute_and_log(["python", "-m", "build", "--outdir", OUTPUT_DIR])
         if return_code != 0:
             self.handle_exit(
                 message="Failed to build the project. Check the log file for details.",
@@ -133,7 +184,7 @@ class Deployer:
             "--repository-url", repository_url,  # Use the provided repository_url
             "--username", "__token__",
             "--password", token,
-            "package/*"
+            f"{OUTPUT_DIR}/*"
         ])
         if return_code != 0:
             self.handle_exit(
@@ -141,13 +192,21 @@ class Deployer:
                 code=return_code
             )
 
+    def current_branch(self) -> str:
+        """The checked out branch, looked up once per run."""
+        if self._branch is None:
+            self._branch = subprocess.check_output(["git", "branch", "--show-current"], text=True).strip()
+        return self._branch
+
     def configure(self):
         """Load and validate the environment variables and determine the repository_url and token."""
+        if self._config is not None:
+            return self._config
         load_dotenv()
 
-        current_branch = subprocess.check_output(["git", "branch", "--show-current"], text=True).strip()
+        current_branch = self.current_branch()
 
-        if current_branch not in ["main", "develop", "master"]:
+        if current_branch not in RELEASE_BRANCHES:
             repository_url = "https://test.pypi.org/legacy/"
             token_var = "TEST_PYPI_TOKEN"
         else:
@@ -159,13 +218,16 @@ class Deployer:
         if not token:
             self.handle_exit(message=f"Invalid or missing PyPI token: {token_var}.", code=1)
 
-        return repository_url, token_var
+        self._token = token
+        self._config = (repository_url, token_var)
+        return self._config
 
     @staticmethod
-    def update_package_version():
+    def update_package_version(current_branch: Optional[str] = None):
         # Determine the appropriate package name based on the branch
-        current_branch = subprocess.check_output(["git", "branch", "--show-current"], text=True).strip()
-        if current_branch in ["main", "develop", "master"]:
+        if current_branch is None:
+            current_branch = subprocess.check_output(["git", "branch", "--show-current"], text=True).strip()
+        if current_branch in RELEASE_BRANCHES:
             pypi_repository = "https://pypi.org/"
         else:
             pypi_repository = "https://test.pypi.org/"
@@ -217,17 +279,107 @@ class Deployer:
         else:
             print("Version retrieval failed. Skipping version update.")
 
+    @staticmethod
+    def source_files(root_directory: str, package_name: str) -> List[str]:
+        """The package sources and setup metadata files, relative to the root, in a stable order."""
+        files = [name for name in METADATA_FILES if os.path.isfile(os.path.join(root_directory, name))]
+        for dirpath, dirnames, filenames in os.walk(os.path.join(root_directory, package_name)):
+            dirnames[:] = sorted(name for name in dirnames if name not in SKIPPED_DIRECTORIES)
+            for filename in sorted(filenames):
+                if not filename.endswith((".pyc", ".pyo")):
+                    files.append(os.path.relpath(os.path.join(dirpath, filename), root_directory))
+        return files
+
+    def hash_sources(self) -> Dict[str, str]:
+        """
+        Hash the package sources and setup metadata. "build" covers everything that goes into the
+        built distributions; "source" leaves out the version line of setup.cfg, so it tells whether
+        anything changed since the last upload even after the version was bumped.
+        """
+        with open(os.path.join(self.root_dir, "setup.cfg"), "r") as cfg_file:
+            match = re.search(r'name\s*=\s*(\S+)', cfg_file.read())
+        package_name = match.group(1) if match else "ghmate"
+
+        build_digest = hashlib.sha256()
+        source_digest = hashlib.sha256()
+        for path in self.source_files(self.root_dir, package_name):
+            with open(os.path.join(self.root_dir, path), "rb") as source_file:
+                content = source_file.read()
+            for digest in (build_digest, source_digest):
+                digest.update(path.replace(os.sep, "/").encode("utf-8") + b"\0")
+            build_digest.update(content + b"\0")
+            if path == "setup.cfg":
+                content = re.sub(rb"(?m)^version\s*=.*$", b"", content)
+            source_digest.update(content + b"\0")
+        return {"build": build_digest.hexdigest(), "source": source_digest.hexdigest()}
+
+    def load_manifest(self) -> dict:
+        if not self.manifest_path or not os.path.exists(self.manifest_path):
+            return {"builds": {}, "uploads": {}}
+        with open(self.manifest_path, "r") as manifest_file:
+            return json.load(manifest_file)
+
+    def save_manifest(self, manifest: dict):
+        if not self.manifest_path:
+            return
+        os.makedirs(os.path.dirname(self.manifest_path) or ".", exist_ok=True)
+        with open(self.manifest_path, "w") as manifest_file:
+            manifest_file.write(json.dumps(manifest, indent=4))
+
+    @staticmethod
+    def built_outputs() -> List[str]:
+        return sorted(glob.glob(os.path.join(OUTPUT_DIR, "*.whl")) + glob.glob(os.path.join(OUTPUT_DIR, "*.tar.gz")))
+
     def deploy(self):
-        repository_url, token = self.configure()
-        api_token = os.environ.get(token)
-        self.install_dependencies()
-        self.update_package_version()
-        self.build_project()
-        self.upload_to_pypi(repository_url=repository_url, token=api_token)
+        with self.step("configure"):
+            repository_url, token = self.configure()
+            api_token = os.environ.get(token)
+
+        manifest = self.load_manifest() if self.incremental else None
+        if self.incremental:
+            with self.step("hash sources"):
+                hashes = self.hash_sources()
+            self.log_data["source_hash"] = hashes["source"]
+            if manifest["uploads"].get(repository_url) == hashes["source"]:
+                self.log_data["steps"].append({"step": "upload", "status": "skipped", "seconds": 0.0})
+                self.write_log_to_file()
+                print(f"Sources unchanged since the last upload to {repository_url}; nothing to deploy.")
+                return
+
+        with self.step("install dependencies"):
+            self.install_dependencies()
+        with self.step("update package version"):
+            self.update_package_version(self.current_branch())
+
+        with self.step("build") as build_step:
+            if self.incremental:
+                # The version bump is part of the build inputs, so hash again after it.
+                hashes = self.hash_sources()
+                outputs = self.built_outputs()
+                if outputs and manifest["builds"].get(hashes["build"]) == [os.path.basename(path) for path in outputs]:
+                    build_step["status"] = "skipped"
+                    print("Sources unchanged since the last build; reusing the built distributions.")
+            if build_step["status"] != "skipped":
+                self.clean_build_and_cache_directories(root_directory=self.root_dir)
+                self.build_project()
+                if self.incremental:
+                    manifest["builds"] = {hashes["build"]: [os.path.basename(path) for path in self.built_outputs()]}
+                    self.save_manifest(manifest)
+
+        with self.step("upload"):
+            self.upload_to_pypi(repository_url=repository_url, token=api_token)
+        if self.incremental:
+            manifest["uploads"][repository_url] = hashes["source"]
+            self.save_manifest(manifest)
+
         self.write_log_to_file()
         print("Deployment completed successfully.")
 
 
 if __name__ == "__main__":
-    deployer = Deployer()
+    parser = argparse.ArgumentParser(description="Build the package and upload it to (Test)PyPI.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="skip the build and upload when the package sources did not change")
+    args = parser.parse_args()
+    deployer = Deployer(incremental=args.incremental)
     deployer.deploy()
@@ -17,7 +17,15 @@ setup(
     url='https://github.com/serityops/ghmate',
     license=config.get('metadata', 'license'),
     license_files=config.get('metadata', 'license_files').split('\n'),
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
+    extras_require={
+        'async': ['aiohttp>=3.8'],
+        'secrets': ['PyNaCl>=1.4'],
+        'analytics': ['numpy>=1.17'],
+    },
+    entry_points={
+        'console_scripts': ['ghmate=ghmate.cli:main'],
+    },
     classifiers=config.get('metadata', 'classifiers').split('\n'),
     python_requires='>=3.8'
 )
@@ -0,0 +1,84 @@
+import base64
+import os
+import tempfile
+from unittest import TestCase, skipIf
+
+from benchmarks.fake_github import FakeGitHub
+from ghmate.actions_secrets import (PublicKeyCache, SecretSyncState, put_secret, sync_secrets, CREATED, UPDATED,
+                                    UNCHANGED, DELETED, DRY_RUN)
+from ghmate.github_client import GitHubClient
+from ghmate.rate_limit import RateLimiter
+
+try:
+    from nacl.public import PrivateKey, SealedBox
+except ImportError:  # pragma: no cover - optional dependency
+    PrivateKey = None
+
+
+@skipIf(PrivateKey is None, "PyNaCl is not installed ('pip install ghmate[secrets]')")
+class TestSecrets(TestCase):
+    def setUp(self):
+        self.server = FakeGitHub(runs=1).start()
+        self.addCleanup(self.server.stop)
+        self.private_key = self.rotate_key("key-1")
+        self.client = GitHubClient(owner="octo", repo="demo", token="test", api_url=self.server.url,
+                                   rate_limiter=RateLimiter())
+        self.keys = PublicKeyCache()
+
+    def rotate_key(self, key_id):
+        private_key = PrivateKey.generate()
+        self.server.public_key = {"key_id": key_id,
+                                  "key": base64.b64encode(bytes(private_key.public_key)).decode("ascii")}
+        return private_key
+
+    def decrypt(self, name, private_key=None):
+        sealed = base64.b64decode(self.server.secret_values[name])
+        return SealedBox(private_key or self.private_key).decrypt(sealed).decode("utf-8")
+
+    def test_value_is_sealed_for_the_repository_key(self):
+        response = put_secret(self.client, "API_TOKEN", "s3cr3t", key_cache=self.keys)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn("s3cr3t", self.server.secret_values["API_TOKEN"])
+        self.assertEqual(self.decrypt("API_TOKEN"), "s3cr3t")
+
+    def test_public_key_is_fetched_once_for_many_secrets(self):
+        report = sync_secrets(self.client, {f"SECRET_{index}": str(index) for index in range(10)}, key_cache=self.keys)
+
+        self.assertEqual(report.names(CREATED), sorted(f"SECRET_{index}" for index in range(10)))
+        # One key request, ten writes, and a listing before and after the writes.
+        self.assertEqual(self.server.requests, 13)
+        self.assertEqual(self.decrypt("SECRET_7"), "7")
+
+    def test_rotated_key_is_fetched_again(self):
+        put_secret(self.client, "API_TOKEN", "old", key_cache=self.keys)
+        private_key = self.rotate_key("key-2")
+        response = put_secret(self.client, "API_TOKEN", "new", key_cache=self.keys)
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.decrypt("API_TOKEN", private_key), "new")
+        self.assertEqual(self.keys.get(self.client)[0], "key-2")
+
+    def test_sync_skips_unchanged_secrets(self):
+        state = SecretSyncState(os.path.join(tempfile.mkdtemp(), "secrets-state.json"))
+        sync_secrets(self.client, {"A": "1", "B": "2"}, state=state, key_cache=self.keys)
+        self.server.reset_counters()
+
+        state = SecretSyncState(state.path)
+        report = sync_secrets(self.client, {"A": "1", "B": "changed"}, state=state, key_cache=self.keys)
+
+        self.assertEqual(report.names(UNCHANGED), ["A"])
+        self.assertEqual(report.names(UPDATED), ["B"])
+        self.assertEqual(self.decrypt("B"), "changed")
+        self.assertTrue(report.ok)
+
+    def test_sync_deletes_missing_secrets(self):
+        sync_secrets(self.client, {"A": "1", "B": "2"}, key_cache=self.keys)
+
+        preview = sync_secrets(self.client, {"A": "1"}, delete_missing=True, dry_run=True, key_cache=self.keys)
+        self.assertEqual(preview.names(DRY_RUN), ["A", "B"])
+        self.assertEqual(len(self.server.secrets), 2)
+
+        report = sync_secrets(self.client, {"A": "1"}, delete_missing=True, key_cache=self.keys)
+        self.assertEqual(report.names(DELETED), ["B"])
+        self.assertEqual([secret["name"] for secret in self.server.secrets], ["A"])
@@ -0,0 +1,114 @@
+import json
+import os
+import tempfile
+import time
+from unittest import TestCase
+
+from benchmarks.fake_github import FakeGitHub
+from ghmate.bulk_create import (BulkCreator, ImportJournal, MARKER, CREATED, FAILED, PENDING, RECONCILED, SKIPPED,
+                                ISSUES, RELEASES)
+from ghmate.github_client import GitHubClient
+from ghmate.rate_limit import ContentPacer, RateLimiter
+
+
+class Interrupted(Exception):
+    pass
+
+
+class TestBulkCreateResume(TestCase):
+    def setUp(self):
+        self.server = FakeGitHub(runs=1).start()
+        self.addCleanup(self.server.stop)
+        self.client = GitHubClient(owner="octo", repo="demo", token="test", api_url=self.server.url,
+                                   rate_limiter=RateLimiter())
+        self.journal = os.path.join(tempfile.mkdtemp(), "import.journal")
+        self.specs = [{"key": f"issue-{index}", "title": f"Issue {index}", "body": "Imported"} for index in range(10)]
+
+    def creator(self, kind=ISSUES, **options):
+        return BulkCreator(self.client, kind, journal=self.journal, pacer=ContentPacer(min_interval=0), **options)
+
+    def post(self, kind, payload):
+        self.client._make_request(method="POST", endpoint=kind, payload=payload)
+
+    def titles(self):
+        return sorted(issue["title"] for issue in self.server.issues)
+
+    def test_interrupted_import_resumes_without_duplicates(self):
+        def interrupt(report):
+            raise Interrupted()
+
+        with self.assertRaises(Interrupted):
+            self.creator(progress=interrupt, progress_every=4).run(self.specs)
+        self.assertEqual(len(self.server.issues), 4)
+
+        report = self.creator().run(self.specs)
+
+        self.assertEqual(report.counts[SKIPPED], 4)
+        self.assertEqual(report.counts[CREATED], 6)
+        self.assertEqual(self.titles(), sorted(spec["title"] for spec in self.specs))
+
+    def test_request_without_recorded_outcome_is_looked_up(self):
+        journal = ImportJournal(self.journal)
+        for key in ("issue-0", "issue-1"):
+            journal.record(key, PENDING, sync=True, sent_at=time.time())
+        journal.close()
+        # issue-0 reached GitHub before the process died; issue-1 never did.
+        self.post("issues", {"title": "Issue 0", "body": f"Imported\n\n{MARKER.format(key='issue-0')}"})
+
+        report = self.creator().run(self.specs)
+
+        self.assertEqual(report.counts[RECONCILED], 1)
+        self.assertEqual(report.counts[CREATED], 9)
+        self.assertEqual(self.titles(), sorted(spec["title"] for spec in self.specs))
+        self.assertEqual(ImportJournal(self.journal).state("issue-0"), RECONCILED)
+
+    def test_pending_draft_release_is_found_on_resume(self):
+        specs = [{"tag_name": "v1.0", "draft": True}, {"tag_name": "v1.1"}]
+        journal = ImportJournal(self.journal)
+        journal.record("v1.0", PENDING, sync=True, sent_at=time.time(), tag_name="v1.0", draft=True)
+        journal.close()
+        self.post("releases", {"tag_name": "v1.0", "draft": True})
+
+        report = self.creator(RELEASES).run(specs)
+
+        self.assertEqual(report.counts[RECONCILED], 1)
+        self.assertEqual(report.counts[CREATED], 1)
+        self.assertEqual(sorted(release["tag_name"] for release in self.server.releases), ["v1.0", "v1.1"])
+
+    def test_journal_line_cut_short_by_a_crash_is_ignored(self):
+        self.creator().run(self.specs[:3])
+        with open(self.journal, "a", encoding="utf-8") as journal_file:
+            journal_file.write(json.dumps({"key": "issue-3", "state": PENDING})[:12])
+
+        report = self.creator().run(self.specs)
+
+        self.assertEqual(report.counts[SKIPPED], 3)
+        self.assertEqual(report.counts[CREATED], 7)
+        self.assertEqual(len(self.server.issues), 10)
+
+    def test_rejected_spec_is_recorded_and_sent_again(self):
+        self.server.fail_next(422, message="Validation Failed")
+        report = self.creator().run(self.specs[:2])
+        self.assertEqual(report.counts[FAILED], 1)
+
+        report = self.creator().run(self.specs[:2])
+        self.assertEqual((report.counts[SKIPPED], report.counts[CREATED]), (1, 1))
+        self.assertEqual(len(self.server.issues), 2)
+
+    def test_pacer_is_seeded_from_the_journal(self):
+        self.creator().run(self.specs[:1])
+        pacer = ContentPacer(min_interval=1.0)
+        report = BulkCreator(self.client, ISSUES, journal=self.journal, pacer=pacer).run(self.specs[:2])
+
+        self.assertEqual(report.counts[CREATED], 1)
+        self.assertGreater(report.waited, 0.5)
+
+    def test_forbidden_spec_fails_without_backing_off(self):
+        self.server.fail_next(403, message="Resource not accessible by integration")
+        started = time.monotonic()
+        report = self.creator().run(self.specs[:2])
+
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertFalse(report.aborted)
+        self.assertEqual((report.counts[FAILED], report.counts[CREATED]), (1, 1))
+        self.assertEqual(self.server.requests, 2)
@@ -0,0 +1,86 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from benchmarks.fake_github import FakeGitHub, make_runs
+from ghmate.actions_commands import ActionsCommands
+from ghmate.bulk_delete import BulkDeleter, RunFilter, DELETED, DRY_RUN
+from ghmate.rate_limit import RateLimiter
+
+
+def newest_per_workflow(runs, count):
+    kept = {}
+    for run in runs:
+        kept.setdefault(run["workflow_id"], []).append(run["id"])
+    return {run_id for ids in kept.values() for run_id in sorted(ids, reverse=True)[:count]}
+
+
+class TestBulkDelete(TestCase):
+    def setUp(self):
+        self.server = FakeGitHub(runs=250).start()
+        self.actions = ActionsCommands(owner="octo", repo="demo", token="test", api_url=self.server.url,
+                                       rate_limiter=RateLimiter())
+
+    def tearDown(self):
+        self.server.stop()
+
+    def remaining(self):
+        return {run["id"] for run in self.server.runs}
+
+    def test_keep_last_survives_listing_shifting_between_passes(self):
+        expected = newest_per_workflow(self.server.runs, 3)
+        report = BulkDeleter(self.actions, RunFilter(keep_last=3), workers=8).run()
+
+        self.assertEqual(self.remaining(), expected)
+        self.assertGreater(report.passes, 1)
+        self.assertEqual(report.counts[DELETED], 250 - len(expected))
+        self.assertEqual(report.counts["failed"], 0)
+
+    def test_keep_last_counts_only_matching_runs(self):
+        failures = [run for run in self.server.runs if run["conclusion"] == "failure"]
+        kept = newest_per_workflow(failures, 1)
+        BulkDeleter(self.actions, RunFilter(statuses={"failure"}, keep_last=1)).run()
+
+        deleted = {run["id"] for run in failures} - kept
+        self.assertFalse(deleted & self.remaining())
+        self.assertEqual(len(self.remaining()), 250 - len(deleted))
+
+    def test_dry_run_deletes_nothing(self):
+        report = BulkDeleter(self.actions, RunFilter(keep_last=3), dry_run=True).run()
+
+        self.assertEqual(len(self.server.runs), 250)
+        self.assertEqual(report.passes, 1)
+        self.assertEqual(report.counts[DRY_RUN], 250 - 15)
+
+    def test_checkpoint_skips_runs_finished_before(self):
+        checkpoint = os.path.join(tempfile.mkdtemp(), "cleanup.checkpoint")
+        BulkDeleter(self.actions, RunFilter(workflow_ids={0}), checkpoint=checkpoint).run()
+        self.server.reset_counters()
+        report = BulkDeleter(self.actions, RunFilter(workflow_ids={0}), checkpoint=checkpoint).run()
+
+        self.assertEqual(report.counts[DELETED], 0)
+        with open(checkpoint, encoding="utf-8") as checkpoint_file:
+            self.assertEqual(len(checkpoint_file.read().split()), 50)
+
+    def test_run_shifted_onto_the_next_page_is_counted_once(self):
+        # Workflow 1's only kept run is the last one of the first page; a dry run deletes nothing,
+        # so only the run started between the pages shifts the listing.
+        runs = make_runs(150)
+        for index, run in enumerate(runs):
+            run["workflow_id"] = 1 if index >= 99 else 0
+        kept = runs[99]["id"]
+        self.server.runs = list(runs)
+
+        def start_run(collection, page):
+            if collection == "runs" and page == 2 and self.server.on_page is not None:
+                self.server.on_page = None
+                with self.server.lock:
+                    self.server.runs.insert(0, dict(runs[0], id=1000))
+
+        self.server.on_page = start_run
+        report = BulkDeleter(self.actions, RunFilter(keep_last=1), dry_run=True).run()
+
+        selected = [result.run_id for result in report.results]
+        self.assertNotIn(kept, selected)
+        self.assertEqual(len(selected), len(set(selected)))
+        self.assertEqual(report.counts[DRY_RUN], 148)
@@ -0,0 +1,27 @@
+import json
+from unittest import TestCase
+
+from benchmarks.fake_github import FakeGitHub
+from ghmate.github_client import GitHubClient
+from ghmate.instrumentation import MetricsCollector
+from ghmate.rate_limit import RateLimiter
+from ghmate.transport import StdlibTransport
+
+
+class TestMetrics(TestCase):
+    def setUp(self):
+        self.server = FakeGitHub(runs=5).start()
+        self.addCleanup(self.server.stop)
+        self.transport = StdlibTransport()
+        self.addCleanup(self.transport.close)
+        self.metrics = MetricsCollector()
+        self.client = GitHubClient(owner="octo", repo="demo", token="test", api_url=self.server.url,
+                                   transport=self.transport, rate_limiter=RateLimiter(), hooks=[self.metrics])
+
+    def test_bytes_sent_are_counted_with_the_stdlib_transport(self):
+        payload = {"title": "Measured", "body": "x" * 100}
+        self.client._make_request(method="POST", endpoint="issues", payload=payload)
+
+        [row] = self.metrics.snapshot()
+        self.assertEqual(row["bytes_sent"], len(json.dumps(payload).encode("utf-8")))
+        self.assertGreater(row["bytes_received"], 0)
@@ -0,0 +1,75 @@
+import time
+from unittest import TestCase
+
+from benchmarks.fake_github import FakeGitHub
+from ghmate.github_client import GitHubClient
+from ghmate.rate_limit import RateLimiter
+from ghmate.retry import RetryPolicy
+
+
+class TestRateLimitPacing(TestCase):
+    def setUp(self):
+        self.server = FakeGitHub(runs=5, rate_limit=5, rate_window=2).start()
+        self.limiter = RateLimiter()
+        self.client = GitHubClient(owner="octo", repo="demo", token="test", api_url=self.server.url,
+                                   rate_limiter=self.limiter, coalesce=False)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_waits_for_reset_instead_of_exhausting_quota(self):
+        started = time.monotonic()
+        statuses = [self.client._make_request(method="GET", endpoint="actions/runs").status_code for _ in range(8)]
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(statuses, [200] * 8)
+        self.assertEqual(self.server.rate_limited, 0)
+        self.assertGreater(elapsed, 0.5)
+
+    def test_budget_tracks_rate_limit_headers(self):
+        self.client._make_request(method="GET", endpoint="actions/runs")
+        budget = self.limiter.budget("test", "core")
+        self.assertEqual(budget.limit, 5)
+        self.assertEqual(budget.remaining, 4)
+        self.assertEqual(budget.reset_at, self.server.rate_reset)
+
+
+class TestRetryAfter(TestCase):
+    def setUp(self):
+        self.server = FakeGitHub(runs=5).start()
+        self.limiter = RateLimiter()
+        self.client = GitHubClient(owner="octo", repo="demo", token="test", api_url=self.server.url,
+                                   rate_limiter=self.limiter, retry_policy=RetryPolicy(backoff_base=0.01),
+                                   coalesce=False)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_secondary_limit_waits_for_retry_after(self):
+        self.server.fail_next(429, {"Retry-After": "1"})
+        started = time.monotonic()
+        response = self.client._make_request(method="GET", endpoint="actions/runs")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertGreaterEqual(time.monotonic() - started, 1.0)
+        self.assertEqual(self.server.requests, 2)
+
+    def test_retry_after_pauses_other_requests_of_the_token(self):
+        self.server.fail_next(403, {"Retry-After": "1"}, message="You have exceeded a secondary rate limit")
+        self.client._make_request(method="GET", endpoint="actions/runs")
+        self.assertGreater(self.limiter.budget("test", "core").paused_until, 0)
+
+    def test_gives_up_after_max_retries(self):
+        self.server.fail_next(429, {"Retry-After": "0"}, times=self.limiter.max_retries + 1)
+        response = self.client._make_request(method="GET", endpoint="actions/runs")
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(self.server.requests, self.limiter.max_retries + 1)
+
+    def test_server_error_honours_retry_after(self):
+        self.server.fail_next(503, {"Retry-After": "1"})
+        started = time.monotonic()
+        response = self.client._make_request(method="GET", endpoint="actions/runs")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertGreaterEqual(time.monotonic() - started, 1.0)
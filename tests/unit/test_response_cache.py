@@ -0,0 +1,94 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from benchmarks.fake_github import FakeGitHub
+from ghmate.github_client import GitHubClient
+from ghmate.rate_limit import RateLimiter
+from ghmate.response_cache import ResponseCache, SQLiteCacheStore
+from ghmate.transport import StdlibTransport
+
+
+class TestETagRevalidation(TestCase):
+    def setUp(self):
+        self.server = FakeGitHub(runs=10).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def client(self, cache, **options):
+        return GitHubClient(owner="octo", repo="demo", token="test", api_url=self.server.url, cache=cache,
+                            rate_limiter=RateLimiter(), coalesce=False, **options)
+
+    def test_unchanged_resource_is_served_from_cache(self):
+        cache = ResponseCache()
+        client = self.client(cache)
+        first = client._make_request(method="GET", endpoint="actions/runs")
+        second = client._make_request(method="GET", endpoint="actions/runs")
+
+        self.assertEqual(self.server.not_modified, 1)
+        self.assertEqual(second.status_code, 200)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_not_modified_replies_refresh_rate_limit_headers(self):
+        client = self.client(ResponseCache())
+        client._make_request(method="GET", endpoint="actions/runs")
+        client._make_request(method="GET", endpoint="issues")
+        cached = client._make_request(method="GET", endpoint="actions/runs")
+
+        self.assertEqual(cached.headers["X-RateLimit-Remaining"], str(self.server.rate_remaining))
+
+    def test_changed_resource_is_fetched_again(self):
+        cache = ResponseCache()
+        client = self.client(cache)
+        client._make_request(method="GET", endpoint="actions/runs")
+        self.server.runs.pop(0)
+        response = client._make_request(method="GET", endpoint="actions/runs")
+
+        self.assertEqual(self.server.not_modified, 0)
+        self.assertFalse(getattr(response, "from_cache", False))
+        self.assertEqual(response.json()["total_count"], 9)
+        self.assertEqual(client._make_request(method="GET", endpoint="actions/runs").json()["total_count"], 9)
+        self.assertEqual(self.server.not_modified, 1)
+
+    def test_different_query_parameters_are_cached_separately(self):
+        client = self.client(ResponseCache())
+        client._make_request(method="GET", endpoint="actions/runs", params={"page": 1})
+        client._make_request(method="GET", endpoint="actions/runs", params={"page": 2})
+
+        self.assertEqual(self.server.not_modified, 0)
+
+    def test_stdlib_transport_revalidates(self):
+        client = self.client(ResponseCache(), transport=StdlibTransport())
+        first = client._make_request(method="GET", endpoint="actions/runs")
+        second = client._make_request(method="GET", endpoint="actions/runs")
+
+        self.assertEqual(self.server.not_modified, 1)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.headers["content-type"], first.headers["Content-Type"])
+        self.assertEqual(second.json(), first.json())
+
+    def test_validators_survive_restart_with_persistent_store(self):
+        path = os.path.join(tempfile.mkdtemp(), "cache.db")
+        store = SQLiteCacheStore(path)
+        self.client(ResponseCache(store=store))._make_request(method="GET", endpoint="actions/runs")
+        store.close()
+
+        store = SQLiteCacheStore(path)
+        self.addCleanup(store.close)
+        response = self.client(ResponseCache(store=store))._make_request(method="GET", endpoint="actions/runs")
+
+        self.assertEqual(self.server.not_modified, 1)
+        self.assertEqual(response.json()["total_count"], 10)
+
+    def test_eviction_keeps_the_most_recently_used_entries(self):
+        cache = ResponseCache(max_entries=1)
+        client = self.client(cache)
+        client._make_request(method="GET", endpoint="actions/runs")
+        client._make_request(method="GET", endpoint="issues")
+        client._make_request(method="GET", endpoint="actions/runs")
+
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(self.server.not_modified, 0)
@@ -0,0 +1,65 @@
+import asyncio
+from unittest import TestCase, skipIf
+
+from benchmarks.fake_github import FakeGitHub
+from ghmate.github_client import GitHubClient
+from ghmate.rate_limit import RateLimiter
+from ghmate.retry import CircuitBreaker, RetryPolicy, CLOSED, HALF_OPEN, OPEN
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+
+class TestCircuitBreaker(TestCase):
+    def setUp(self):
+        self.server = FakeGitHub(runs=5).start()
+        self.addCleanup(self.server.stop)
+        self.breaker = CircuitBreaker(self.server.url, failure_threshold=2, recovery_timeout=0)
+        self.client = GitHubClient(owner="octo", repo="demo", token="test", api_url=self.server.url,
+                                   rate_limiter=RateLimiter(), circuit_breaker=self.breaker,
+                                   retry_policy=RetryPolicy(max_attempts=1))
+
+    def open_breaker(self):
+        self.server.fail_next(502, times=2)
+        for _ in range(2):
+            self.client._make_request(method="GET", endpoint="actions/runs")
+        self.assertEqual(self.breaker.state, OPEN)
+
+    def test_successful_probe_closes_the_breaker(self):
+        self.open_breaker()
+        self.assertEqual(self.client._make_request(method="GET", endpoint="actions/runs").status_code, 200)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_probe_failing_before_the_request_is_sent_frees_the_slot(self):
+        self.open_breaker()
+        with self.assertRaises(TypeError):
+            self.client._make_request(method="POST", endpoint="issues", payload={"when": object()})
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+
+        response = self.client._make_request(method="GET", endpoint="actions/runs")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    @skipIf(aiohttp is None, "aiohttp is not installed ('pip install ghmate[async]')")
+    def test_cancelled_async_probe_frees_the_slot(self):
+        from ghmate.async_client import AsyncGitHubClient
+
+        self.open_breaker()
+        self.server.latency = 0.5
+
+        async def cancel_probe():
+            async with AsyncGitHubClient(owner="octo", repo="demo", token="test", api_url=self.server.url,
+                                         rate_limiter=RateLimiter(), circuit_breaker=self.breaker) as client:
+                probe = asyncio.ensure_future(client._make_request(method="GET", endpoint="actions/runs"))
+                await asyncio.sleep(0.1)
+                probe.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await probe
+
+        asyncio.run(cancel_probe())
+        self.server.latency = 0
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertEqual(self.client._make_request(method="GET", endpoint="actions/runs").status_code, 200)
+
@@ -0,0 +1,39 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from benchmarks.fake_github import FakeGitHub
+from ghmate.github_client import GitHubClient
+from ghmate.instrumentation import MetricsCollector
+from ghmate.rate_limit import RateLimiter
+from ghmate.singleflight import SingleFlight
+
+
+class TestCoalescing(TestCase):
+    def setUp(self):
+        self.server = FakeGitHub(runs=5).start()
+        self.addCleanup(self.server.stop)
+        self.metrics = MetricsCollector()
+
+    def client(self, **options):
+        return GitHubClient(owner="octo", repo="demo", token="test", api_url=self.server.url,
+                            rate_limiter=RateLimiter(), hooks=[self.metrics], **options)
+
+    def test_coalescing_is_off_by_default(self):
+        client = self.client()
+        self.assertIsNone(client.singleflight)
+        client._make_request(method="POST", endpoint="issues", payload={"title": "Written"})
+
+        issues = client._make_request(method="GET", endpoint="issues").json()
+        self.assertEqual([issue["title"] for issue in issues], ["Written"])
+
+    def test_joined_callers_get_their_own_event(self):
+        client = self.client(singleflight=SingleFlight())
+        self.server.latency = 0.3
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            statuses = list(pool.map(lambda _: client._make_request(method="GET", endpoint="actions/runs").status_code,
+                                     range(4)))
+
+        self.assertEqual(statuses, [200] * 4)
+        self.assertEqual(self.server.requests, 1)
+        [row] = self.metrics.snapshot()
+        self.assertEqual((row["count"], row["coalesced"], row["attempts"]), (4, 3, 1))
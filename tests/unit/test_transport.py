@@ -0,0 +1,55 @@
+from unittest import TestCase
+
+from benchmarks.fake_github import FakeGitHub
+from ghmate.retry import TransportError
+from ghmate.transport import StdlibTransport
+
+
+class TestStdlibTransport(TestCase):
+    def setUp(self):
+        self.server = FakeGitHub(runs=5, log_lines=20000).start()
+        self.addCleanup(self.server.stop)
+        self.transport = StdlibTransport()
+        self.addCleanup(self.transport.close)
+        self.repo = f"{self.server.url}/repos/octo/demo"
+
+    def test_connection_is_reused_after_the_body_was_read(self):
+        for _ in range(3):
+            self.assertEqual(self.transport.request("GET", f"{self.repo}/actions/runs").status_code, 200)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_connection_with_unread_body_is_not_reused(self):
+        response = self.transport.request("GET", f"{self.repo}/actions/runs/5/logs", stream=True)
+        next(response.iter_content(1024))
+        response.close()
+
+        created = self.transport.request("POST", f"{self.repo}/issues", json={"title": "Once"})
+
+        self.assertEqual(created.status_code, 201)
+        self.assertEqual(len(self.server.issues), 1)
+        self.assertEqual(self.server.connections, 2)
+
+    def test_post_is_not_sent_again_when_the_connection_drops(self):
+        self.transport.request("GET", f"{self.repo}/actions/runs")
+        self.server.reset_counters()
+        # Lose the kept-alive connection after the request was written.
+        connection = next(iter(self.transport._connections().values()))
+        receive = connection.getresponse
+
+        def disconnect():
+            connection.sock.close()
+            return receive()
+
+        connection.getresponse = disconnect
+        with self.assertRaises(TransportError) as raised:
+            self.transport.request("POST", f"{self.repo}/issues", json={"title": "Once"})
+
+        self.assertTrue(raised.exception.sent)
+        self.assertLessEqual(self.server.requests, 1)
+        self.assertLessEqual(len(self.server.issues), 1)
+
+    def test_redirect_is_followed(self):
+        response = self.transport.request("GET", f"{self.repo}/actions/runs/5/logs",
+                                          headers={"Authorization": "token test"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.url.endswith("/_logs/runs/5"))
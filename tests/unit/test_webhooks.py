@@ -0,0 +1,109 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+from urllib.request import Request, urlopen
+from urllib.error import HTTPError
+
+from benchmarks.fake_github import FakeGitHub
+from ghmate.github_client import GitHubClient
+from ghmate.mirror import RepositoryMirror, WORKFLOW_RUNS
+from ghmate.rate_limit import RateLimiter
+from ghmate.webhooks import (WebhookEvent, WebhookProcessor, WebhookReceiver, deliver, sign, APPLIED, DUPLICATE,
+                             STALE, REMOVED, SIGNATURE_HEADER, EVENT_HEADER, DELIVERY_HEADER)
+
+SECRET = "webhook-secret"
+
+
+def post(url, body, headers):
+    request = Request(url, data=body, method="POST", headers=dict(headers, **{"Content-Type": "application/json"}))
+    try:
+        with urlopen(request, timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except HTTPError as error:
+        return error.code, json.loads(error.read())
+
+
+class TestWebhooks(TestCase):
+    def setUp(self):
+        self.server = FakeGitHub(runs=20).start()
+        self.addCleanup(self.server.stop)
+        client = GitHubClient(owner="octo", repo="demo", token="test", api_url=self.server.url,
+                              rate_limiter=RateLimiter())
+        self.mirror = RepositoryMirror(os.path.join(tempfile.mkdtemp(), "mirror.db"))
+        self.addCleanup(self.mirror.close)
+        self.mirror.sync(client, resources=[WORKFLOW_RUNS])
+
+        self.processor = WebhookProcessor(self.mirror)
+        self.receiver = WebhookReceiver(self.processor, secret=SECRET).start()
+        self.addCleanup(self.receiver.stop)
+
+    def run_event(self, run_id, delivery, **changes):
+        run = next(run for run in self.server.runs if run["id"] == run_id)
+        payload = {"action": "completed", "workflow_run": dict(run, **changes),
+                   "repository": {"full_name": "octo/demo"}}
+        return WebhookEvent("workflow_run", payload, delivery)
+
+    def conclusion(self, run_id):
+        runs = self.mirror.workflow_runs("octo/demo")
+        return next(run["conclusion"] for run in runs if run["id"] == run_id)
+
+    def test_valid_delivery_updates_the_mirror(self):
+        event = self.run_event(20, "delivery-1", conclusion="cancelled", updated_at="2030-01-01T00:00:00Z")
+        status, reply = deliver(self.receiver.url, SECRET, event)
+
+        self.assertEqual((status, reply), (202, {"status": APPLIED}))
+        self.assertEqual(self.conclusion(20), "cancelled")
+
+    def test_wrong_or_missing_signature_is_rejected(self):
+        event = self.run_event(20, "delivery-1", conclusion="cancelled", updated_at="2030-01-01T00:00:00Z")
+        body = json.dumps(event.payload).encode("utf-8")
+        headers = {EVENT_HEADER: "workflow_run", DELIVERY_HEADER: "delivery-1"}
+
+        self.assertEqual(deliver(self.receiver.url, "another-secret", event)[0], 401)
+        self.assertEqual(post(self.receiver.url, body, headers)[0], 401)
+        tampered = body.replace(b"cancelled", b"success")
+        self.assertEqual(post(self.receiver.url, tampered, dict(headers, **{SIGNATURE_HEADER: sign(SECRET, body)}))[0],
+                         401)
+
+        self.assertEqual(self.receiver.rejected, 3)
+        self.assertEqual(self.processor.stats()[APPLIED], 0)
+        self.assertNotEqual(self.conclusion(20), "cancelled")
+
+    def test_redelivery_is_deduplicated(self):
+        event = self.run_event(20, "delivery-1", conclusion="cancelled", updated_at="2030-01-01T00:00:00Z")
+        self.assertEqual(deliver(self.receiver.url, SECRET, event)[1]["status"], APPLIED)
+        self.assertEqual(deliver(self.receiver.url, SECRET, event)[1]["status"], DUPLICATE)
+        self.assertEqual(self.processor.stats()[DUPLICATE], 1)
+
+    def test_failed_delivery_is_applied_when_redelivered(self):
+        event = self.run_event(20, "delivery-1", conclusion="cancelled", updated_at="2030-01-01T00:00:00Z")
+        apply = self.mirror.apply
+        calls = []
+
+        def fail_once(*args):
+            calls.append(args)
+            if len(calls) == 1:
+                raise RuntimeError("database is locked")
+            return apply(*args)
+
+        self.mirror.apply = fail_once
+        with self.assertRaises(RuntimeError):
+            self.processor.process(event)
+        self.assertEqual(self.processor.process(event), APPLIED)
+        self.assertEqual(self.conclusion(20), "cancelled")
+
+    def test_older_event_does_not_overwrite_newer_state(self):
+        newer = self.run_event(20, "delivery-1", conclusion="cancelled", updated_at="2030-01-02T00:00:00Z")
+        older = self.run_event(20, "delivery-2", conclusion="success", updated_at="2030-01-01T00:00:00Z")
+
+        self.assertEqual(self.processor.process(newer), APPLIED)
+        self.assertEqual(self.processor.process(older), STALE)
+        self.assertEqual(self.conclusion(20), "cancelled")
+
+    def test_deleted_event_removes_the_item(self):
+        event = self.run_event(19, "delivery-1")
+        event.payload["action"] = "deleted"
+
+        self.assertEqual(self.processor.process(event), REMOVED)
+        self.assertNotIn(19, {run["id"] for run in self.mirror.workflow_runs("octo/demo")})